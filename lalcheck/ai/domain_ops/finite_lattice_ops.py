@@ -2,7 +2,10 @@
 Provides a collection of common useful operations on finite lattices.
 
 NOTE: these operations only make sense if the elements of the finite lattices
-correspond to sets of concrete values.
+correspond to sets of concrete values. They only manipulate elements through
+the operations of the domain, such that they apply to any representation of
+these sets (e.g. the frozensets of FiniteSubsetLattice or the bitmasks of
+BitsetLattice).
 """
 
 
@@ -15,14 +18,14 @@ def eq(domain):
 
     :return: A function which performs the equality operation.
 
-    :rtype: (frozenset[object], frozenset[object]) -> frozenset[str]
+    :rtype: (object, object) -> frozenset[str]
     """
     def do(x, y):
         """
-        :param frozenset[object] x: A set of concrete elements, represented by
+        :param object x: A set of concrete elements, represented by
             an element of the abstract domain.
 
-        :param frozenset[object] y: A set of concrete elements, represented by
+        :param object y: A set of concrete elements, represented by
             an element of the abstract domain.
 
         :return: A set of boolean values which contains all the possible
@@ -33,9 +36,9 @@ def eq(domain):
         """
         if domain.is_empty(x) or domain.is_empty(y):
             return boolean_ops.none
-        elif all(all(a == b for a in x) for b in y):
+        elif domain.size(x) == 1 and domain.eq(x, y):
             return boolean_ops.true
-        elif not any(any(a == b for a in x) for b in y):
+        elif domain.is_empty(domain.meet(x, y)):
             return boolean_ops.false
         else:
             return boolean_ops.both
@@ -49,17 +52,17 @@ def neq(domain):
 
     :return: A function which performs the inequality operation.
 
-    :rtype: (frozenset[object], frozenset[object]) -> frozenset[str]
+    :rtype: (object, object) -> frozenset[str]
     """
 
     do_eq = eq(domain)
 
     def do(x, y):
         """
-        :param frozenset[object] x: A set of concrete elements, represented by
+        :param object x: A set of concrete elements, represented by
             an element of the abstract domain.
 
-        :param frozenset[object] y: A set of concrete elements, represented by
+        :param object y: A set of concrete elements, represented by
             an element of the abstract domain.
 
         :return: A set of boolean values which contains all the possible
@@ -79,20 +82,24 @@ def inv_eq(domain):
 
     :return: A function which performs the inverse of the equality operation.
 
-    :rtype: (frozenset[str], frozenset[object], frozenset[object])
-                -> ((frozenset[object], frozenset[object]) | None)
+    :rtype: (frozenset[str], object, object)
+                -> ((object, object) | None)
     """
+    def without(x, y):
+        # The set difference between x and y.
+        return reduce(domain.join, domain.split(x, y), domain.bottom)
+
     def do(res, l_constr, r_constr):
         """
         :param frozenset[str] res: A set of booleans corresponding to an output
             of the equality operation, represented by an element of the
             Boolean domain.
 
-        :param frozenset[object] l_constr: A constraint on the left input
+        :param object l_constr: A constraint on the left input
             value of the equality operation, as an element of the finite
             lattice domain.
 
-        :param frozenset[object] r_constr: A constraint on the right input
+        :param object r_constr: A constraint on the right input
             value of the equality operation, as an element of the finite
             lattice domain.
 
@@ -101,7 +108,7 @@ def inv_eq(domain):
             represented by elements of the finite lattice domain. Returns None
             if the constraints cannot be satisfied.
 
-        :rtype: (frozenset[object], frozenset[object]) | None
+        :rtype: (object, object) | None
         """
         if (domain.is_empty(l_constr) or domain.is_empty(r_constr) or
                 boolean_ops.Boolean.eq(res, boolean_ops.none)):
@@ -111,12 +118,12 @@ def inv_eq(domain):
             meet = domain.meet(l_constr, r_constr)
             return None if domain.is_empty(meet) else (meet, meet)
         elif boolean_ops.Boolean.eq(res, boolean_ops.false):
-            if len(l_constr) == 1:
-                if not len(domain.meet(l_constr, r_constr)) == 0:
-                    r_constr = frozenset(r_constr) - frozenset(l_constr)
-            elif len(r_constr) == 1:
-                if not len(domain.meet(l_constr, r_constr)) == 0:
-                    l_constr = frozenset(l_constr) - frozenset(r_constr)
+            if domain.size(l_constr) == 1:
+                if not domain.is_empty(domain.meet(l_constr, r_constr)):
+                    r_constr = without(r_constr, l_constr)
+            elif domain.size(r_constr) == 1:
+                if not domain.is_empty(domain.meet(l_constr, r_constr)):
+                    l_constr = without(l_constr, r_constr)
 
             if domain.is_empty(l_constr) or domain.is_empty(r_constr):
                 return None
@@ -134,8 +141,8 @@ def inv_neq(domain):
 
     :return: A function which performs the inverse of the inequality operation.
 
-    :rtype: (frozenset[str], frozenset[object], frozenset[object])
-                -> ((frozenset[object], frozenset[object]) | None)
+    :rtype: (frozenset[str], object, object)
+                -> ((object, object) | None)
     """
 
     do_inv_eq = inv_eq(domain)
@@ -146,11 +153,11 @@ def inv_neq(domain):
             of the inequality operation, represented by an element of the
             Boolean domain.
 
-        :param frozenset[object] l_constr: A constraint on the left input
+        :param object l_constr: A constraint on the left input
             value of the inequality operation, as an element of the finite
             lattice domain.
 
-        :param frozenset[object] r_constr: A constraint on the right input
+        :param object r_constr: A constraint on the right input
             value of the inequality operation, as an element of the finite
             lattice domain.
 
@@ -159,7 +166,7 @@ def inv_neq(domain):
             represented by elements of the finite lattice domain. Returns None
             if the constraints cannot be satisfied.
 
-        :rtype: (frozenset[object], frozenset[object]) | None
+        :rtype: (object, object) | None
         """
         return do_inv_eq(boolean_ops.not_(res), l_constr, r_constr)
 
@@ -173,7 +180,7 @@ def lit(domain):
     :return: A function which can be used to build singleton elements of the
         given domain.
 
-    :rtype: (object) -> frozenset[object]
+    :rtype: (object) -> object
     """
     def do(val):
         """
@@ -181,7 +188,7 @@ def lit(domain):
 
         :return: The singleton set containing the given value
 
-        :rtype: frozenset[object]
+        :rtype: object
         """
         return domain.build(frozenset([val]))
 
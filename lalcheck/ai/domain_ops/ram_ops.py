@@ -7,7 +7,7 @@ def getter(index, dom):
     :param int index: The address to lookup.
     :param lalcheck.ai.domains.AbstractDomain dom: The abstract domain that
         represents the value stored at the location which is accessed.
-    :rtype: ((dict, int)) -> object
+    :rtype: ((PersistentMap, int)) -> object
     """
     def do(stack):
         """
@@ -15,7 +15,7 @@ def getter(index, dom):
         is stored at location (index + offset), where offset is the dynamic
         offset stored in the representation of the abstract memory.
 
-        :type stack: (dict, int)
+        :type stack: (PersistentMap, int)
         :rtype: object
         """
         offset = index + stack[1]
@@ -35,7 +35,7 @@ def inv_getter(index, dom):
     :param int index: The index to consider.
     :param lalcheck.ai.domains.AbstractDomain dom: The domain of the element
         that is expected to live at the considered location.
-    :rtype: (object, (dict, int)) -> (dict, int)
+    :rtype: (object, (PersistentMap, int)) -> (PersistentMap, int)
     """
     def do(res, stack_constr):
         """
@@ -46,24 +46,23 @@ def inv_getter(index, dom):
 
         :param object res: The value that is expected to live at the considered
             location.
-        :param (dict, int) stack_constr: A constraint on the memory
+        :param (PersistentMap, int) stack_constr: A constraint on the memory
             representation.
-        :rtype: (dict, int)
+        :rtype: (PersistentMap, int)
         """
-        new_stack = stack_constr[0].copy()
         offset = index + stack_constr[1]
-        old_elem = new_stack.get(offset, (dom, dom.top))[1]
-        new_stack[offset] = (dom, dom.meet(old_elem, res))
-        return new_stack, stack_constr[1]
+        old_elem = stack_constr[0].get(offset, (dom, dom.top))[1]
+        return (
+            stack_constr[0].set(offset, (dom, dom.meet(old_elem, res))),
+            stack_constr[1]
+        )
 
     return do
 
 
 def updater(index, dom):
     def do(stack, value):
-        new = stack[0].copy()
-        new[index + stack[1]] = (dom, value)
-        return new, stack[1]
+        return stack[0].set(index + stack[1], (dom, value)), stack[1]
 
     return do
 
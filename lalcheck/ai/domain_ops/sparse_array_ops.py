@@ -1,7 +1,6 @@
 """
 Provides a collection of common useful operations on sparse array domains.
 """
-from lalcheck.ai.utils import partition
 from lalcheck.ai.domain_capabilities import Capability
 import boolean_ops
 import util_ops
@@ -16,7 +15,6 @@ def get(domain):
 
     :rtype: (list, object) -> object
     """
-    index_dom = domain.index_dom
     elem_dom = domain.elem_dom
 
     def do(array, index):
@@ -32,14 +30,7 @@ def get(domain):
 
         :rtype: object
         """
-        relevant = [
-            elem[1]
-            for elem in array
-            if not index_dom.is_empty(
-                index_dom.meet(index, elem[0])
-            )
-        ]
-
+        relevant = [elem[1] for elem in domain.overlapping(array, index)]
         return reduce(elem_dom.join, relevant, elem_dom.bottom)
 
     return do
@@ -81,11 +72,8 @@ def updated(domain):
         """
 
         if index_dom.size(indices) == 1:
-            not_relevant, relevant = partition(
-                array,
-                lambda elem: index_dom.is_empty(
-                    index_dom.meet(indices, elem[0])
-                )
+            not_relevant, relevant = domain.partition_overlapping(
+                array, indices
             )
 
             updated_relevant = [
@@ -2,10 +2,38 @@
 Provides some basic abstract domains.
 """
 
-from utils import powerset, zip_dicts
+from utils import powerset, partition, freeze, LRUCache, PersistentMap
 from domain_capabilities import Capability
+import bisect
 import itertools
 import collections
+import weakref
+
+
+def _memoized_operation(op, cache):
+    """
+    Returns a version of the given operation of a domain which looks up its
+    results in the given cache.
+
+    :param function op: The operation, taking the domain as first argument.
+    :param LRUCache cache: The cache in which to store the results.
+    :rtype: function
+    """
+    def f(self, *args):
+        try:
+            key = self, freeze(args)
+            res = cache.get(key)
+        except TypeError:
+            # The operands are not hashable.
+            return op(self, *args)
+
+        if res is LRUCache.missing:
+            res = op(self, *args)
+            cache.put(key, res)
+        return res
+
+    f.operation = op
+    return f
 
 
 class AbstractDomain(object):
@@ -38,6 +66,68 @@ class AbstractDomain(object):
     HasSplit = Capability.No
     HasConcretize = Capability.No
 
+    MemoizableOperations = ('join', 'meet', 'le', 'eq')
+
+    @classmethod
+    def memoize(cls, max_size=4096):
+        """
+        Memoizes the join, meet, le and eq operations of the instances of this
+        class, such that calling one of them again on the same operands does
+        not recompute its result. Each operation has its own LRU cache, which
+        is shared by all the instances of the class (see memo_caches).
+
+        Operands are compared through their frozen representation (see
+        utils.freeze), hence calls on operands that cannot be frozen are not
+        memoized. Since results are shared between calls, they must never be
+        mutated.
+
+        :param int max_size: The maximal number of entries of each cache. Any
+            integer <= 0 means that the caches are unbounded.
+        """
+        cls.unmemoize()
+
+        originals = {}
+        caches = {}
+        for name in cls.MemoizableOperations:
+            op = getattr(cls, name).im_func
+            originals[name] = cls.__dict__.get(name)
+            caches[name] = LRUCache(max_size)
+            setattr(cls, name, _memoized_operation(
+                getattr(op, 'operation', op), caches[name]
+            ))
+
+        cls._memo_originals = originals
+        cls._memo_caches = caches
+
+    @classmethod
+    def unmemoize(cls):
+        """
+        Undoes the effect of memoize on this class, if any.
+        """
+        originals = cls.__dict__.get('_memo_originals')
+        if originals is None:
+            return
+
+        for name, op in originals.iteritems():
+            if op is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, op)
+
+        del cls._memo_originals
+        del cls._memo_caches
+
+    @classmethod
+    def memo_caches(cls):
+        """
+        Returns the caches used by the memoized operations of this class,
+        which keep track of their hit rate. Subclasses that do not override
+        an operation share the cache of their parent class.
+
+        :rtype: dict[str, LRUCache]
+        """
+        return getattr(cls, '_memo_caches', {})
+
     def build(self, *args):
         """
         Builds a new element of this abstract domain.
@@ -480,6 +570,86 @@ class Product(AbstractDomain):
         ))
 
 
+class IntervalProduct(Product):
+    """
+    A product domain whose interval components are handled inline: instead
+    of dispatching to the domain of each component, join, meet, widening and
+    equality process all the interval components in a single pass over the
+    elements, while the other components go through the generic path of the
+    product domain. Elements are represented as in the product domain.
+    """
+
+    def __init__(self, *domains):
+        super(IntervalProduct, self).__init__(*domains)
+        self._intervals = [
+            (i, dom.bottom, dom.top[0], dom.top[1])
+            for i, dom in enumerate(domains)
+            if type(dom) is Intervals
+        ]
+        self._others = [
+            (i, dom)
+            for i, dom in enumerate(domains)
+            if type(dom) is not Intervals
+        ]
+
+    def join(self, a, b):
+        res = list(a)
+        for i, bottom, _, _ in self._intervals:
+            x, y = a[i], b[i]
+            if x is bottom or y is not bottom and x is not y:
+                res[i] = y if x is bottom else (
+                    x[0] if x[0] <= y[0] else y[0],
+                    x[1] if x[1] >= y[1] else y[1]
+                )
+        for i, dom in self._others:
+            res[i] = dom.join(a[i], b[i])
+        return tuple(res)
+
+    def meet(self, a, b):
+        res = list(a)
+        for i, bottom, _, _ in self._intervals:
+            x, y = a[i], b[i]
+            if x is bottom or x is y:
+                continue
+            elif y is bottom or x[1] < y[0] or y[1] < x[0]:
+                res[i] = bottom
+            else:
+                res[i] = (
+                    x[0] if x[0] >= y[0] else y[0],
+                    x[1] if x[1] <= y[1] else y[1]
+                )
+        for i, dom in self._others:
+            res[i] = dom.meet(a[i], b[i])
+        return tuple(res)
+
+    def update(self, a, b, widen=False):
+        if not widen:
+            return self.join(a, b)
+
+        res = list(a)
+        for i, bottom, m_inf, inf in self._intervals:
+            x, y = a[i], b[i]
+            if x is bottom:
+                res[i] = y
+            elif y is not bottom and x is not y:
+                res[i] = (
+                    x[0] if x[0] <= y[0] else m_inf,
+                    x[1] if x[1] >= y[1] else inf
+                )
+        for i, dom in self._others:
+            res[i] = dom.update(a[i], b[i], True)
+        return tuple(res)
+
+    def eq(self, a, b):
+        # Equality of intervals is structural, such that comparing the
+        # elements as tuples is enough when there are no other components.
+        if len(self._others) == 0:
+            return a == b
+        return all(a[i] == b[i] for i, _, _, _ in self._intervals) and all(
+            dom.eq(a[i], b[i]) for i, dom in self._others
+        )
+
+
 class Powerset(AbstractDomain):
     """
     An abstract domain used to represent sets of sets of concrete values.
@@ -788,6 +958,105 @@ class FiniteSubsetLattice(AbstractDomain):
         return "{{{}}}".format(", ".join(sorted(str(e) for e in x)))
 
 
+class BitsetLattice(AbstractDomain):
+    """
+    A finite lattice where elements represent subsets of a given sequence of
+    elements, encoded as bitmasks: the i-th bit of an element is set iff
+    the i-th element of the sequence belongs to the subset. The "less than"
+    relation is the "is subset of" relation.
+
+    Constructing a new instance of this domain is done in time linear in the
+    number of given elements, and all lattice operations are bitwise
+    operations on integers, whatever the number of elements.
+    """
+
+    HasSplit = Capability.Yes
+    HasConcretize = Capability.Yes
+
+    def __init__(self, elems):
+        """
+        :param iterable[object] elems: The elements of the set whose subsets
+            are represented. Their order defines the bit assigned to each of
+            them.
+        """
+        self.elems = []
+        self._bits = {}
+        for elem in elems:
+            if elem not in self._bits:
+                self._bits[elem] = 1 << len(self.elems)
+                self.elems.append(elem)
+
+        self.bottom = 0
+        self.top = (1 << len(self.elems)) - 1
+
+    def build(self, elems):
+        """
+        Returns the element representing the given subset, or None if some
+        of the given elements do not belong to the set of this domain.
+
+        :param iterable[object] elems: The elements of the subset.
+        :rtype: int | None
+        """
+        res = 0
+        for elem in elems:
+            bit = self._bits.get(elem)
+            if bit is None:
+                return None
+            res |= bit
+        return res
+
+    def is_empty(self, x):
+        return x == 0
+
+    def size(self, x):
+        return bin(x).count('1')
+
+    def join(self, a, b):
+        return a | b
+
+    def meet(self, a, b):
+        return a & b
+
+    def update(self, a, b, widen=False):
+        return self.top if widen else a | b
+
+    def lt(self, a, b):
+        return a != b and a & b == a
+
+    def eq(self, a, b):
+        return a == b
+
+    def le(self, a, b):
+        return a & b == a
+
+    def split(self, elem, separator):
+        return [elem & ~separator]
+
+    def touches(self, a, b):
+        return True
+
+    def generator(self):
+        # xrange is limited to C longs, which bitsets of large sets exceed.
+        return itertools.takewhile(
+            lambda x: x <= self.top, itertools.count()
+        )
+
+    def concretize(self, abstract):
+        return frozenset(
+            elem
+            for i, elem in enumerate(self.elems)
+            if abstract >> i & 1
+        )
+
+    def abstract(self, concrete):
+        return self.build(concrete)
+
+    def str(self, x):
+        return "{{{}}}".format(", ".join(
+            sorted(str(e) for e in self.concretize(x))
+        ))
+
+
 class SparseArray(AbstractDomain):
     HasConcretize = Capability.Yes
 
@@ -826,6 +1095,41 @@ class SparseArray(AbstractDomain):
     def is_empty(self, x):
         return len(x) == 0
 
+    def _overlaps(self, index):
+        """
+        Returns a predicate which tells whether the index of an entry of an
+        array intersects the given index.
+
+        :param object index: An element of the index domain.
+        :rtype: ((object, object)) -> bool
+        """
+        return lambda e: not self.index_dom.is_empty(
+            self.index_dom.meet(index, e[0])
+        )
+
+    def overlapping(self, array, index):
+        """
+        Returns the entries of the given array whose index intersects the
+        given index.
+
+        :param list[(object, object)] array: The sparse array.
+        :param object index: An element of the index domain.
+        :rtype: list[(object, object)]
+        """
+        return filter(self._overlaps(index), array)
+
+    def partition_overlapping(self, array, index):
+        """
+        Partitions the entries of the given array into the ones whose index
+        does not intersect the given index, and the ones whose index does.
+
+        :param list[(object, object)] array: The sparse array.
+        :param object index: An element of the index domain.
+        :rtype: (list[(object, object)], list[(object, object)])
+        """
+        relevant, not_relevant = partition(array, self._overlaps(index))
+        return not_relevant, relevant
+
     def _merge_element(self, array, e):
         """
         Merges the given element e with the given array, where all elements of
@@ -877,7 +1181,7 @@ class SparseArray(AbstractDomain):
         # If the maximal amount of elements to store in the array is
         # reached, merge arbitrary elements together.
         while len(array) > self.max_elems > 0:
-            x = array.pop(0)
+            x, array = array[0], array[1:]
             array = self._merge_element(array, x)
 
         return array
@@ -1077,6 +1381,343 @@ class SparseArray(AbstractDomain):
         ))
 
 
+class _HighBounds(object):
+    """
+    A read-only view of the high bounds of the indices of a sparse array
+    whose entries are sorted by index, which can be searched with bisect
+    without copying them.
+    """
+    def __init__(self, array, bounds):
+        """
+        :param list[(object, object)] array: The sparse array.
+        :param object -> (int, int) bounds: Returns the bounds of an index.
+        """
+        self.array = array
+        self.bounds = bounds
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, i):
+        return self.bounds(self.array[i][0])[1]
+
+
+class IntervalSparseArray(SparseArray):
+    """
+    A sparse array domain for arrays which are indexed by integers, that is,
+    whose index domain is an Intervals domain or the product of a single
+    Intervals domain.
+
+    The entries of an array are kept sorted by index, such that the entries
+    that overlap a given index are found by a binary search, and such that
+    joins, meets and comparisons of arrays are done with a single sweep over
+    their entries instead of by comparing each pair of entries. Consecutive
+    entries which hold equal values are always merged. Hence, it can keep
+    track of many more entries than SparseArray.
+
+    Note that elements of this domain must be sorted: arrays which are not
+    built through operations of this domain must go through build or
+    normalized first.
+    """
+
+    _absent = object()
+    """
+    Denotes the absence of an entry for a range of indices (see _sweep).
+    """
+
+    def __init__(self, index_dom, elem_dom, max_elems=0):
+        """
+        :param Intervals | Product index_dom: The index domain, which must be
+            an Intervals domain or the product of a single Intervals domain.
+        :param AbstractDomain elem_dom: The element domain.
+        :param int max_elems: The maximal amount of entries. Any integer <= 0
+            means that there is no maximal amount of entries.
+        """
+        super(IntervalSparseArray, self).__init__(
+            index_dom, elem_dom, max_elems
+        )
+
+        if isinstance(index_dom, Product):
+            assert (len(index_dom.domains) == 1 and
+                    isinstance(index_dom.domains[0], Intervals))
+            self._bounds = lambda index: index[0]
+            self._index = lambda lo, hi: ((lo, hi),)
+        else:
+            assert isinstance(index_dom, Intervals)
+            self._bounds = lambda index: index
+            self._index = lambda lo, hi: (lo, hi)
+
+    def build(self, elems):
+        return self.normalized(super(IntervalSparseArray, self).build(elems))
+
+    def _entries(self, array):
+        """
+        Returns the entries of the given array that have an empty index, and
+        the other entries as (low, high, value) triplets sorted by index.
+
+        :param list[(object, object)] array: The sparse array.
+        :rtype: (list[(object, object)], list[(int, int, object)])
+        """
+        empties, entries = [], []
+        for index, val in array:
+            if self.index_dom.is_empty(index):
+                empties.append((index, val))
+            else:
+                lo, hi = self._bounds(index)
+                entries.append((lo, hi, val))
+
+        entries.sort(key=lambda e: e[0])
+        return empties, entries
+
+    def _sweep(self, a, b):
+        """
+        Given two lists of disjoint (low, high, value) triplets sorted by
+        index, yields (low, high, a_value, b_value) quadruplets for each of
+        the consecutive ranges of indices on which the entries of both lists
+        do not change. a_value (resp. b_value) is _absent if the first (resp.
+        second) list has no entry for this range.
+
+        :param list[(int, int, object)] a: The first list of entries.
+        :param list[(int, int, object)] b: The second list of entries.
+        :rtype: iterable[(int, int, object, object)]
+        """
+        absent = self._absent
+        it_a, it_b = iter(a), iter(b)
+        cur_a, cur_b = next(it_a, None), next(it_b, None)
+
+        while cur_a is not None and cur_b is not None:
+            a_lo, a_hi, a_v = cur_a
+            b_lo, b_hi, b_v = cur_b
+
+            if a_hi < b_lo:
+                yield a_lo, a_hi, a_v, absent
+                cur_a = next(it_a, None)
+            elif b_hi < a_lo:
+                yield b_lo, b_hi, absent, b_v
+                cur_b = next(it_b, None)
+            elif a_lo < b_lo:
+                yield a_lo, b_lo - 1, a_v, absent
+                cur_a = b_lo, a_hi, a_v
+            elif b_lo < a_lo:
+                yield b_lo, a_lo - 1, absent, b_v
+                cur_b = a_lo, b_hi, b_v
+            else:
+                hi = min(a_hi, b_hi)
+                yield a_lo, hi, a_v, b_v
+                cur_a = (hi + 1, a_hi, a_v) if a_hi > hi else next(it_a, None)
+                cur_b = (hi + 1, b_hi, b_v) if b_hi > hi else next(it_b, None)
+
+        while cur_a is not None:
+            yield cur_a[0], cur_a[1], cur_a[2], absent
+            cur_a = next(it_a, None)
+
+        while cur_b is not None:
+            yield cur_b[0], cur_b[1], absent, cur_b[2]
+            cur_b = next(it_b, None)
+
+    def _from_entries(self, empties, entries):
+        """
+        Builds the normalized array which holds the given entries: entries
+        which hold equal values at contiguous indices are merged, and if the
+        maximal amount of entries is reached, the closest entries are merged
+        together. Entries with an empty index are only kept if there is no
+        other entry, as they do not represent any concrete index otherwise.
+
+        :param list[(object, object)] empties: The entries with an empty
+            index.
+        :param list[(int, int, object)] entries: The other entries, as
+            disjoint (low, high, value) triplets sorted by index.
+        :rtype: list[(object, object)]
+        """
+        merged = []
+        for lo, hi, val in entries:
+            if (len(merged) > 0 and merged[-1][1] + 1 == lo and
+                    self.elem_dom.eq(merged[-1][2], val)):
+                merged[-1] = merged[-1][0], hi, val
+            else:
+                merged.append((lo, hi, val))
+
+        while len(merged) > self.max_elems > 0:
+            i = min(
+                range(len(merged) - 1),
+                key=lambda k: merged[k + 1][0] - merged[k][1]
+            )
+            (lo, _, x), (_, hi, y) = merged[i], merged[i + 1]
+            merged[i:i + 2] = [(lo, hi, self.elem_dom.join(x, y))]
+
+        if len(merged) == 0:
+            return empties[:1]
+
+        return [(self._index(lo, hi), val) for lo, hi, val in merged]
+
+    def normalized(self, array):
+        return self._from_entries(*self._entries(array))
+
+    def _first_ending_after(self, array, pos):
+        """
+        Returns the position in the given array of the first entry whose
+        index ends at or after the given concrete index, using a binary
+        search.
+
+        :param list[(object, object)] array: The sparse array.
+        :param int pos: The concrete index.
+        :rtype: int
+        """
+        lo = 0
+        if len(array) > 0 and self.index_dom.is_empty(array[0][0]):
+            lo = 1
+
+        return bisect.bisect_left(_HighBounds(array, self._bounds), pos, lo)
+
+    def _overlapping_range(self, array, index):
+        """
+        Returns the positions of the first entry of the given array whose
+        index intersects the given index, and of the entry that follows the
+        last one.
+
+        :param list[(object, object)] array: The sparse array.
+        :param object index: An element of the index domain.
+        :rtype: (int, int)
+        """
+        if self.index_dom.is_empty(index):
+            return 0, 0
+
+        lo, hi = self._bounds(index)
+        start = end = self._first_ending_after(array, lo)
+        while end < len(array) and self._bounds(array[end][0])[0] <= hi:
+            end += 1
+
+        return start, end
+
+    def overlapping(self, array, index):
+        start, end = self._overlapping_range(array, index)
+        return array[start:end]
+
+    def partition_overlapping(self, array, index):
+        start, end = self._overlapping_range(array, index)
+        return array[:start] + array[end:], array[start:end]
+
+    def join(self, a, b):
+        empties_a, entries_a = self._entries(a)
+        empties_b, entries_b = self._entries(b)
+        absent = self._absent
+
+        entries = []
+        for lo, hi, a_v, b_v in self._sweep(entries_a, entries_b):
+            if a_v is absent:
+                entries.append((lo, hi, b_v))
+            elif b_v is absent:
+                entries.append((lo, hi, a_v))
+            else:
+                entries.append((lo, hi, self.elem_dom.join(a_v, b_v)))
+
+        return self._from_entries(empties_a + empties_b, entries)
+
+    def meet(self, a, b):
+        absent = self._absent
+        res = []
+        for lo, hi, a_v, b_v in self._sweep(self._entries(a)[1],
+                                            self._entries(b)[1]):
+            if a_v is not absent and b_v is not absent:
+                val = self.elem_dom.meet(a_v, b_v)
+                if not self.elem_dom.is_empty(val):
+                    res.append((self._index(lo, hi), val))
+        return res
+
+    def le(self, a, b):
+        def has_greater_entry(x):
+            if self.index_dom.is_empty(x[0]):
+                return any(self.prod_dom.le(x, y) for y in b)
+
+            # Only the entry of b which contains the first index of x can be
+            # greater than x.
+            i = self._first_ending_after(b, self._bounds(x[0])[0])
+            return i < len(b) and self.prod_dom.le(x, b[i])
+
+        return all(has_greater_entry(x) for x in a)
+
+    def eq(self, a, b):
+        absent = self._absent
+        return all(
+            a_v is not absent and b_v is not absent and
+            self.elem_dom.eq(a_v, b_v)
+            for _, _, a_v, b_v in self._sweep(self._entries(a)[1],
+                                              self._entries(b)[1])
+        )
+
+    def generator(self):
+        return (
+            sorted(array, key=lambda e: self._bounds(e[0])[0])
+            for array in super(IntervalSparseArray, self).generator()
+        )
+
+
+# The tags of the kinds of access paths (see AccessPathsLattice), which are
+# used to dispatch their join and meet. They are ordered from the least to
+# the greatest kind.
+_ACCESS_PATH_TAGS = range(7)
+(_NO_PATH, _NULL, _ADDRESS, _PRODUCT_GET, _SUBPROGRAM, _NON_NULL,
+ _ALL_PATH) = _ACCESS_PATH_TAGS
+
+
+def _access_paths_join_rule(tag_a, tag_b):
+    """
+    Returns the function that computes the join of two access paths of
+    the given kinds.
+
+    :param int tag_a: The tag of the kind of the first access path.
+    :param int tag_b: The tag of the kind of the second access path.
+    :rtype: (AccessPathsLattice.AccessPath, AccessPathsLattice.AccessPath)
+        -> AccessPathsLattice.AccessPath
+    """
+    if tag_a == _NO_PATH or tag_b == _ALL_PATH:
+        return lambda a, b: b
+    elif tag_b == _NO_PATH or tag_a == _ALL_PATH:
+        return lambda a, b: a
+    elif tag_a == _NULL or tag_b == _NULL:
+        if tag_a == tag_b:
+            return lambda a, b: a
+        return lambda a, b: AccessPathsLattice.AllPath()
+    elif tag_a == _NON_NULL:
+        return lambda a, b: a
+    elif tag_b == _NON_NULL:
+        return lambda a, b: b
+    else:
+        # Both access paths designate a single location.
+        return lambda a, b: (
+            b if a <= b else a if b < a else AccessPathsLattice.NonNull()
+        )
+
+
+def _access_paths_meet_rule(tag_a, tag_b):
+    """
+    Returns the function that computes the meet of two access paths of
+    the given kinds.
+
+    :param int tag_a: The tag of the kind of the first access path.
+    :param int tag_b: The tag of the kind of the second access path.
+    :rtype: (AccessPathsLattice.AccessPath, AccessPathsLattice.AccessPath)
+        -> AccessPathsLattice.AccessPath
+    """
+    if tag_a == _NO_PATH or tag_b == _ALL_PATH:
+        return lambda a, b: a
+    elif tag_b == _NO_PATH or tag_a == _ALL_PATH:
+        return lambda a, b: b
+    elif tag_a == _NULL or tag_b == _NULL:
+        if tag_a == tag_b:
+            return lambda a, b: a
+        return lambda a, b: AccessPathsLattice.NoPath()
+    elif tag_a == _NON_NULL:
+        return lambda a, b: b
+    elif tag_b == _NON_NULL:
+        return lambda a, b: a
+    else:
+        # Both access paths designate a single location.
+        return lambda a, b: (
+            a if a <= b else b if b < a else AccessPathsLattice.NoPath()
+        )
+
+
 class AccessPathsLattice(AbstractDomain):
     """
     Abstract domain that represents an access path. Its elements are
@@ -1091,7 +1732,46 @@ class AccessPathsLattice(AbstractDomain):
     class AccessPath(object):
         """
         Base class for access paths expressions.
+
+        Access paths are immutable. Except for subprogram accesses, they are
+        also interned, such that structurally equal access paths are the same
+        object and can be compared by identity. Their hash is computed once,
+        from their structure.
+        """
+        __slots__ = ('_hash', '__weakref__')
+
+        tag = None
+        """
+        The tag of the kind of this access path.
         """
+
+        _instances = None
+        """
+        The interned access paths of a class, indexed by their fields.
+        """
+
+        @classmethod
+        def _interned(cls, *fields):
+            """
+            Returns the unique access path of this class with the given
+            fields, creating it if needed.
+
+            :param *object fields: The fields of the access path, in the
+                order of the slots of the class.
+            :rtype: AccessPathsLattice.AccessPath
+            """
+            res = cls._instances.get(fields)
+            if res is None:
+                res = object.__new__(cls)
+                for name, value in zip(cls.__slots__, fields):
+                    object.__setattr__(res, name, value)
+                object.__setattr__(res, '_hash', hash((cls.tag,) + fields))
+                cls._instances[fields] = res
+            return res
+
+        def __setattr__(self, key, value):
+            raise AttributeError("access paths are immutable")
+
         def size(self):
             """
             Returns the size of this access path.
@@ -1133,7 +1813,9 @@ class AccessPathsLattice(AbstractDomain):
             :type other: AccessPathsLattice.AccessPath
             :rtype: AccessPathsLattice.AccessPath
             """
-            raise NotImplementedError
+            return AccessPathsLattice._join_table[self.tag][other.tag](
+                self, other
+            )
 
         def __and__(self, other):
             """
@@ -1141,7 +1823,9 @@ class AccessPathsLattice(AbstractDomain):
             :type other: AccessPathsLattice.AccessPath
             :rtype: AccessPathsLattice.AccessPath
             """
-            raise NotImplementedError
+            return AccessPathsLattice._meet_table[self.tag][other.tag](
+                self, other
+            )
 
         def __eq__(self, other):
             """
@@ -1150,7 +1834,10 @@ class AccessPathsLattice(AbstractDomain):
             :type other: AccessPathsLattice.AccessPath
             :rtype: bool
             """
-            raise NotImplementedError
+            return self is other
+
+        def __ne__(self, other):
+            return not self == other
 
         def __lt__(self, other):
             """
@@ -1168,7 +1855,7 @@ class AccessPathsLattice(AbstractDomain):
             :type other: AccessPathsLattice.AccessPath
             :rtype: bool
             """
-            return self < other or self == other
+            return self == other or self < other
 
         def __gt__(self, other):
             """
@@ -1211,14 +1898,18 @@ class AccessPathsLattice(AbstractDomain):
             raise NotImplementedError
 
         def __hash__(self):
-            raise NotImplementedError
+            return self._hash
 
     class AllPath(AccessPath):
         """
         Represents all access paths.
         """
-        def __init__(self):
-            pass
+        __slots__ = ()
+        tag = _ALL_PATH
+        _instances = {}
+
+        def __new__(cls):
+            return cls._interned()
 
         def size(self):
             return float('inf')
@@ -1234,24 +1925,15 @@ class AccessPathsLattice(AbstractDomain):
         def weak_update(self, state, value):
             pass
 
-        def __or__(self, other):
-            return self
-
-        def __and__(self, other):
-            return other
-
-        def __eq__(self, other):
-            return isinstance(other, AccessPathsLattice.AllPath)
-
         def __lt__(self, other):
             return False
 
         def split(self, separator):
-            if isinstance(separator, AccessPathsLattice.NonNull):
+            if separator.tag == _NON_NULL:
                 return [AccessPathsLattice.Null()]
-            elif isinstance(separator, AccessPathsLattice.Null):
+            elif separator.tag == _NULL:
                 return [AccessPathsLattice.NonNull()]
-            elif isinstance(separator, AccessPathsLattice.AllPath):
+            elif separator.tag == _ALL_PATH:
                 return []
             else:
                 return [self]
@@ -1259,9 +1941,6 @@ class AccessPathsLattice(AbstractDomain):
         def touches(self, other):
             return False
 
-        def __hash__(self):
-            return hash(())
-
         def __str__(self):
             return "[all-path]"
 
@@ -1269,8 +1948,12 @@ class AccessPathsLattice(AbstractDomain):
         """
         Represents the null access path.
         """
-        def __init__(self):
-            pass
+        __slots__ = ()
+        tag = _NULL
+        _instances = {}
+
+        def __new__(cls):
+            return cls._interned()
 
         def size(self):
             return 1
@@ -1284,38 +1967,18 @@ class AccessPathsLattice(AbstractDomain):
         def weak_update(self, state, value):
             pass
 
-        def __or__(self, other):
-            if (isinstance(other, AccessPathsLattice.Null) or
-                    isinstance(other, AccessPathsLattice.NoPath)):
-                return self
-            else:
-                return AccessPathsLattice.AllPath()
-
-        def __and__(self, other):
-            if (isinstance(other, AccessPathsLattice.Null) or
-                    isinstance(other, AccessPathsLattice.AllPath)):
-                return self
-            else:
-                return AccessPathsLattice.NoPath()
-
-        def __eq__(self, other):
-            return isinstance(other, AccessPathsLattice.Null)
-
         def __lt__(self, other):
-            return isinstance(other, AccessPathsLattice.AllPath)
+            return other.tag == _ALL_PATH
 
         def split(self, separator):
-            if (isinstance(separator, AccessPathsLattice.Null) or
-                    isinstance(separator, AccessPathsLattice.AllPath)):
+            if separator.tag in (_NULL,
+                                 _ALL_PATH):
                 return []
             else:
                 return [self]
 
         def touches(self, other):
-            return isinstance(other, AccessPathsLattice.NonNull)
-
-        def __hash__(self):
-            return hash(())
+            return other.tag == _NON_NULL
 
         def __str__(self):
             return "null"
@@ -1324,8 +1987,12 @@ class AccessPathsLattice(AbstractDomain):
         """
         Represents all access paths except the null access path.
         """
-        def __init__(self):
-            pass
+        __slots__ = ()
+        tag = _NON_NULL
+        _instances = {}
+
+        def __new__(cls):
+            return cls._interned()
 
         def size(self):
             return float('inf')
@@ -1339,41 +2006,17 @@ class AccessPathsLattice(AbstractDomain):
         def weak_update(self, state, value):
             pass
 
-        def __or__(self, other):
-            if (isinstance(other, AccessPathsLattice.Null) or
-                    isinstance(other, AccessPathsLattice.AllPath)):
-                return AccessPathsLattice.AllPath()
-            else:
-                return self
-
-        def __and__(self, other):
-            if (isinstance(other, AccessPathsLattice.NonNull) or
-                    isinstance(other, AccessPathsLattice.AllPath)):
-                return self
-            elif (isinstance(other, AccessPathsLattice.Address) or
-                  isinstance(other, AccessPathsLattice.ProductGet)):
-                return other
-            else:
-                return AccessPathsLattice.NoPath()
-
-        def __eq__(self, other):
-            return isinstance(other, AccessPathsLattice.NonNull)
-
         def __lt__(self, other):
-            return isinstance(other, AccessPathsLattice.AllPath)
+            return other.tag == _ALL_PATH
 
         def split(self, separator):
-            if (isinstance(separator, AccessPathsLattice.AllPath) or
-                    isinstance(separator, AccessPathsLattice.NonNull)):
+            if separator.tag >= _NON_NULL:
                 return []
             else:
                 return [self]
 
         def touches(self, other):
-            return isinstance(other, AccessPathsLattice.Null)
-
-        def __hash__(self):
-            return hash(())
+            return other.tag == _NULL
 
         def __str__(self):
             return "[non-null]"
@@ -1382,14 +2025,17 @@ class AccessPathsLattice(AbstractDomain):
         """
         Represents the access path to a precise memory location.
         """
-        def __init__(self, val, dom):
+        __slots__ = ('val', 'dom')
+        tag = _ADDRESS
+        _instances = weakref.WeakValueDictionary()
+
+        def __new__(cls, val, dom):
             """
             :param int val: The address of the access path.
             :param AbstractDomain dom: The domain of the elements living at
                 this address.
             """
-            self.val = val
-            self.dom = dom
+            return cls._interned(val, dom)
 
         def size(self):
             return 1
@@ -1408,41 +2054,12 @@ class AccessPathsLattice(AbstractDomain):
                 self.dom, self.dom.join(state[0][self.val][1], value)
             )
 
-        def __or__(self, other):
-            if self <= other:
-                return other
-            elif other < self:
-                return self
-            elif (isinstance(other, AccessPathsLattice.Address) or
-                  isinstance(other, AccessPathsLattice.ProductGet)):
-                return AccessPathsLattice.NonNull()
-            elif isinstance(other, AccessPathsLattice.Null):
-                return AccessPathsLattice.AllPath()
-            else:
-                return self
-
-        def __and__(self, other):
-            if self <= other:
-                return self
-            elif other < self:
-                return other
-            else:
-                return AccessPathsLattice.NoPath()
-
-        def __eq__(self, other):
-            return (isinstance(other, AccessPathsLattice.Address) and
-                    self.val == other.val and self.dom == other.dom)
-
         def __lt__(self, other):
-            if (isinstance(other, AccessPathsLattice.NonNull) or
-                    isinstance(other, AccessPathsLattice.AllPath)):
-                return True
-            return False
+            return other.tag >= _NON_NULL
 
         def split(self, separator):
-            if (isinstance(separator, AccessPathsLattice.NonNull) or
-                    isinstance(separator, AccessPathsLattice.AllPath) or
-                    self == separator):
+            if separator.tag >= _NON_NULL or (
+                    self is separator):
                 return []
             else:
                 return [self]
@@ -1450,16 +2067,20 @@ class AccessPathsLattice(AbstractDomain):
         def touches(self, other):
             return False
 
-        def __hash__(self):
-            return hash((self.val, self.dom))
-
         def __str__(self):
             return "0x{}".format(format(self.val, '08x'))
 
     class Subprogram(AccessPath):
         """
         Represents the access path to a subprogram.
+
+        Subprogram accesses are not interned, since two accesses to the same
+        subprogram with the same captures are equal but may hold distinct
+        interfaces and implementations.
         """
+        __slots__ = ('name', 'interface', 'defs', 'vars')
+        tag = _SUBPROGRAM
+
         def __init__(self, name, interface, defs, capture_paths):
             """
             :param object name: The object identifying the subprogram accessed.
@@ -1470,10 +2091,14 @@ class AccessPathsLattice(AbstractDomain):
             :param list[AccessPath] capture_paths: The access paths to the
                 captured variables.
             """
-            self.name = name
-            self.interface = interface
-            self.defs = defs
-            self.vars = capture_paths
+            capture_paths = tuple(capture_paths)
+            object.__setattr__(self, 'name', name)
+            object.__setattr__(self, 'interface', interface)
+            object.__setattr__(self, 'defs', defs)
+            object.__setattr__(self, 'vars', capture_paths)
+            object.__setattr__(
+                self, '_hash', hash((self.tag, name) + capture_paths)
+            )
 
         def size(self):
             return 1
@@ -1487,38 +2112,19 @@ class AccessPathsLattice(AbstractDomain):
         def weak_update(self, state, value):
             raise NotImplementedError
 
-        def __or__(self, other):
-            if self <= other:
-                return other
-            elif other < self:
-                return self
-            elif isinstance(other, AccessPathsLattice.Null):
-                return AccessPathsLattice.AllPath()
-            else:
-                return AccessPathsLattice.NonNull()
-
-        def __and__(self, other):
-            if self <= other:
-                return self
-            elif other < self:
-                return other
-            else:
-                return AccessPathsLattice.NoPath()
-
         def __lt__(self, other):
-            return (isinstance(other, AccessPathsLattice.NonNull) or
-                    isinstance(other, AccessPathsLattice.AllPath))
+            return other.tag >= _NON_NULL
 
         def __eq__(self, other):
-            return (
+            return self is other or (
                 isinstance(other, AccessPathsLattice.Subprogram) and
+                self._hash == other._hash and
                 self.name == other.name and
-                all(a == b for a, b in zip(self.vars, other.vars))
+                self.vars == other.vars
             )
 
         def split(self, separator):
-            if (isinstance(separator, AccessPathsLattice.NonNull) or
-                    isinstance(separator, AccessPathsLattice.AllPath) or
+            if separator.tag >= _NON_NULL or (
                     self == separator):
                 return []
             else:
@@ -1527,9 +2133,6 @@ class AccessPathsLattice(AbstractDomain):
         def touches(self, other):
             return False
 
-        def __hash__(self):
-            return hash((self.name, self.vars))
-
         def __str__(self):
             return "Subprogram {} capturing ({})".format(
                 self.name, ", ".join(str(x) for x in self.vars)
@@ -1540,16 +2143,18 @@ class AccessPathsLattice(AbstractDomain):
         Represents the access path to a specific component of another access
         path.
         """
-        def __init__(self, prefix, component, dom):
+        __slots__ = ('prefix', 'component', 'dom')
+        tag = _PRODUCT_GET
+        _instances = weakref.WeakValueDictionary()
+
+        def __new__(cls, prefix, component, dom):
             """
             :param AccessPathsLattice.AccessPath prefix: The access path of
                 the element which component is being taken.
             :param int component: The index of the component.
             :param AbstractDomain dom: The domain of the component elements.
             """
-            self.prefix = prefix
-            self.component = component
-            self.dom = dom
+            return cls._interned(prefix, component, dom)
 
         def size(self):
             return self.prefix.size()
@@ -1571,47 +2176,18 @@ class AccessPathsLattice(AbstractDomain):
                 prod[:self.component] + (value,) + prod[self.component + 1:]
             )
 
-        def __or__(self, other):
-            if self <= other:
-                return other
-            elif other < self:
-                return self
-            elif (isinstance(other, AccessPathsLattice.Address) or
-                  isinstance(other, AccessPathsLattice.ProductGet)):
-                return AccessPathsLattice.NonNull()
-            elif isinstance(other, AccessPathsLattice.Null):
-                return AccessPathsLattice.AllPath()
-            else:
-                return self
-
-        def __and__(self, other):
-            if self <= other:
-                return self
-            elif other < self:
-                return other
-            else:
-                return AccessPathsLattice.NoPath()
-
-        def __eq__(self, other):
-            return (isinstance(other, AccessPathsLattice.ProductGet) and
-                    self.prefix == other.prefix and
-                    self.component == other.component and
-                    self.dom == other.dom)
-
         def __lt__(self, other):
-            if (isinstance(other, AccessPathsLattice.NonNull) or
-                    isinstance(other, AccessPathsLattice.AllPath)):
+            if other.tag >= _NON_NULL:
                 return True
-            elif (isinstance(other, AccessPathsLattice.ProductGet) and
+            elif (other.tag == _PRODUCT_GET and
                   self.component == other.component and
                   self.dom == other.dom):
                 return self.prefix < other.prefix
             return False
 
         def split(self, separator):
-            if (isinstance(separator, AccessPathsLattice.NonNull) or
-                    isinstance(separator, AccessPathsLattice.AllPath) or
-                    self == separator):
+            if separator.tag >= _NON_NULL or (
+                    self is separator):
                 return []
             else:
                 return [self]
@@ -1619,9 +2195,6 @@ class AccessPathsLattice(AbstractDomain):
         def touches(self, other):
             return False
 
-        def __hash__(self):
-            return hash((self.prefix, self.component, self.dom))
-
         def __str__(self):
             return "Get_{}({})".format(self.component, self.prefix)
 
@@ -1629,8 +2202,12 @@ class AccessPathsLattice(AbstractDomain):
         """
         Represents no access path.
         """
-        def __init__(self):
-            pass
+        __slots__ = ()
+        tag = _NO_PATH
+        _instances = {}
+
+        def __new__(cls):
+            return cls._interned()
 
         def size(self):
             return 0
@@ -1641,18 +2218,6 @@ class AccessPathsLattice(AbstractDomain):
         def strong_update(self, state, value):
             pass
 
-        def __or__(self, other):
-            return other
-
-        def __and__(self, other):
-            return self
-
-        def __eq__(self, other):
-            return isinstance(other, AccessPathsLattice.NoPath)
-
-        def __hash__(self):
-            return hash(())
-
         def split(self, separator):
             return []
 
@@ -1660,11 +2225,20 @@ class AccessPathsLattice(AbstractDomain):
             return True
 
         def __lt__(self, other):
-            return not isinstance(other, AccessPathsLattice.NoPath)
+            return other.tag != _NO_PATH
 
         def __str__(self):
             return "[no-path]"
 
+    _join_table = [
+        [_access_paths_join_rule(a, b) for b in _ACCESS_PATH_TAGS]
+        for a in _ACCESS_PATH_TAGS
+    ]
+    _meet_table = [
+        [_access_paths_meet_rule(a, b) for b in _ACCESS_PATH_TAGS]
+        for a in _ACCESS_PATH_TAGS
+    ]
+
     def __init__(self):
         self.bottom = AccessPathsLattice.NoPath()
         self.top = AccessPathsLattice.AllPath()
@@ -1713,19 +2287,50 @@ class AccessPathsLattice(AbstractDomain):
 
 
 class RandomAccessMemory(AbstractDomain):
+    """
+    Abstracts the memory as a map from addresses to pairs holding the domain
+    and the abstract value of the element stored there, together with an
+    offset. The map is persistent, such that memories which derive from one
+    another share the cells that they have in common: updates only copy the
+    path to the updated cell, and the lattice operations skip the shared
+    parts of the maps.
+    """
     def __init__(self):
         self.bottom = object()
-        self.top = ({}, 0)
+        self.top = (PersistentMap(), 0)
 
     def build(self, args):
-        assert isinstance(args, dict)
-        return args, 0
+        assert isinstance(args, (dict, PersistentMap))
+        return PersistentMap(args), 0
 
     def size(self, x):
         return 0 if x == self.bottom or any(
             dom.is_empty(elem) for dom, elem in x[0].values()
         ) else float('inf')
 
+    @staticmethod
+    def _merged(a, b, op):
+        """
+        Returns the map which contains the cells present in both given maps
+        with the same domain, combined with the given operation. Shared cells
+        are kept as is.
+
+        :param PersistentMap a: The first map.
+        :param PersistentMap b: The second map.
+        :param (AbstractDomain, object, object) -> object op: The operation
+            used to combine two values of a given domain.
+        :rtype: PersistentMap
+        """
+        res = a
+        for k, x, y in a.diff(b):
+            if x is PersistentMap.missing:
+                continue
+            elif y is not PersistentMap.missing and x[0] == y[0]:
+                res = res.set(k, (x[0], op(x[0], x[1], y[1])))
+            else:
+                res = res.delete(k)
+        return res
+
     def join(self, a, b):
         if a == self.bottom:
             return b
@@ -1734,12 +2339,9 @@ class RandomAccessMemory(AbstractDomain):
         elif a[1] != b[1]:
             raise NotImplementedError
         else:
-            res = {}
-            dct = zip_dicts(a[0], b[0], False)
-            for k, ((x_dom, x_elem), (y_dom, y_elem)) in dct.iteritems():
-                if x_dom == y_dom:
-                    res[k] = (x_dom, x_dom.join(x_elem, y_elem))
-            return res, a[1]
+            return self._merged(
+                a[0], b[0], lambda dom, x, y: dom.join(x, y)
+            ), a[1]
 
     def meet(self, a, b):
         if a == self.bottom or b == self.bottom:
@@ -1747,16 +2349,14 @@ class RandomAccessMemory(AbstractDomain):
         elif a[1] != b[1]:
             raise NotImplementedError
         else:
-            res = {}
-            dct = zip_dicts(a[0], b[0], True)
-
-            for k, (x, y) in dct.iteritems():
-                if x is None:
-                    res[k] = y
-                elif y is None:
-                    res[k] = x
+            res = a[0]
+            for k, x, y in a[0].diff(b[0]):
+                if x is PersistentMap.missing:
+                    res = res.set(k, y)
+                elif y is PersistentMap.missing:
+                    continue
                 elif x[0] == y[0]:
-                    res[k] = (x[0], x[0].meet(x[1], y[1]))
+                    res = res.set(k, (x[0], x[0].meet(x[1], y[1])))
                 else:
                     return self.bottom
 
@@ -1771,12 +2371,9 @@ class RandomAccessMemory(AbstractDomain):
             elif a[1] != b[1]:
                 raise NotImplementedError
             else:
-                res = {}
-                dct = zip_dicts(a[0], b[0], False)
-                for k, ((x_dom, x_elem), (y_dom, y_elem)) in dct.iteritems():
-                    if x_dom == y_dom:
-                        res[k] = (x_dom, x_dom.update(x_elem, y_elem, True))
-                return res, a[1]
+                return self._merged(
+                    a[0], b[0], lambda dom, x, y: dom.update(x, y, True)
+                ), a[1]
         else:
             return self.join(a, b)
 
@@ -1790,10 +2387,10 @@ class RandomAccessMemory(AbstractDomain):
             return NotImplementedError
         else:
             return len(a[0]) == len(b[0]) and all(
-                (i in b[0] and
-                 b[0][i][0] == x_dom and
-                 x_dom.eq(x_elem, b[0][i][1]))
-                for i, (x_dom, x_elem) in a[0].iteritems()
+                x is not PersistentMap.missing and
+                y is not PersistentMap.missing and
+                x[0] == y[0] and x[0].eq(x[1], y[1])
+                for _, x, y in a[0].diff(b[0])
             )
 
     def le(self, a, b):
@@ -1805,9 +2402,10 @@ class RandomAccessMemory(AbstractDomain):
             return NotImplementedError
         else:
             return all(
-                x_dom == b[0][i][0] and x_dom.le(x_elem, b[0][i][1])
-                if i in b[0] else True
-                for i, (x_dom, x_elem) in a[0].iteritems()
+                x[0] == y[0] and x[0].le(x[1], y[1])
+                if (x is not PersistentMap.missing and
+                    y is not PersistentMap.missing) else True
+                for _, x, y in a[0].diff(b[0])
             )
 
     def split(self, elem, separator):
@@ -1882,3 +2480,120 @@ class Universe(AbstractDomain):
 
     def str(self, x):
         return "[any]" if x == self.top else "[none]"
+
+
+class Interning(AbstractDomain):
+    """
+    Wraps an abstract domain such that the elements it builds are interned:
+    structurally equal elements are represented by a single object. Equality
+    and ordering tests between identical elements are therefore decided by an
+    identity check, elements can be used as keys of memo tables through their
+    id, and elements which are computed many times (typically, the states of
+    a program that do not change between two iterations of the fixpoint) are
+    only kept once in memory.
+
+    Interning requires that equal elements have equal hashable
+    representations (see utils.freeze), and that elements of the wrapped
+    domain are never mutated once built. Elements which cannot be frozen are
+    not interned. Note that since two different representations may describe
+    the same set of concrete values, comparing two distinct interned
+    elements still falls back on the wrapped domain.
+    """
+
+    HasSplit = Capability.IfSingle(lambda self: self.dom, Capability.HasSplit)
+    HasConcretize = Capability.IfSingle(
+        lambda self: self.dom, Capability.HasConcretize
+    )
+
+    def __init__(self, dom):
+        """
+        :param AbstractDomain dom: The domain whose elements to intern.
+        """
+        self.dom = dom
+        self.hits = 0
+        self.misses = 0
+        self._elements = {}
+        self.bottom = self.intern(dom.bottom)
+        if hasattr(dom, 'top'):
+            self.top = self.intern(dom.top)
+
+    def __getattr__(self, item):
+        # Give access to the attributes which are specific to the wrapped
+        # domain (e.g. Product.domains).
+        if item == 'dom':
+            raise AttributeError(item)
+        return getattr(self.dom, item)
+
+    def intern(self, x):
+        """
+        Returns the canonical object which represents the given element.
+
+        :param object x: An element of the wrapped domain.
+        :rtype: object
+        """
+        try:
+            key = freeze(x)
+            res = self._elements.get(key)
+            if res is None:
+                self.misses += 1
+                res = self._elements[key] = x
+            else:
+                self.hits += 1
+            return res
+        except TypeError:
+            return x
+
+    def clear(self):
+        """
+        Forgets all the elements interned so far. Elements built afterwards
+        are not shared with those.
+        """
+        self._elements.clear()
+        self.intern(self.bottom)
+        if hasattr(self, 'top'):
+            self.intern(self.top)
+
+    def build(self, *args):
+        return self.intern(self.dom.build(*args))
+
+    def is_empty(self, x):
+        return self.dom.is_empty(x)
+
+    def size(self, x):
+        return self.dom.size(x)
+
+    def join(self, a, b):
+        return self.intern(self.dom.join(a, b))
+
+    def meet(self, a, b):
+        return self.intern(self.dom.meet(a, b))
+
+    def update(self, a, b, widen=False):
+        return self.intern(self.dom.update(a, b, widen))
+
+    def lt(self, a, b):
+        return a is not b and self.dom.lt(a, b)
+
+    def eq(self, a, b):
+        return a is b or self.dom.eq(a, b)
+
+    def le(self, a, b):
+        return a is b or self.dom.le(a, b)
+
+    def split(self, elem, separator):
+        return [self.intern(x) for x in self.dom.split(elem, separator)]
+
+    def touches(self, a, b):
+        return self.dom.touches(a, b)
+
+    def generator(self):
+        return (self.intern(x) for x in self.dom.generator())
+
+    def concretize(self, abstract):
+        return self.dom.concretize(abstract)
+
+    def abstract(self, concrete):
+        return self.intern(self.dom.abstract(concrete))
+
+    def str(self, x):
+        return self.dom.str(x)
@@ -340,11 +340,7 @@ def default_real_range_interpreter(tpe):
 @type_interpreter
 def default_enum_interpreter(tpe):
     if tpe.is_a(types.Enum):
-        elems = set(tpe.lits)
-        if len(tpe.lits) < 5:
-            enum_dom = domains.FiniteLattice.of_subsets(elems)
-        else:
-            enum_dom = domains.FiniteSubsetLattice(elems)
+        enum_dom = domains.BitsetLattice(tpe.lits)
 
         bool_dom = boolean_ops.Boolean
 
@@ -593,13 +589,17 @@ def default_product_interpreter(elem_interpreter):
     return get_elements >> elem_interpreter.lifted() >> product_interpreter
 
 
-def default_array_interpreter(attribute_interpreter):
+def default_array_interpreter(attribute_interpreter, interval_arrays=False):
     """
     Builds a type interpreter for array types.
 
     :param TypeInterpreter attribute_interpreter: interpreter for the
         attributes of the array.
 
+    :param bool interval_arrays: Whether arrays indexed by a single integer
+        type are interpreted with the IntervalSparseArray domain, which keeps
+        track of many more entries than the SparseArray domain.
+
     :rtype: TypeInterpreter
     """
     @Transformer.as_transformer
@@ -629,7 +629,17 @@ def default_array_interpreter(attribute_interpreter):
         ))
         comp_dom = component_interp.domain
 
-        array_dom = domains.SparseArray(indices_dom, comp_dom, max_elems=15)
+        if (interval_arrays and len(index_interps) == 1 and
+                isinstance(index_interps[0].domain, domains.Intervals)):
+            # Arrays indexed by integers can keep track of many more entries
+            # at a reasonable cost.
+            array_dom = domains.IntervalSparseArray(
+                indices_dom, comp_dom, max_elems=256
+            )
+        else:
+            array_dom = domains.SparseArray(
+                indices_dom, comp_dom, max_elems=15
+            )
 
         call_sig = _signer(
             (array_dom,) + tuple(indices_dom.domains),
@@ -1040,9 +1050,17 @@ def default_unknown_interpreter(tpe):
         return new_universe_interpretation()
 
 
-@memoizing_type_interpreter
-@delegating_type_interpreter
-def default_type_interpreter():
+def _type_interpreter(inner, interval_arrays):
+    """
+    Builds a type interpreter for any type.
+
+    :param TypeInterpreter inner: The interpreter used for the types that
+        compose other types, which is typically the one being built.
+
+    :param bool interval_arrays: See default_array_interpreter.
+
+    :rtype: TypeInterpreter
+    """
     return (
         default_boolean_interpreter |
         default_char_interpreter(default_int_range_interpreter) |
@@ -1050,9 +1068,21 @@ def default_type_interpreter():
         default_real_range_interpreter |
         default_enum_interpreter |
         custom_pointer_interpreter |
-        default_product_interpreter(default_type_interpreter) |
-        default_array_interpreter(default_type_interpreter) |
+        default_product_interpreter(inner) |
+        default_array_interpreter(inner, interval_arrays) |
         default_ram_interpreter |
-        default_modeled_interpreter(default_type_interpreter) |
+        default_modeled_interpreter(inner) |
         default_unknown_interpreter
     )
+
+
+@memoizing_type_interpreter
+@delegating_type_interpreter
+def default_type_interpreter():
+    return _type_interpreter(default_type_interpreter, False)
+
+
+@memoizing_type_interpreter
+@delegating_type_interpreter
+def interval_arrays_type_interpreter():
+    return _type_interpreter(interval_arrays_type_interpreter, True)
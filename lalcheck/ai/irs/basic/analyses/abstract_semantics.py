@@ -2,6 +2,7 @@
 An analyzer that collects semantics at each program point.
 """
 
+import heapq
 from collections import defaultdict
 from xml.sax.saxutils import escape
 
@@ -9,10 +10,10 @@ from lalcheck.ai import domains
 from lalcheck.ai.interpretations import def_provider_builder
 from lalcheck.ai.irs.basic import visitors
 from lalcheck.ai.irs.basic.purpose import SyntheticVariable
-from lalcheck.ai.irs.basic.tree import Variable
-from lalcheck.ai.utils import KeyCounter, concat_dicts
+from lalcheck.ai.irs.basic.tree import AssumeStmt, ProgramHandle, Variable
+from lalcheck.ai.utils import KeyCounter, LRUCache, concat_dicts, freeze
 from lalcheck.tools import dot_printer
-from lalcheck.tools.digraph import Digraph
+from lalcheck.tools.digraph import Digraph, strongly_connected_components
 
 from lalcheck.ai.irs.basic.tools import (
     CFGBuilder,
@@ -130,7 +131,17 @@ class ExternalCallStrategy(object):
 
 class KnownTargetCallStrategy(ExternalCallStrategy):
     def __init__(self, progs):
+        """
+        :param list[Program | ProgramHandle] progs: The programs that can be
+            called. The programs of handles are only built when they are
+            first called.
+        """
         self.progs = progs
+        self._handles = [
+            prog if isinstance(prog, ProgramHandle)
+            else ProgramHandle.of(prog)
+            for prog in progs
+        ]
 
     def _get_provider(self, sig, prog):
         """
@@ -150,9 +161,9 @@ class KnownTargetCallStrategy(ExternalCallStrategy):
         raise NotImplementedError
 
     def __call__(self, sig):
-        for prog in self.progs:
-            if sig.name == prog.data.fun_id:
-                return self._get_provider(sig, prog)
+        for handle in self._handles:
+            if sig.name == handle.fun_id:
+                return self._get_provider(sig, handle.get())
 
 
 class UnknownTargetCallStrategy(ExternalCallStrategy):
@@ -179,14 +190,215 @@ class UnknownTargetCallStrategy(ExternalCallStrategy):
         return f, inv
 
 
+def _exit_values(prog, prog_model, analysis):
+    """
+    Returns the abstract value of each parameter of the given program, as well
+    as of its result variable (if any), at the exit of the program. The value
+    of a variable is the join of its values in all the environments that can
+    result from the analysis.
+
+    :param lalcheck.ai.irs.basic.tree.Program prog: The analyzed program.
+
+    :param dict prog_model: The model of the program.
+
+    :param AnalysisResults analysis: The results of the analysis.
+
+    :rtype: dict[Variable, object]
+    """
+    # Get all environments that can result from the analysis of the
+    # function called.
+    envs = [
+        values
+        for leaf in analysis.cfg.leafs()
+        for _, values in analysis.states_at(leaf)
+    ]
+
+    exit_vars = list(prog.data.param_vars)
+    if prog.data.result_var is not None:
+        exit_vars.append(prog.data.result_var)
+
+    return {
+        var: reduce(
+            prog_model[var].domain.join,
+            (env[var.data.index] for env in envs),
+            prog_model[var].domain.bottom
+        )
+        for var in exit_vars
+    }
+
+
+def _call_output(sig, prog, exit_values):
+    """
+    Builds the value returned by a call to the given program from the values
+    of its variables at its exit (see _exit_values).
+
+    :param lalcheck.ai.interpretations.Signature sig: The signature used to
+        call the program.
+
+    :param lalcheck.ai.irs.basic.tree.Program prog: The called program.
+
+    :param dict[Variable, object] exit_values: The values at the exit.
+
+    :rtype: object
+    """
+    # Fetch the values of the variables that are marked out.
+    param_values = tuple(
+        exit_values[prog.data.param_vars[i]]
+        for i in sig.out_param_indices
+    )
+
+    result_var = prog.data.result_var
+    if result_var is None:
+        return param_values
+    elif len(param_values) == 0:
+        # We must return the value directly when there is a single
+        # element to return instead of a 1-tuple.
+        return exit_values[result_var]
+    else:
+        return param_values + (exit_values[result_var],)
+
+
+class SummaryCache(object):
+    """
+    A bounded memo table of the summaries computed by the TopDownCallStrategy,
+    keyed by the called program and the abstract values of its arguments.
+
+    If subsumption is enabled, a lookup that does not find an exact match can
+    still reuse the summary computed for arguments that are greater (in the
+    sense of the argument domains) than the given ones. This is sound but
+    can lose precision, hence it is disabled by default. Such lookups only
+    consider the summaries of the same program called with the same out
+    parameters, which are indexed separately.
+    """
+    def __init__(self, max_size=256, subsumption=False):
+        """
+        :param int max_size: The maximal number of summaries to keep. Any
+            integer <= 0 means that the cache is unbounded.
+
+        :param bool subsumption: Whether to reuse summaries computed for
+            greater arguments when no exact match is found.
+        """
+        self.subsumption = subsumption
+        self._cache = LRUCache(max_size)
+        self._keys_by_target = defaultdict(set)
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+    @staticmethod
+    def _key(prog, sig, args):
+        return prog, tuple(sig.out_param_indices), freeze(args)
+
+    def get(self, prog, sig, args):
+        """
+        Returns the summary of the given program called with the given
+        arguments, or LRUCache.missing if there is none.
+
+        :param lalcheck.ai.irs.basic.tree.Program prog: The called program.
+
+        :param lalcheck.ai.interpretations.Signature sig: The signature used
+            to call the program.
+
+        :param tuple args: The abstract values of the arguments.
+
+        :rtype: object
+        """
+        try:
+            key = self._key(prog, sig, args)
+        except TypeError:
+            # Unhashable abstract values
+            return LRUCache.missing
+
+        res = self._cache.get(key)
+        if res is not LRUCache.missing:
+            return res[1]
+        elif not self.subsumption:
+            return res
+
+        for c_key in self._keys_by_target.get(key[:2], ()):
+            c_args, _ = self._cache.peek(c_key)
+            if all(
+                    dom.le(arg, c_arg)
+                    for dom, arg, c_arg in zip(sig.input_domains, args, c_args)
+            ):
+                # Undo the miss accounted by the exact lookup. Getting the
+                # entry accounts for the hit.
+                self._cache.misses -= 1
+                return self._cache.get(c_key)[1]
+
+        return LRUCache.missing
+
+    def put(self, prog, sig, args, summary):
+        """
+        Registers the summary of the given program called with the given
+        arguments.
+
+        :param lalcheck.ai.irs.basic.tree.Program prog: The called program.
+
+        :param lalcheck.ai.interpretations.Signature sig: The signature used
+            to call the program.
+
+        :param tuple args: The abstract values of the arguments.
+
+        :param object summary: The result of the call.
+        """
+        try:
+            key = self._key(prog, sig, args)
+        except TypeError:
+            return
+
+        if self.subsumption:
+            self._keys_by_target[key[:2]].add(key)
+
+        evicted = self._cache.put(key, (args, summary))
+        if evicted is not None and self.subsumption:
+            evicted_key = evicted[0]
+            target_keys = self._keys_by_target[evicted_key[:2]]
+            target_keys.discard(evicted_key)
+            if len(target_keys) == 0:
+                del self._keys_by_target[evicted_key[:2]]
+
+    def __str__(self):
+        return "Summary cache: {}".format(self._cache)
+
+
 class TopDownCallStrategy(KnownTargetCallStrategy):
-    def __init__(self, progs, get_model, get_merge_pred_builder):
+    def __init__(self, progs, get_model, get_merge_pred_builder,
+                 summary_cache=None):
+        """
+        :param list[lalcheck.ai.irs.basic.tree.Program] progs: The programs
+            that can be called.
+
+        :param Program->dict get_model: A function which returns the model
+            of a given program.
+
+        :param ()->MergePredicateBuilder get_merge_pred_builder: A function
+            which returns the merge predicate builder to use.
+
+        :param SummaryCache|None summary_cache: The cache in which to store
+            the summaries of the analyzed calls. A new one is created if
+            None is given.
+        """
         super(TopDownCallStrategy, self).__init__(progs)
         self.get_model = get_model
         self.get_merge_pred_builder = get_merge_pred_builder
+        self.summary_cache = (SummaryCache() if summary_cache is None
+                              else summary_cache)
 
     def _get_provider(self, sig, prog):
         def f(*args):
+            summary = self.summary_cache.get(prog, sig, args)
+            if summary is LRUCache.missing:
+                summary = compute_summary(*args)
+                self.summary_cache.put(prog, sig, args, summary)
+            return summary
+
+        def compute_summary(*args):
             arg_values = {
                 param: value
                 for param, value in zip(prog.data.param_vars, args)
@@ -201,45 +413,122 @@ class TopDownCallStrategy(KnownTargetCallStrategy):
                 arg_values
             )
 
-            # Get all environments that can result from the analysis of the
-            # function called.
-            envs = [
-                values
-                for leaf in analysis.cfg.leafs()
-                for _, values in analysis.semantics[leaf].iteritems()
-            ]
+            return _call_output(
+                sig, prog, _exit_values(prog, prog_model, analysis)
+            )
 
-            # Fetch the indices of variables that are marked out.
-            out_vars = [
-                prog.data.param_vars[i]
-                for i in sig.out_param_indices
+        def inv(*_):
+            raise NotImplementedError
+
+        return f, inv
+
+
+class BottomUpCallStrategy(KnownTargetCallStrategy):
+    """
+    Analyzes each called program only once, independently of the arguments
+    it is called with, and reuses the resulting summary for every call.
+
+    Summaries are computed following the strongly connected components of
+    the call graph in reverse topological order, such that the summaries of
+    the callees are always available when analyzing a caller. Inside a
+    component (i.e. for recursive calls), the result of a call whose summary
+    is not yet available is unknown. Summaries are computed when a program is
+    first called, for this program and the programs it calls transitively, so
+    that the programs of handles that are never called are not built.
+    """
+    def __init__(self, progs, call_graph, get_model, get_merge_pred_builder):
+        """
+        :param list[Program | ProgramHandle] progs: The programs that can be
+            called. The programs of handles are only built when their summary
+            is computed.
+
+        :param dict[Program | ProgramHandle, list[Program | ProgramHandle]]
+            call_graph: A mapping from each of the given programs to the ones
+            it calls.
+
+        :param Program->dict get_model: A function which returns the model
+            of a given program.
+
+        :param ()->MergePredicateBuilder get_merge_pred_builder: A function
+            which returns the merge predicate builder to use.
+        """
+        super(BottomUpCallStrategy, self).__init__(progs)
+        self.get_model = get_model
+        self.get_merge_pred_builder = get_merge_pred_builder
+        handle_of = dict(zip(progs, self._handles))
+        self._callees = {
+            handle_of[prog]: [
+                handle_of[callee] for callee in callees if callee in handle_of
             ]
+            for prog, callees in call_graph.iteritems()
+            if prog in handle_of
+        }
+        self._summaries = {}
+        self._in_progress = set()
+        self._unknown = UnknownTargetCallStrategy()
 
-            # Compute their value after the call using the environments.
-            param_values = tuple(
-                reduce(
-                    prog_model[var].domain.join,
-                    (env[var] for env in envs),
-                    prog_model[var].domain.bottom
+    def summary_of(self, prog):
+        """
+        Returns the summary of the given program, computing it (after the
+        ones of its callees) if needed. Returns None if the summary is being
+        computed, which happens for recursive calls.
+
+        :param lalcheck.ai.irs.basic.tree.Program prog: The program.
+        :rtype: dict[Variable, object] | None
+        """
+        if prog not in self._summaries and prog not in self._in_progress:
+            self.compute_summaries([
+                handle for handle in self._handles
+                if handle.is_built() and handle.get() is prog
+            ] or [ProgramHandle.of(prog)])
+        return self._summaries.get(prog)
+
+    def _compute_summary(self, prog):
+        """
+        Computes the summary of the given program, unless it is already
+        computed or being computed.
+
+        :param lalcheck.ai.irs.basic.tree.Program prog: The program.
+        """
+        if prog not in self._summaries and prog not in self._in_progress:
+            self._in_progress.add(prog)
+            try:
+                prog_model = self.get_model(prog)
+                analysis = compute_semantics(
+                    prog,
+                    prog_model,
+                    self.get_merge_pred_builder()
                 )
-                for var in out_vars
-            )
+                self._summaries[prog] = _exit_values(
+                    prog, prog_model, analysis
+                )
+            finally:
+                self._in_progress.remove(prog)
 
-            # Compute the value of the return variable (if any) after the call
-            # using the environments.
-            result_var = prog.data.result_var
-            result_value = (reduce(
-                prog_model[result_var].domain.join,
-                (env[result_var] for env in envs),
-                prog_model[result_var].domain.bottom
-            ),) if result_var is not None else ()
-
-            if len(out_vars) == 0 and result_var is not None:
-                # We must return the value directly when there is a single
-                # element to return instead of a 1-tuple.
-                return result_value[0]
-            else:
-                return param_values + result_value
+    def compute_summaries(self, roots=None):
+        """
+        Computes the summaries of the given programs and of the programs they
+        call transitively, callees first.
+
+        :param list[ProgramHandle] | None roots: The handles of the programs,
+            or None for all the programs that can be called.
+        """
+        sccs = strongly_connected_components(
+            self._handles if roots is None else roots,
+            lambda handle: self._callees.get(handle, [])
+        )
+        for scc in sccs:
+            for handle in scc:
+                self._compute_summary(handle.get())
+
+    def _get_provider(self, sig, prog):
+        unknown_f, _ = self._unknown(sig)
+
+        def f(*args):
+            summary = self.summary_of(prog)
+            if summary is None:
+                return unknown_f(*args)
+            return _call_output(sig, prog, summary)
 
         def inv(*_):
             raise NotImplementedError
@@ -330,18 +619,95 @@ def _build_resulting_graph(file_name, cfg, results, trace_domain, model):
         ]))
 
 
+class _SemanticsView(object):
+    """
+    A read-only mapping from each program point to its abstract state, in
+    which an abstract state is a map from program traces to environments,
+    and environments map variables to their values.
+
+    The mapping is built lazily out of the state vectors computed by the
+    analysis: the state of a program point is only materialized when it
+    is accessed.
+    """
+    def __init__(self, results):
+        """
+        :param AnalysisResults results: The results to view.
+        """
+        self._results = results
+        self._materialized = {}
+
+    def __getitem__(self, node):
+        state = self._materialized.get(node)
+        if state is None:
+            var_set = self._results.var_set
+            state = self._materialized[node] = {
+                trace: {v: values[v.data.index] for v in var_set}
+                for trace, values in self._results.states_at(node)
+            }
+        return state
+
+    def __contains__(self, node):
+        return node in self._results.states
+
+    def __iter__(self):
+        return iter(self._results.states)
+
+    def __len__(self):
+        return len(self._results.states)
+
+    def keys(self):
+        return self._results.states.keys()
+
+    def iteritems(self):
+        return ((node, self[node]) for node in self._results.states)
+
+    def items(self):
+        return list(self.iteritems())
+
+
 class AnalysisResults(object):
     """
     Contains the results of the abstract semantics analysis.
+
+    The state at each program point is kept as computed by the analysis,
+    i.e. as a list of pairs of a program trace and a state vector which maps
+    the index of a variable to its value. Environments mapping variables to
+    their values are only built on demand (see semantics).
+
+    Since the results of an analysis are shared by all the checkers that
+    query it, the program points of the assume statements are indexed by
+    purpose once, and the evaluation of an expression at a given program
+    point is memoized.
     """
-    def __init__(self, cfg, semantics, trace_domain, vars_domain,
+    def __init__(self, cfg, states, var_set, trace_domain, vars_domain,
                  evaluator, orig_subp):
+        """
+        :param Digraph cfg: The control-flow graph of the analyzed program.
+
+        :param dict[Digraph.Node, list[(frozenset, tuple)]] states: The state
+            computed at each program point.
+
+        :param set[Variable] var_set: The variables of the program.
+
+        :param _SimpleTraceLattice trace_domain: The domain of traces.
+
+        :param domains.Product | domains.Interning vars_domain: The domain
+            of state vectors.
+
+        :param ExprEvaluator evaluator: The evaluator of expressions.
+
+        :param object orig_subp: The analyzed subprogram.
+        """
         self.cfg = cfg
-        self.semantics = semantics
+        self.states = states
+        self.var_set = var_set
         self.trace_domain = trace_domain
         self.vars_domain = vars_domain
         self.evaluator = evaluator
         self.orig_subp = orig_subp
+        self.semantics = _SemanticsView(self)
+        self._assumes_by_purpose = None
+        self._eval_cache = {}
 
     def save_cfg_to_file(self, file_name):
         """
@@ -362,36 +728,74 @@ class AnalysisResults(object):
             self.evaluator.model
         )
 
-    @staticmethod
-    def _to_state(env):
+    def release(self):
+        """
+        Drops the states computed by the analysis as well as everything that
+        was memoized from them, only keeping the control-flow graph of the
+        program. The results must not be queried afterwards, but the objects
+        which keep a reference to them (e.g. the results of a checker) do not
+        keep the states in memory anymore.
         """
-        Given an environment as a map from variable to value (domain element),
-        generate a state vector as used by the expression evaluator. A state
-        vector maps the INDEX of a variable to its value instead of the mapping
-        the variable itself. For efficiency, we use a tuple instead of a dict
-        to contain the mapping, although not all indices necessarily have an
-        image. Those that don't have their component equal to None.
+        self.states = None
+        self.semantics = None
+        self._assumes_by_purpose = None
+        self._eval_cache = None
 
-        :param dict[Variable, object] env: The environment, a map from
-            variables to the domain element that they hold.
+    def states_at(self, node):
+        """
+        Returns the state computed at the given program point, as a list of
+        pairs of a program trace and a state vector.
 
-        :rtype: tuple[object]
+        :param Digraph.Node node: The program point.
+        :rtype: list[(frozenset[Digraph.Node], tuple)]
         """
+        return self.states[node]
 
-        # Because the set of indices may have holes, the maximal index is not
-        # necessarily equal to the number of variables minus one. Therefore,
-        # we first compute the appropriate length of the list that we will
-        # use to store the state.
+    def is_reachable(self, node):
+        """
+        Returns False if the analysis found that the given program point
+        can never be reached.
 
-        max_index = (
-            max(v.data.index for v in env.keys()) if len(env) > 0 else 0
-        )
-        state_vector = [None] * (max_index + 1)
+        :param Digraph.Node node: The program point.
+        :rtype: bool
+        """
+        return len(self.states[node]) > 0
 
-        for var, value in env.iteritems():
-            state_vector[var.data.index] = value
+    def _index_assumes(self):
+        """
+        Traverses the control-flow graph once to collect the program points
+        which have an assume statement with a purpose, bucketed by the type
+        of their purpose. Each program point is stored along with its
+        position in the control-flow graph.
+        """
+        self._assumes_by_purpose = defaultdict(list)
+        for position, node in enumerate(self.cfg.nodes):
+            assume = node.data.get('node')
+            if isinstance(assume, AssumeStmt) and 'purpose' in assume.data:
+                purpose = assume.data.purpose
+                self._assumes_by_purpose[type(purpose)].append(
+                    (position, (node, assume.expr, purpose))
+                )
+
+    def assumes_with_purpose(self, purpose_type):
+        """
+        Returns the program points which have an assume statement whose
+        purpose is of the given type, in the order of the control-flow graph.
 
-        return tuple(state_vector)
+        :param type purpose_type: The purpose to collect.
+        :rtype: list[(Digraph.Node, irt.Expr, purpose_type)]
+        """
+        if self._assumes_by_purpose is None:
+            self._index_assumes()
+
+        return [
+            assume
+            for _, assume in heapq.merge(*(
+                assumes
+                for tpe, assumes in self._assumes_by_purpose.iteritems()
+                if issubclass(tpe, purpose_type)
+            ))
+        ]
 
     def eval_at(self, node, expr):
         """
@@ -404,21 +808,59 @@ class AnalysisResults(object):
         :param irt.Expr expr: The expression to evaluate using the knowledge
             at that specific program point.
 
+        :return: The value of the expression for each program trace. This
+            mapping is memoized and must not be modified.
+
         :rtype: dict[frozenset[Digraph.Node], object]
         """
-        return {
-            trace: self.evaluator.eval(
-                expr,
-                self._to_state(env)
+        return self.eval_at_each([node], expr)[0]
+
+    def eval_at_each(self, nodes, expr):
+        """
+        Given several program points, evaluates for each program trace
+        available at each of these program points the given expression.
+        The states of all the program points for which the evaluation is not
+        memoized yet are evaluated together, in a single batch.
+
+        :param iterable[Digraph.Node] nodes: The program points at which to
+            evaluate the expression.
+
+        :param irt.Expr expr: The expression to evaluate.
+
+        :return: For each program point, in the given order, the value of the
+            expression for each program trace (see eval_at).
+
+        :rtype: list[dict[frozenset[Digraph.Node], object]]
+        """
+        nodes = list(nodes)
+        todo = [
+            node for node in frozenset(nodes)
+            if (node, expr) not in self._eval_cache
+        ]
+
+        if len(todo) > 0:
+            entries = [
+                (node, trace, values)
+                for node in todo
+                for trace, values in self.states[node]
+            ]
+            results = self.evaluator.eval_batch(
+                expr, [values for _, _, values in entries]
             )
-            for trace, env in self.semantics[node].iteritems()
-        }
+            for node in todo:
+                self._eval_cache[node, expr] = {}
+            for (node, trace, _), value in zip(entries, results):
+                self._eval_cache[node, expr][trace] = value
+
+        return [self._eval_cache[node, expr] for node in nodes]
 
 
 _unit_domain = domains.Product()
 
 
-def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
+def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None,
+                      tracked_vars=None, interning=False,
+                      inline_intervals=False):
     evaluator = ExprEvaluator(prog_model)
     solver = ExprSolver(prog_model)
 
@@ -440,18 +882,31 @@ def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
 
     # find the variables that appear in the program
     var_set = set(n for n in prog_model.keys() if isinstance(n, Variable))
+    if tracked_vars is not None:
+        var_set &= tracked_vars
 
     # build an index
     indexed_vars = {var.data.index: var for var in var_set}
     last_index = max(indexed_vars.keys()) if len(indexed_vars) > 0 else -1
 
     # define the variables domain
-    vars_domain = domains.Product(*(
+    product_domain = (domains.IntervalProduct if inline_intervals
+                      else domains.Product)
+    vars_domain = product_domain(*(
         prog_model[indexed_vars[i]].domain
         if i in indexed_vars else _unit_domain
         for i in range(last_index + 1)
     ))
 
+    if interning:
+        # Share the states that are computed several times, typically at
+        # each iteration of the fixpoint.
+        vars_domain = domains.Interning(vars_domain)
+        intern = vars_domain.intern
+    else:
+        def intern(values):
+            return values
+
     # define the trace domain
     trace_domain = _SimpleTraceLattice(cfg.nodes)
 
@@ -468,6 +923,9 @@ def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
         None  # We don't need a top element here.
     )
 
+    if interning:
+        lat = domains.Interning(lat)
+
     # the transfer function
     transfer_func = _VarTracker(var_set, vars_domain, evaluator, solver)
 
@@ -475,7 +933,7 @@ def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
         transferred = (
             (
                 trace,
-                node.data.node.visit(transfer_func, values)
+                intern(node.data.node.visit(transfer_func, values))
                 if node.data.node is not None else values
             )
             for trace, values in inputs
@@ -518,7 +976,7 @@ def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
     )
 
     # initial state at the the entry of the program
-    init_lat = lat.build([(trace_domain.bottom, init_vars)])
+    init_lat = lat.build([(trace_domain.bottom, intern(init_vars))])
 
     # last state of the program (all program points)
     last = concat_dicts(
@@ -533,19 +991,14 @@ def compute_semantics(prog, prog_model, merge_pred_builder, arg_values=None):
     while any(not lat.eq(x, result[i]) for i, x in last.iteritems()):
         last, result = result, it(result)
 
-    formatted_results = {
-        node: {
-            trace: {
-                v: values[v.data.index] for v in var_set
-            }
-            for trace, values in state
-        }
-        for node, state in result.iteritems()
-    }
+    if interning:
+        # Do not keep the intermediate states alive with the results.
+        vars_domain.clear()
 
     return AnalysisResults(
         cfg,
-        formatted_results,
+        result,
+        var_set,
         trace_domain,
         vars_domain,
         evaluator,
@@ -0,0 +1,164 @@
+"""
+Provides a demand-driven slicing of Basic IR programs: given the purposes of
+the assume statements that are going to be queried after the analysis of a
+program, only keep the statements and variables on which the expressions of
+those assume statements depend.
+"""
+
+from lalcheck.ai.irs.basic import tree as irt, visitors
+
+
+def _vars_of(expr):
+    """
+    :param irt.Expr expr: The expression to consider.
+    :return: The variables that are referenced in the given expression.
+    :rtype: set[irt.Variable]
+    """
+    return {
+        ident.var
+        for ident in visitors.findall(
+            expr, lambda n: isinstance(n, irt.Identifier)
+        )
+    }
+
+
+def _is_criterion(stmt, purpose_types):
+    return (isinstance(stmt, irt.AssumeStmt) and
+            any(p.is_purpose_of(stmt) for p in purpose_types))
+
+
+class _StmtCollector(visitors.ImplicitVisitor):
+    """
+    Collects all the simple statements (i.e. statements that are not control
+    flow statements) of a program.
+    """
+    def __init__(self):
+        self.stmts = []
+
+    def visit_assign(self, assign, *args):
+        self.stmts.append(assign)
+
+    def visit_read(self, read, *args):
+        self.stmts.append(read)
+
+    def visit_assume(self, assume, *args):
+        self.stmts.append(assume)
+
+
+def _relevant_vars(prog, purpose_types):
+    """
+    Computes the set of variables on which the expressions of the assume
+    statements that have one of the given purposes depend.
+
+    The dependencies are computed in a flow-insensitive manner: the value
+    of an assigned variable depends on every variable of the assigned
+    expression, and the variables that appear together in an assume
+    statement depend on each other.
+
+    :param irt.Program prog: The program to consider.
+    :param tuple[type] purpose_types: The purposes of interest.
+    :rtype: set[irt.Variable]
+    """
+    collector = _StmtCollector()
+    prog.visit(collector)
+
+    relevant = set()
+    deps = []  # list of pairs (defined variables, used variables)
+
+    for stmt in collector.stmts:
+        if isinstance(stmt, irt.AssignStmt):
+            deps.append(({stmt.id.var}, _vars_of(stmt.expr)))
+        elif isinstance(stmt, irt.AssumeStmt):
+            used = _vars_of(stmt.expr)
+            if _is_criterion(stmt, purpose_types):
+                relevant.update(used)
+            else:
+                deps.append((used, used))
+
+    changed = True
+    while changed:
+        changed = False
+        for defined, used in deps:
+            if not defined.isdisjoint(relevant) and not used <= relevant:
+                relevant.update(used)
+                changed = True
+
+    return relevant
+
+
+class _Slicer(visitors.Visitor):
+    """
+    Rebuilds the statements of a program, only keeping those that are part
+    of the slice. Statements that are kept are not copied, such that
+    information attached to them (e.g. models) remain valid for the slice.
+    """
+    def __init__(self, relevant, purpose_types):
+        self.relevant = relevant
+        self.purpose_types = purpose_types
+
+    def slice_stmts(self, stmts):
+        return [
+            sliced
+            for sliced in (stmt.visit(self) for stmt in stmts)
+            if sliced is not None
+        ]
+
+    def visit_program(self, prgm):
+        return irt.Program(self.slice_stmts(prgm.stmts), **prgm.data)
+
+    def visit_assign(self, assign):
+        return assign if assign.id.var in self.relevant else None
+
+    def visit_read(self, read):
+        return read if read.id.var in self.relevant else None
+
+    def visit_assume(self, assume):
+        used = _vars_of(assume.expr)
+        if (len(used) == 0 or not used.isdisjoint(self.relevant) or
+                _is_criterion(assume, self.purpose_types)):
+            return assume
+        return None
+
+    def visit_split(self, splitstmt):
+        branches = [self.slice_stmts(branch) for branch in splitstmt.branches]
+        if all(len(branch) == 0 for branch in branches):
+            return None
+        return irt.SplitStmt(branches, **splitstmt.data)
+
+    def visit_loop(self, loopstmt):
+        stmts = self.slice_stmts(loopstmt.stmts)
+        if len(stmts) == 0:
+            return None
+        return irt.LoopStmt(stmts, **loopstmt.data)
+
+    def visit_label(self, labelstmt):
+        return labelstmt
+
+    def visit_goto(self, gotostmt):
+        return gotostmt
+
+
+def slice_program(prog, purpose_types):
+    """
+    Computes the slice of the given program with respect to the assume
+    statements that have one of the given purposes, that is, the program
+    that only keeps the statements which can influence the values of the
+    expressions of those assume statements.
+
+    Assume statements which do not involve any variable of the slice are
+    removed, which means that the analysis of the slice can consider paths
+    which are infeasible in the original program. Hence, the results of the
+    analysis of the slice at those assume statements are sound but can be
+    less precise.
+
+    :param irt.Program prog: The program to slice.
+    :param tuple[type] purpose_types: The purposes of the assume statements
+        to preserve.
+
+    :return: The sliced program, along with the set of variables that it
+        references.
+
+    :rtype: (irt.Program, set[irt.Variable])
+    """
+    relevant = _relevant_vars(prog, purpose_types)
+    return prog.visit(_Slicer(relevant, purpose_types)), relevant
@@ -3,19 +3,49 @@ Provides a libadalang frontend for the Basic IR.
 """
 
 import libadalang as lal
+from lalcheck.ai.irs.basic import serialization, tree as irt
+from lalcheck.ai.type_cache import TypeCache
 from lalcheck.ai.utils import profile
 from lalcheck.tools.logger import log_stdout, log
+from lalcheck.tools.parallel import fork_map
 
 import analysis
+import locators
 import typers
 import utils
+import cPickle
+import hashlib
 import time
+from collections import defaultdict
+from functools import partial
 from codegen import ConvertUniversalTypes, gen_ir
 
 
 unknown_typer = typers.unknown_typer
 
 
+class _GenerationContext(object):
+    """
+    A view of an extraction context in which the programs of a unit are
+    generated, whose analysis data is a snapshot of the one of the
+    subprograms of the unit and of the subprograms they call. Hence, these
+    programs do not depend on the units that are traversed after this one,
+    nor on whether they are generated lazily.
+    """
+    def __init__(self, ctx, subpdata):
+        """
+        :param ExtractionContext ctx: The extraction context.
+
+        :param dict[lal.AdaNode, analysis.SubpAnalysisData | None] subpdata:
+            The snapshot of the analysis data.
+        """
+        self._ctx = ctx
+        self.subpdata = subpdata
+
+    def __getattr__(self, name):
+        return getattr(self._ctx, name)
+
+
 class ExtractionContext(object):
     """
     The libadalang-based frontend interface. Provides method for extracting
@@ -26,8 +56,31 @@ class ExtractionContext(object):
     compatible. Also, this extraction context must be kept alive as long
     as the programs parsed with it are intended to be used.
     """
-    def __init__(self, lal_ctx=None):
+    def __init__(self, lal_ctx=None, type_cache=None, ir_cache=None,
+                 ir_workers=1):
+        """
+        :param lal.AnalysisContext | None lal_ctx: The libadalang context to
+            use. A new one is created if None.
+
+        :param str | TypeCache | None type_cache: The on-disk cache in which
+            the default typers look up the types of type declarations
+            (or its path), if any.
+
+        :param str | serialization.ProgramCache | None ir_cache: The on-disk
+            cache in which the programs extracted from units are looked up
+            (or its path), if any.
+
+        :param int ir_workers: The number of processes among which the
+            generation of the programs of a unit is distributed.
+        """
         self.lal_ctx = lal.AnalysisContext() if lal_ctx is None else lal_ctx
+        self.type_cache = (TypeCache(type_cache)
+                           if isinstance(type_cache, str)
+                           else type_cache)
+        self.ir_cache = (serialization.ProgramCache(ir_cache)
+                         if isinstance(ir_cache, str)
+                         else ir_cache)
+        self.ir_workers = ir_workers
 
         # Get a dummy node, needed to call static properties of libadalang.
         dummy = self.lal_ctx.get_from_buffer(
@@ -55,6 +108,11 @@ class ExtractionContext(object):
         self.type_models = {}
         self.fun_models = {}
         self.subpdata = {}
+        self.model_units = []
+        self._unit_digests = {}
+        self._resolver = locators.NodeResolver(
+            self.lal_ctx, dummy.p_standard_unit
+        )
         self._internal_typer = self.default_typer()
 
     @staticmethod
@@ -80,10 +138,12 @@ class ExtractionContext(object):
 
         :rtype: iterable[irt.Program]
         """
-        return self._extract_from_unit(self.lal_ctx.get_from_file(ada_file))
+        return self.extract_programs_from_unit(
+            self.lal_ctx.get_from_file(ada_file)
+        )
 
     def extract_programs_from_provider(self, name, kind):
-        return self._extract_from_unit(self.lal_ctx.get_from_provider(
+        return self.extract_programs_from_unit(self.lal_ctx.get_from_provider(
             name, kind
         ))
 
@@ -91,7 +151,10 @@ class ExtractionContext(object):
         """
         :param lal.AnalysisUnit unit: The already parsed compilation unit.
         """
-        return self._extract_from_unit(unit)
+        handles = self._extract_from_unit(unit)
+        if handles is None:
+            return None
+        return [handle.get() for handle in handles]
 
     @profile()
     def use_model(self, name):
@@ -143,43 +206,407 @@ class ExtractionContext(object):
             else:
                 self.fun_models[ref] = fdecl
 
-    @profile()
-    def _extract_from_unit(self, unit):
+        self.model_units.append(model_unit)
+
+    def extract_program_handles_from_unit(self, unit):
+        """
+        :param lal.AnalysisUnit unit: The already parsed compilation unit.
+
+        :return: A handle on the program of each subprogram body of the unit,
+            in order. Each program is only generated (or loaded from the IR
+            cache) when its handle is first accessed, unless several IR
+            workers are used or the unit is missing from the IR cache, in
+            which case all the programs of the unit are generated at once.
+
+        :rtype: list[irt.ProgramHandle]
+        """
+        if self.ir_cache is not None or self.ir_workers > 1:
+            return self._extract_from_unit(unit)
+
+        subpdata = self._traverse_unit(unit)
+        if subpdata is None:
+            return None
+
+        gen_ctx = self._generation_context(subpdata)
+        return [
+            irt.ProgramHandle(subp, partial(self._gen_program, subp, gen_ctx))
+            for subp in self._subprogram_bodies(subpdata)
+        ]
+
+    def _traverse_unit(self, unit):
+        """
+        Computes the analysis data of the subprograms of the given unit (see
+        analysis.traverse_unit) and registers it in this context.
+
+        :param lal.AnalysisUnit unit: The unit to traverse.
+
+        :return: The analysis data of each subprogram of the unit, or None if
+            the unit could not be parsed.
+
+        :rtype: dict[lal.AdaNode, analysis.SubpAnalysisData] | None
+        """
         if unit.root is None:
             with log_stdout('error'):
                 print('Could not parse {}:'.format(unit.filename))
                 for diag in unit.diagnostics:
                     print('   {}'.format(diag))
-                    return
+            return None
 
         unit.populate_lexical_env()
 
         subpdata = analysis.traverse_unit(unit.root)
         self.subpdata.update(subpdata)
+        return subpdata
 
-        progs = []
-        for subp, subpuserdata in subpdata.iteritems():
-            if subp.is_a(lal.BaseSubpBody):
-                start_t = time.clock()
-                progs.append(
-                    gen_ir(self, subp, self._internal_typer, subpuserdata)
-                )
-                end_t = time.clock()
-                log(
-                    'timings',
-                    " - Transformation of subprocedure {} took {}s".format(
-                        subp.f_subp_spec.f_subp_name.text,
-                        end_t - start_t
-                    )
-                )
+    def _generation_context(self, subpdata):
+        """
+        :param dict[lal.AdaNode, analysis.SubpAnalysisData] subpdata: The
+            analysis data of the subprograms of a unit.
+
+        :return: The context in which to generate the programs of the unit,
+            which holds the analysis data of the subprograms of the unit and
+            of the subprograms they call, as known by this context now.
+
+        :rtype: _GenerationContext
+        """
+        known = self._callees_data(subpdata)
+        known.update(subpdata)
+        return _GenerationContext(self, known)
+
+    @staticmethod
+    def _subprogram_bodies(subpdata):
+        return utils.sorted_by_position([
+            subp for subp in subpdata if subp.is_a(lal.BaseSubpBody)
+        ])
+
+    def _gen_program(self, subp, gen_ctx):
+        """
+        Generates the program of a single subprogram body.
+
+        :param lal.BaseSubpBody subp: The subprogram to transform.
+
+        :param _GenerationContext gen_ctx: The context in which to generate
+            the programs of its unit (see _generation_context).
+
+        :rtype: irt.Program
+        """
+        prog, = self._gen_programs([subp], gen_ctx)
+        prog.visit(ConvertUniversalTypes(self.evaluator, self._internal_typer))
+        self.flush_type_cache()
+        return prog
+
+    @profile()
+    def _extract_from_unit(self, unit):
+        """
+        :param lal.AnalysisUnit unit: The already parsed compilation unit.
+
+        :return: A handle on the program of each subprogram body of the unit,
+            in order, or None if the unit could not be parsed. The programs
+            are generated at once, except for the ones found in the IR cache,
+            which are only loaded when their handle is first accessed.
+
+        :rtype: list[irt.ProgramHandle] | None
+        """
+        subpdata = self._traverse_unit(unit)
+        if subpdata is None:
+            return None
+
+        subps = self._subprogram_bodies(subpdata)
+        gen_ctx = self._generation_context(subpdata)
+
+        if self.ir_cache is not None:
+            ir_key = self._ir_cache_key(unit, subpdata)
+            handles = self._load_programs(ir_key, subps, gen_ctx)
+            if handles is not None:
+                return handles
+
+        if self.ir_workers > 1 and len(subps) > 1:
+            progs = self._gen_programs_in_parallel(subps, gen_ctx)
+        else:
+            progs = self._gen_programs(subps, gen_ctx)
 
         converter = ConvertUniversalTypes(self.evaluator, self._internal_typer)
 
         for prog in progs:
             prog.visit(converter)
 
+        if self.ir_cache is not None:
+            self._store_programs(ir_key, unit, progs)
+
+        self.flush_type_cache()
+        return [irt.ProgramHandle.of(prog) for prog in progs]
+
+    def _gen_programs(self, subps, gen_ctx):
+        """
+        :param list[lal.BaseSubpBody] subps: The subprograms to transform.
+
+        :param _GenerationContext gen_ctx: The context in which to generate
+            the programs of their unit (see _generation_context).
+
+        :return: The program of each subprogram, in the same order.
+
+        :rtype: list[irt.Program]
+        """
+        progs = []
+        for subp in subps:
+            start_t = time.clock()
+            progs.append(
+                gen_ir(gen_ctx, subp, self._internal_typer,
+                       gen_ctx.subpdata[subp])
+            )
+            end_t = time.clock()
+            log(
+                'timings',
+                " - Transformation of subprocedure {} took {}s".format(
+                    subp.f_subp_spec.f_subp_name.text,
+                    end_t - start_t
+                )
+            )
         return progs
 
+    def _gen_programs_in_parallel(self, subps, gen_ctx):
+        """
+        Same as _gen_programs, but distributes the subprograms among
+        ir_workers forked processes, which send back the serialized programs.
+        The subprograms of a process that fails, or whose programs cannot be
+        deserialized, are transformed by this one, as are all of them if
+        processes cannot be forked.
+
+        :param list[lal.BaseSubpBody] subps: The subprograms to transform.
+
+        :param _GenerationContext gen_ctx: The context in which to generate
+            the programs of their unit (see _generation_context).
+
+        :rtype: list[irt.Program]
+        """
+        worker_count = min(self.ir_workers, len(subps))
+
+        # Interleave the subprograms so that each worker gets subprograms
+        # from all the parts of the unit.
+        chunks = [subps[i::worker_count] for i in range(worker_count)]
+
+        def gen_chunk(chunk):
+            progs = self._gen_programs(chunk, gen_ctx)
+            self.flush_type_cache()
+            return serialization.dumps(
+                progs, self._resolver.persistent_id(set())
+            )
+
+        try:
+            results = fork_map(gen_chunk, chunks)
+        except EnvironmentError as e:
+            log('info', 'warning: IR generation workers failed ({}), '
+                        'generating sequentially.'.format(e))
+            return self._gen_programs(subps, gen_ctx)
+
+        res = [None] * len(subps)
+        for i, data in enumerate(results):
+            progs = None
+            if data is not None:
+                try:
+                    progs = serialization.loads(
+                        data, self._resolver.persistent_load
+                    )
+                except (ValueError, LookupError, cPickle.PickleError):
+                    pass
+
+            if progs is None:
+                log('info', 'warning: IR generation failed in a worker, '
+                            'retrying sequentially.')
+                progs = self._gen_programs(chunks[i], gen_ctx)
+
+            res[i::worker_count] = progs
+        return res
+
+    def _callees_data(self, subpdata):
+        """
+        :param dict[lal.AdaNode, analysis.SubpAnalysisData] subpdata: The
+            analysis data of the subprograms of a unit.
+
+        :return: The analysis data of the subprograms called by the given
+            ones, as known by this context so far, or None for the called
+            subprograms whose unit was not traversed yet.
+
+        :rtype: dict[lal.AdaNode, analysis.SubpAnalysisData | None]
+        """
+        return {
+            callee: self.subpdata.get(callee)
+            for data in subpdata.itervalues()
+            for callee in data.out_calls
+        }
+
+    def _ir_cache_key(self, unit, subpdata):
+        """
+        Besides the content of the unit and of the model units, the programs
+        extracted from a unit depend on the global variables used by the
+        subprograms it calls, as computed for the units that were traversed
+        by this context so far.
+
+        :param lal.AnalysisUnit unit: The unit from which programs are
+            extracted.
+
+        :param dict[lal.AdaNode, analysis.SubpAnalysisData] subpdata: The
+            analysis data of the subprograms of the unit.
+
+        :return: The key of these programs in the IR cache.
+
+        :rtype: str
+        """
+        global_vars = sorted(
+            (locators.locate(callee),
+             None if data is None
+             else sorted(locators.locate(var)
+                         for var in data.all_global_vars or ()))
+            for callee, data in self._callees_data(subpdata).iteritems()
+        )
+        return hashlib.sha1(repr((
+            unit.filename,
+            self.unit_digest(unit),
+            [self.unit_digest(model_unit) for model_unit in self.model_units],
+            global_vars
+        ))).hexdigest()
+
+    def _dependencies_up_to_date(self, dependencies):
+        return all(
+            self.unit_digest(self._resolver.unit(filename)) == digest
+            for filename, digest in dependencies.iteritems()
+        )
+
+    def _load_programs(self, key, subps, gen_ctx):
+        """
+        Looks up the programs associated to the given key in the IR cache.
+        Each program is only deserialized when its handle is first accessed,
+        at which point the libadalang nodes it refers to are resolved, which
+        fetches their units on demand. A program that cannot be deserialized
+        is generated instead.
+
+        :param str key: The key of the programs in the IR cache.
+
+        :param list[lal.BaseSubpBody] subps: The subprogram bodies of the
+            unit, in order.
+
+        :param _GenerationContext gen_ctx: The context in which to generate
+            the programs of the unit (see _generation_context).
+
+        :rtype: list[irt.ProgramHandle] | None
+        """
+        entry = self.ir_cache.get(key, self._dependencies_up_to_date)
+        if entry is None or len(entry) != len(subps):
+            return None
+
+        return [
+            irt.ProgramHandle(
+                subp, partial(self._load_program, data, subp, gen_ctx)
+            )
+            for subp, data in zip(subps, entry)
+        ]
+
+    def _load_program(self, data, subp, gen_ctx):
+        """
+        Deserializes a program of the IR cache, or generates it if it cannot
+        be deserialized (e.g. if a node it refers to cannot be resolved).
+
+        :param str data: The serialized program.
+
+        :param lal.BaseSubpBody subp: The subprogram of the program.
+
+        :param _GenerationContext gen_ctx: The context in which to generate
+            the programs of its unit (see _generation_context).
+
+        :rtype: irt.Program
+        """
+        try:
+            return serialization.loads(data, self._resolver.persistent_load)
+        except (ValueError, LookupError) as e:
+            log('info', 'warning: ignoring cached IR: {}'.format(e))
+            return self._gen_program(subp, gen_ctx)
+
+    def _store_programs(self, key, unit, progs):
+        """
+        Stores the given programs in the IR cache. Their dependencies are
+        the units of the libadalang nodes they refer to, as well as the units
+        that are withed by the unit from which they were extracted.
+
+        :param str key: The key of the programs in the IR cache.
+        :param lal.AnalysisUnit unit: The unit from which they were extracted.
+        :param list[irt.Program] progs: The programs.
+        """
+        filenames = {unit.filename}
+        persistent_id = self._resolver.persistent_id(filenames)
+        try:
+            # Programs are serialized separately such that they can be loaded
+            # separately.
+            data = [serialization.dumps(prog, persistent_id) for prog in progs]
+        except (ValueError, LookupError) as e:
+            log('info', 'warning: could not cache the IR of {}: {}'.format(
+                unit.filename, e
+            ))
+            return
+
+        filenames.update(
+            withed.filename for withed in utils.withed_units(unit)
+        )
+        self.ir_cache.put(key, {
+            filename: self.unit_digest(self._resolver.unit(filename))
+            for filename in filenames
+        }, data)
+
+    def unit_digest(self, unit):
+        """
+        :param lal.AnalysisUnit unit: A unit parsed with this context.
+
+        :return: A digest of the source code of the given unit, which is used
+            to invalidate the entries of the type cache.
+
+        :rtype: str
+        """
+        digest = self._unit_digests.get(unit.filename)
+        if digest is None:
+            text = unit.root.text if unit.root is not None else ''
+            if isinstance(text, unicode):
+                text = text.encode('utf-8')
+            digest = hashlib.sha1(text).hexdigest()
+            self._unit_digests[unit.filename] = digest
+        return digest
+
+    def flush_type_cache(self):
+        """
+        Writes the types that were computed since the last flush to the type
+        cache, if any.
+        """
+        if self.type_cache is not None:
+            self.type_cache.flush()
+
+    def call_graph(self, handles):
+        """
+        Computes the call graph of the programs of the given handles, using
+        the calls that were discovered while traversing their units (see
+        analysis.SubpAnalysisData), such that the programs are not built.
+
+        :param list[irt.ProgramHandle] handles: Handles on programs extracted
+            using this extraction context.
+
+        :return: A mapping from each handle to the handles of the programs
+            that its program calls.
+
+        :rtype: dict[irt.ProgramHandle, list[irt.ProgramHandle]]
+        """
+        handles_by_id = defaultdict(list)
+        for handle in handles:
+            handles_by_id[handle.fun_id].append(handle)
+
+        res = {}
+        for handle in handles:
+            subpuserdata = self.subpdata.get(handle.fun_id)
+            out_calls = (subpuserdata.out_calls
+                         if subpuserdata is not None else ())
+            res[handle] = [
+                callee
+                for fun_id in out_calls
+                for callee in handles_by_id.get(fun_id, ())
+            ]
+        return res
+
     def standard_typer(self):
         """
         :return: A Typer for Ada standard types of programs parsed using
@@ -3274,15 +3274,34 @@ def gen_ir(ctx, subp, typer, subpdata):
     fun_body_stmts.append(func_end_label)
     fun_body_stmts.extend(stores.gen_substs_update())
 
+    indexer = PurposeIndexer()
+    for stmt in fun_body_stmts:
+        stmt.visit(indexer)
+
     return irt.Program(
         fun_body_stmts,
         fun_id=subp,
         orig_node=subp,
         result_var=result_var.value.var if result_var.value else None,
-        param_vars=param_vars
+        param_vars=param_vars,
+        purposes=frozenset(indexer.purposes)
     )
 
 
+class PurposeIndexer(IRImplicitVisitor):
+    """
+    Visitor that collects the types of the purposes attached to the assume
+    statements of the visited IR trees.
+    """
+    def __init__(self):
+        super(PurposeIndexer, self).__init__()
+        self.purposes = set()
+
+    def visit_assume(self, assume):
+        if assume.data.get('purpose') is not None:
+            self.purposes.add(type(assume.data.purpose))
+
+
 class ConvertUniversalTypes(IRImplicitVisitor):
     """
     Visitor that mutates the given IR tree so as to remove references to
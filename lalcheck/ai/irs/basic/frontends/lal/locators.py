@@ -0,0 +1,123 @@
+"""
+Provides persistent locators for libadalang nodes, which are used to
+serialize the Basic IR programs extracted by the libadalang frontend.
+"""
+
+from collections import namedtuple
+
+import libadalang as lal
+
+
+NodeLocator = namedtuple('NodeLocator', (
+    'filename',
+    'sloc_range',
+    'kind'
+))
+"""
+Locates a libadalang node by the file name of its unit, its
+((line, column), (line, column)) source location range and the name of its
+node type.
+"""
+
+
+def _sloc_range(node):
+    rng = node.sloc_range
+    return ((rng.start.line, rng.start.column),
+            (rng.end.line, rng.end.column))
+
+
+def locate(node):
+    """
+    :param lal.AdaNode node: The node to locate.
+    :rtype: NodeLocator
+    """
+    return NodeLocator(node.unit.filename, _sloc_range(node),
+                       type(node).__name__)
+
+
+class NodeResolver(object):
+    """
+    Resolves node locators in a libadalang context. Units are fetched the
+    first time one of their nodes is resolved, and indexed at that time.
+    """
+    def __init__(self, lal_ctx, standard_unit):
+        """
+        :param lal.AnalysisContext lal_ctx: The context in which the units
+            are fetched.
+
+        :param lal.AnalysisUnit standard_unit: The unit of package Standard,
+            which has no source file.
+        """
+        self.lal_ctx = lal_ctx
+        self._units = {standard_unit.filename: standard_unit}
+        self._indexes = {}
+
+    def unit(self, filename):
+        """
+        :param str filename: The file name of the unit.
+        :rtype: lal.AnalysisUnit
+        """
+        unit = self._units.get(filename)
+        if unit is None:
+            unit = self._units[filename] = self.lal_ctx.get_from_file(
+                filename
+            )
+        return unit
+
+    def _index(self, filename):
+        index = self._indexes.get(filename)
+        if index is None:
+            index = self._indexes[filename] = {}
+            root = self.unit(filename).root
+            if root is not None:
+                # findall yields the nodes in prefix order, such that the
+                # outermost node is kept for a given location and kind.
+                for node in root.findall(lambda _: True):
+                    index.setdefault(
+                        (_sloc_range(node), type(node).__name__), node
+                    )
+        return index
+
+    def resolve(self, locator):
+        """
+        :param NodeLocator locator: The locator of the node.
+        :rtype: lal.AdaNode
+        :raise LookupError: if the node does not exist anymore.
+        """
+        node = self._index(locator.filename).get(
+            (locator.sloc_range, locator.kind)
+        )
+        if node is None:
+            raise LookupError("Could not resolve {}".format(locator))
+        return node
+
+    def persistent_id(self, filenames):
+        """
+        :param set[str] filenames: The set in which the file names of the
+            located nodes are accumulated.
+
+        :return: A function that locates libadalang nodes, to be used when
+            serializing programs (see serialization.dumps).
+
+        :rtype: object -> (NodeLocator | None)
+        """
+        def f(obj):
+            if isinstance(obj, lal.AdaNode):
+                locator = locate(obj)
+                if self.resolve(locator) != obj:
+                    # Another node has the same locator.
+                    raise LookupError("Ambiguous locator {}".format(locator))
+                filenames.add(locator.filename)
+                return locator
+            return None
+
+        return f
+
+    def persistent_load(self, locator):
+        """
+        To be used when deserializing programs (see serialization.loads).
+
+        :param NodeLocator locator: The locator of the node.
+        :rtype: lal.AdaNode
+        """
+        return self.resolve(locator)
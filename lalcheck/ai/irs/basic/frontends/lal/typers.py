@@ -27,6 +27,19 @@ _eval_as_real = (
 )
 
 
+def _decl_id(decl):
+    """
+    Identifies the given type declaration in the middle-end types built from
+    it, such that the types of distinct declarations are not shared even if
+    they are structurally equal (see types.Type).
+
+    :param lal.BaseTypeDecl decl: The type declaration.
+    :rtype: (str, int, int)
+    """
+    start = decl.sloc_range.start
+    return decl.unit.filename, start.line, start.column
+
+
 @types.delegating_typer
 def int_range_typer():
     """
@@ -39,13 +52,18 @@ def int_range_typer():
         if hint.is_a(lal.TypeDecl):
             if hint.f_type_def.is_a(lal.SignedIntTypeDef):
                 rng = hint.f_type_def.f_range.f_range
-                return rng.f_left, rng.f_right
+                return hint, (rng.f_left, rng.f_right)
 
     @types.Typer
-    def to_int_range(xs):
-        return types.IntRange(*xs)
+    def to_int_range(x):
+        hint, (frm, to) = x
+        return types.IntRange(frm, to, decl=_decl_id(hint))
 
-    return get_operands >> (_eval_as_int & _eval_as_int) >> to_int_range
+    return (
+        get_operands >>
+        (Transformer.identity() & (_eval_as_int & _eval_as_int)) >>
+        to_int_range
+    )
 
 
 @types.delegating_typer
@@ -67,7 +85,7 @@ def real_range_typer():
         if hint.is_a(lal.TypeDecl):
             if hint.f_type_def.is_a(lal.FloatingPointDef,
                                     lal.DecimalFixedPointDef):
-                return hint.f_type_def
+                return hint, hint.f_type_def
 
     @Transformer.as_transformer
     def get_operands(real_def):
@@ -80,8 +98,9 @@ def real_range_typer():
         return float('-inf'), float('inf')
 
     @types.Typer
-    def to_real_range(xs):
-        return types.RealRange(*xs)
+    def to_real_range(x):
+        hint, (frm, to) = x
+        return types.RealRange(frm, to, decl=_decl_id(hint))
 
     get_specified_range = (
         get_operands >>
@@ -90,7 +109,7 @@ def real_range_typer():
 
     return (
         get_real_type_def >>
-        (get_specified_range | infinite_range) >>
+        (Transformer.identity() & (get_specified_range | infinite_range)) >>
         to_real_range
     )
 
@@ -106,13 +125,18 @@ def int_mod_typer():
     def get_modulus(hint):
         if hint.is_a(lal.TypeDecl):
             if hint.f_type_def.is_a(lal.ModIntTypeDef):
-                return hint.f_type_def.f_expr
+                return hint, hint.f_type_def.f_expr
 
     @types.Typer
-    def to_int_range(modulus):
-        return types.IntRange(0, modulus - 1)
+    def to_int_range(x):
+        hint, modulus = x
+        return types.IntRange(0, modulus - 1, decl=_decl_id(hint))
 
-    return get_modulus >> _eval_as_int >> to_int_range
+    return (
+        get_modulus >>
+        (Transformer.identity() & _eval_as_int) >>
+        to_int_range
+    )
 
 
 @types.typer
@@ -125,9 +149,14 @@ def enum_typer(hint):
     if hint.is_a(lal.TypeDecl):
         if hint.f_type_def.is_a(lal.EnumTypeDef):
             literals = hint.f_type_def.findall(lal.EnumLiteralDecl)
-            return types.Enum([lit.f_name.text for lit in literals])
+            return types.Enum(
+                [lit.f_name.text for lit in literals], decl=_decl_id(hint)
+            )
 
 
+# The values of all the access types are represented in the same domain, such
+# that they can be compared and assigned to each other (e.g. null, or the
+# results of 'Access). Hence, access types are not told apart by declaration.
 _pointer_type = types.Pointer()
 
 
@@ -450,8 +479,53 @@ def model_typer(ctx, inner_typer):
     return find_modeled_type >> inner_typer.lifted() >> to_model_type
 
 
+def type_cache_key(ctx, namespace):
+    """
+    Type declarations are identified in the type cache by their fully
+    qualified name and source location, together with the digest of the unit
+    in which they are defined and the digests of the units providing the type
+    models. Note that the units on which the declaration depends are not
+    part of the key.
+
+    :param ExtractionContext ctx: The extraction context.
+
+    :param str namespace: Distinguishes the entries of typers that may type
+        a same declaration differently.
+
+    :return: A function computing the key of a hint in the type cache, or
+        None if the hint is not a type declaration that can be cached.
+
+    :rtype: lal.AdaNode -> (tuple | None)
+    """
+    def key(hint):
+        if not isinstance(hint, lal.BaseTypeDecl):
+            return None
+
+        try:
+            name = hint.p_fully_qualified_name
+        except (lal.PropertyError, lal.NativeException):
+            return None
+
+        start = hint.sloc_range.start
+        return (
+            namespace,
+            tuple(ctx.unit_digest(unit) for unit in ctx.model_units),
+            name,
+            hint.unit.filename,
+            start.line,
+            start.column,
+            ctx.unit_digest(hint.unit)
+        )
+
+    return key
+
+
 def default_typer(ctx, fallback_typer):
     """
+    If the given extraction context has a type cache, the types of type
+    declarations are looked up in it, unless a fallback typer other than
+    unknown_typer is used.
+
     :return: The default Typer for Ada programs parsed using this
         extraction context.
 
@@ -460,10 +534,22 @@ def default_typer(ctx, fallback_typer):
 
     std_typer = standard_typer(ctx)
 
+    cache_namespace = (
+        'default' if fallback_typer is None else
+        'robust' if fallback_typer is unknown_typer else
+        None
+    )
+
     @types.memoizing_typer
     @types.delegating_typer
     def typer():
-        return model_typer(ctx, typer_without_model) | typer_without_model
+        typr = model_typer(ctx, typer_without_model) | typer_without_model
+        if ctx.type_cache is None or cache_namespace is None:
+            return typr
+
+        return Transformer.make_caching(
+            typr, ctx.type_cache, type_cache_key(ctx, cache_namespace)
+        )
 
     @types.memoizing_typer
     @types.delegating_typer
@@ -238,6 +238,27 @@ def sorted_by_position(nodes):
                                            node.sloc_range.end))
 
 
+def withed_units(unit):
+    """
+    :param lal.AnalysisUnit unit: The unit whose with clauses to consider.
+
+    :return: The units of the packages that are withed by the given unit.
+        Packages that cannot be resolved are ignored.
+
+    :rtype: list[lal.AnalysisUnit]
+    """
+    res = []
+    for clause in unit.root.findall(lambda x: x.is_a(lal.WithClause)):
+        for name in clause.f_packages:
+            try:
+                decl = name.p_referenced_decl
+            except lal.PropertyError:
+                continue
+            if decl is not None:
+                res.append(decl.unit)
+    return res
+
+
 @memoize
 def proc_parameters(proc):
     """
@@ -22,6 +22,26 @@ class Purpose(object):
         return False
 
 
+def may_have_purposes(prog, purpose_types):
+    """
+    Returns False if the given program is known to contain no assume statement
+    with a purpose of one of the given types, using the index of purposes that
+    frontends can attach to programs (see the "purposes" data of programs).
+
+    :param tree.Program prog: The Basic IR program.
+    :param iterable[type] purpose_types: The types of purposes to look for.
+    :rtype: bool
+    """
+    if 'purposes' not in prog.data:
+        return True
+
+    return any(
+        issubclass(actual, purpose_type)
+        for actual in prog.data.purposes
+        for purpose_type in purpose_types
+    )
+
+
 class DerefCheck(Purpose):
     """
     Attached to a node that was created for the purpose of checking a
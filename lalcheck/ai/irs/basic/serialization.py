@@ -0,0 +1,135 @@
+"""
+Provides a serialization format for Basic IR programs, as well as an on-disk
+cache of serialized programs.
+
+Programs are pickled. Their user data may refer to objects that are owned
+by the frontend (e.g. nodes of the source language's syntax tree) and cannot
+be pickled: such objects are replaced by persistent locators given by the
+frontend, which are turned back into objects by the frontend when the
+programs are loaded.
+"""
+
+import cPickle
+from StringIO import StringIO
+from lalcheck.ai.utils import locked_shelf
+
+
+FORMAT_VERSION = 2
+"""
+The version of the serialization format, which must be incremented whenever
+the structure of the IR or of the data attached to it by frontends changes.
+"""
+
+
+def dumps(obj, persistent_id):
+    """
+    Serializes the given object, which typically holds IR programs.
+
+    :param object obj: The object to serialize.
+
+    :param object -> (object | None) persistent_id: Returns the locator of
+        objects that must not be pickled, or None for the other objects.
+
+    :rtype: str
+    :raise ValueError: if the object holds values that cannot be pickled.
+    """
+    buf = StringIO()
+    pickler = cPickle.Pickler(buf, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    try:
+        pickler.dump(obj)
+    except (cPickle.PicklingError, TypeError, RuntimeError) as e:
+        raise ValueError("Could not serialize {}: {}".format(
+            type(obj).__name__, e
+        ))
+    return buf.getvalue()
+
+
+def loads(data, persistent_load):
+    """
+    Deserializes an object serialized with dumps.
+
+    :param str data: The serialized object.
+
+    :param object -> object persistent_load: Returns the object identified
+        by the given locator.
+
+    :rtype: object
+    :raise ValueError: if the data is corrupted.
+    """
+    unpickler = cPickle.Unpickler(StringIO(data))
+    unpickler.persistent_load = persistent_load
+    try:
+        return unpickler.load()
+    except (cPickle.UnpicklingError, AttributeError, ImportError,
+            EOFError) as e:
+        raise ValueError("Could not deserialize: {}".format(e))
+
+
+class ProgramCache(object):
+    """
+    An on-disk cache of serialized programs, shared by all the processes
+    that use the same path.
+
+    Entries are content-addressed: the key of an entry is computed by the
+    frontend from the content of the source file from which the programs were
+    extracted, and each entry holds the digests of the files on which the
+    programs depend, which must be checked before using it.
+    """
+    def __init__(self, path):
+        """
+        :param str path: The path to the cache (it is created if necessary).
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self):
+        return locked_shelf(self.path)
+
+    @staticmethod
+    def _db_key(key):
+        return '{}:{}'.format(FORMAT_VERSION, key)
+
+    def get(self, key, is_valid):
+        """
+        Returns the serialized programs associated to the given key, if any.
+
+        :param str key: The key to lookup.
+
+        :param dict[str, str] -> bool is_valid: Given the digests of the
+            dependencies of the entry, returns whether they are up to date.
+
+        :rtype: list[str] | None
+        """
+        with self._open() as db:
+            entry = db.get(self._db_key(key))
+
+        if entry is not None and is_valid(entry[0]):
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, dependencies, data):
+        """
+        Associates the given serialized programs to the given key.
+
+        :param str key: The key.
+
+        :param dict[str, str] dependencies: The digests of the files on which
+            the programs depend, indexed by file name.
+
+        :param list[str] data: The serialized programs, each of which can be
+            deserialized on its own.
+        """
+        with self._open() as db:
+            db[self._db_key(key)] = (dependencies, data)
+
+    def clear(self):
+        """
+        Removes all the entries of the cache.
+        """
+        with self._open() as db:
+            db.clear()
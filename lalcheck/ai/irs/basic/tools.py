@@ -5,6 +5,7 @@ Provides tools for using the Basic IR.
 from __future__ import absolute_import
 
 from collections import defaultdict
+from operator import itemgetter
 
 from lalcheck.ai.interpretations import Signature
 from lalcheck.ai.irs.basic import visitors
@@ -452,10 +453,40 @@ class Models(visitors.Visitor):
 
         return model
 
+    def lazy(self):
+        """
+        Returns a dictionary in which the model of a program is built when
+        it is first queried, such that models are only built for the programs
+        that are actually used.
+
+        :rtype: dict[tree.Program, dict[tree.Node, Bunch]]
+        """
+        return _LazyModels(self)
+
 
-class ExprEvaluator(visitors.Visitor):
+class _LazyModels(dict):
+    def __init__(self, models):
+        super(_LazyModels, self).__init__()
+        self._models = models
+
+    def __missing__(self, prog):
+        prog_model = self._models.of(prog)[prog]
+        self[prog] = prog_model
+        return prog_model
+
+
+class ExprEvaluator(object):
     """
     Can be used to evaluate expressions in the Basic IR.
+
+    Expressions are compiled once into closures in which the functions of
+    the model and the indices of the variables are already bound, so that
+    evaluating an expression does not involve visiting it nor looking up
+    the model.
+
+    An expression can also be evaluated on many states at once (see
+    eval_batch), in which case it is compiled into closures that operate on
+    lists of values.
     """
     def __init__(self, model):
         """
@@ -463,6 +494,22 @@ class ExprEvaluator(visitors.Visitor):
             for each node that needs be evaluated by this evaluator.
         """
         self.model = model
+        self._compiler = _ExprCompiler(model)
+        self._compiled = {}
+        self._compiled_batch = {}
+
+    def compile(self, expr):
+        """
+        Returns the closure that evaluates the given expression. The closure
+        is built once per expression.
+
+        :param tree.Expr expr: The expression to compile.
+        :rtype: tuple[object] -> object
+        """
+        res = self._compiled.get(expr)
+        if res is None:
+            res = self._compiled[expr] = expr.visit(self._compiler)
+        return res
 
     def eval(self, expr, state):
         """
@@ -475,22 +522,116 @@ class ExprEvaluator(visitors.Visitor):
 
         :rtype: object
         """
-        return expr.visit(self, state)
+        return self.compile(expr)(state)
+
+    def eval_batch(self, expr, states):
+        """
+        Evaluates the given expression on each of the given states in a
+        single pass. The result of a sub-expression is computed once for all
+        the states in which its operands are the same objects, which is
+        typically the case for the components that the states share.
+
+        :param tree.Expr expr: The expression to evaluate.
+
+        :param list[tuple[object]] states: The states, each containing an
+            entry for each Variable traversed during evaluation.
+
+        :return: The value this expression evaluates to in each state.
+
+        :rtype: list[object]
+        """
+        res = self._compiled_batch.get(expr)
+        if res is None:
+            res = self._compiled_batch[expr] = expr.visit(
+                _BatchExprCompiler(self.model)
+            )
+        return res(states)
+
+
+class _ExprCompiler(visitors.Visitor):
+    """
+    Compiles expressions into closures which evaluate them on a state,
+    returning their value (see ExprEvaluator).
+    """
+    def __init__(self, model):
+        """
+        :param dict[tree.Node, Bunch] model: The model of the evaluator.
+        """
+        self.model = model
+
+    def visit_ident(self, ident):
+        return itemgetter(ident.var.data.index)
+
+    def visit_funcall(self, funcall):
+        definition = self.model[funcall].definition
+        args = [arg.visit(self) for arg in funcall.args]
+
+        # Specialize the most common arities to avoid building the list of
+        # arguments.
+        if len(args) == 1:
+            arg, = args
+            return lambda state: definition(arg(state))
+        elif len(args) == 2:
+            lhs, rhs = args
+            return lambda state: definition(lhs(state), rhs(state))
+        else:
+            return lambda state: definition(*[arg(state) for arg in args])
+
+    def visit_lit(self, lit):
+        value = self.model[lit].builder(lit.val)
+        return lambda state: value
+
+
+class _BatchExprCompiler(visitors.Visitor):
+    """
+    Compiles expressions into closures which evaluate them on a list of
+    states, returning the list of their values (see ExprEvaluator).
+    """
+    _missing = object()
+
+    def __init__(self, model):
+        """
+        :param dict[tree.Node, Bunch] model: The model of the evaluator.
+        """
+        self.model = model
+
+    def visit_ident(self, ident):
+        get = itemgetter(ident.var.data.index)
+        return lambda states: map(get, states)
+
+    def visit_funcall(self, funcall):
+        definition = self.model[funcall].definition
+        args = [arg.visit(self) for arg in funcall.args]
+        missing = self._missing
+
+        if len(args) == 0:
+            return lambda states: [definition() for _ in states]
 
-    def visit_ident(self, ident, state):
-        return state[ident.var.data.index]
+        def eval_funcall(states):
+            # The arguments are alive during the whole evaluation, so their
+            # identities can be used to recognize the ones already seen.
+            results = {}
+            res = []
+            for arg_values in zip(*[arg(states) for arg in args]):
+                key = tuple(map(id, arg_values))
+                value = results.get(key, missing)
+                if value is missing:
+                    value = results[key] = definition(*arg_values)
+                res.append(value)
+            return res
 
-    def visit_funcall(self, funcall, state):
-        args = [arg.visit(self, state) for arg in funcall.args]
-        return self.model[funcall].definition(*args)
+        return eval_funcall
 
-    def visit_lit(self, lit, state):
-        return self.model[lit].builder(lit.val)
+    def visit_lit(self, lit):
+        value = self.model[lit].builder(lit.val)
+        return lambda states: [value] * len(states)
 
 
-class ExprSolver(visitors.Visitor):
+class ExprSolver(object):
     """
     Can be used to solve expressions in the Basic IR.
+
+    Like for the ExprEvaluator, predicates are compiled once into closures.
     """
     def __init__(self, model):
         """
@@ -498,7 +639,10 @@ class ExprSolver(visitors.Visitor):
             for each node that needs be solved by this solver.
         """
         self.model = model
-        self.eval = ExprEvaluator(model).eval
+        self.evaluator = ExprEvaluator(model)
+        self.eval = self.evaluator.eval
+        self._compiler = _PredicateCompiler(model, self.evaluator)
+        self._compiled = {}
 
     def solve(self, expr, state):
         """
@@ -517,35 +661,70 @@ class ExprSolver(visitors.Visitor):
         never constructs a solution that does not contain the optimal one,
         thus making it sound for abstract interpretation.
         """
+        solver = self._compiled.get(expr)
+        if solver is None:
+            solver = self._compiled[expr] = expr.visit(self._compiler)
 
         new_state = list(state)
-        res = expr.visit(self, new_state, boolean_ops.true)
+        res = solver(new_state, boolean_ops.true)
         return tuple(new_state), res
 
-    def visit_ident(self, ident, state, expected):
+
+class _PredicateCompiler(visitors.Visitor):
+    """
+    Compiles predicates into closures which refine a mutable state such that
+    the predicate evaluates to the expected value, returning False if it
+    cannot (see ExprSolver).
+    """
+    def __init__(self, model, evaluator):
+        """
+        :param dict[tree.Node, Bunch] model: The model of the solver.
+
+        :param ExprEvaluator evaluator: The evaluator used to compute the
+            values of the arguments of function calls.
+        """
+        self.model = model
+        self.evaluator = evaluator
+
+    def visit_ident(self, ident):
         var_idx = ident.var.data.index
-        dom = self.model[ident].domain
-        state[var_idx] = dom.meet(state[var_idx], expected)
-        return True
-
-    def visit_funcall(self, funcall, state, expected):
-        args_val = [self.eval(arg, state) for arg in funcall.args]
-        inv_res = self.model[funcall].inverse(
-            expected, *args_val
-        )
+        meet = self.model[ident].domain.meet
 
-        if inv_res is None:
-            return False
+        def solve_ident(state, expected):
+            state[var_idx] = meet(state[var_idx], expected)
+            return True
 
-        if len(args_val) == 1:
-            inv_res = (inv_res,)
+        return solve_ident
 
-        return all(
-            arg.visit(self, state, expected_arg)
-            for arg, expected_arg in zip(funcall.args, inv_res)
-        )
+    def visit_funcall(self, funcall):
+        inverse = self.model[funcall].inverse
+        arg_evals = [self.evaluator.compile(arg) for arg in funcall.args]
+        arg_solvers = [arg.visit(self) for arg in funcall.args]
+        is_unary = len(funcall.args) == 1
+
+        def solve_funcall(state, expected):
+            inv_res = inverse(
+                expected, *[arg_eval(state) for arg_eval in arg_evals]
+            )
+
+            if inv_res is None:
+                return False
+
+            if is_unary:
+                inv_res = (inv_res,)
+
+            return all(
+                arg_solver(state, expected_arg)
+                for arg_solver, expected_arg in zip(arg_solvers, inv_res)
+            )
+
+        return solve_funcall
 
-    def visit_lit(self, lit, state, expected):
+    def visit_lit(self, lit):
         lit_dom = self.model[lit].domain
-        lit_val = self.eval(lit, state)
-        return not lit_dom.is_empty(lit_dom.meet(expected, lit_val))
+        lit_val = self.evaluator.compile(lit)(None)
+
+        def solve_lit(state, expected):
+            return not lit_dom.is_empty(lit_dom.meet(expected, lit_val))
+
+        return solve_lit
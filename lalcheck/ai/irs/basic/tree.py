@@ -86,6 +86,50 @@ class Program(Node):
             yield stmt
 
 
+class ProgramHandle(object):
+    """
+    A handle on a program which is only built when it is first accessed,
+    such that frontends can avoid generating programs that are not used.
+    """
+    def __init__(self, fun_id, build):
+        """
+        :param object fun_id: The identifier of the function of the program,
+            i.e. the fun_id data of the program once built.
+
+        :param () -> Program build: A function that builds the program.
+        """
+        self.fun_id = fun_id
+        self._build = build
+        self._program = None
+
+    @staticmethod
+    def of(program):
+        """
+        :param Program program: An already built program.
+        :rtype: ProgramHandle
+        """
+        handle = ProgramHandle(program.data.fun_id, None)
+        handle._program = program
+        return handle
+
+    def is_built(self):
+        """
+        :return: Whether the program has been built already.
+        :rtype: bool
+        """
+        return self._program is not None
+
+    def get(self):
+        """
+        :return: The program, which is built on the first call.
+        :rtype: Program
+        """
+        if self._program is None:
+            self._program = self._build()
+            self._build = None
+        return self._program
+
+
 @_visitable("visit_ident")
 class Identifier(Node):
     """
@@ -0,0 +1,108 @@
+"""
+Provides an on-disk cache of the middle-end types computed by typers, which
+is shared by all the partitions of a run as well as across runs, such that
+types that are used throughout a project (e.g. standard subtypes or common
+record types) are computed once rather than in every partition.
+"""
+
+from lalcheck.ai.utils import locked_shelf
+
+
+class TypeCache(object):
+    """
+    Maps keys provided by a frontend (typically, identifying a type
+    declaration together with the content of the file in which it is defined)
+    to middle-end types.
+
+    The persisted entries are read from the disk the first time they are
+    looked up, and the new entries are kept in memory until they are written
+    back by flush. Types
+    that are read from the cache are hash-consed, such that they are the
+    same objects as the equal types that are constructed during the run.
+    """
+    def __init__(self, path):
+        """
+        :param str path: The path to the cache (it is created if necessary).
+        """
+        self.path = path
+        self._entries = {}
+        self._new_entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self):
+        return locked_shelf(self.path)
+
+    @staticmethod
+    def _db_key(key):
+        return repr(key)
+
+    def _lookup(self, db_key):
+        """
+        Returns the type persisted under the given key, or None if there is
+        none. The result is kept in memory, such that each key is read from
+        the disk at most once.
+
+        :param str db_key: The key, as stored on the disk.
+        :rtype: types.Type | None
+        """
+        try:
+            return self._entries[db_key]
+        except KeyError:
+            with self._open() as db:
+                tpe = db.get(db_key)
+            self._entries[db_key] = tpe
+            return tpe
+
+    def get(self, key):
+        """
+        Returns the type associated to the given key, or None if there is
+        none.
+
+        :param tuple key: The key to lookup.
+        :rtype: types.Type | None
+        """
+        db_key = self._db_key(key)
+        tpe = self._new_entries.get(db_key)
+        if tpe is None:
+            tpe = self._lookup(db_key)
+        if tpe is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return tpe
+
+    def put(self, key, tpe):
+        """
+        Associates the given type to the given key. The entry is persisted
+        on the next flush.
+
+        :param tuple key: The key.
+        :param types.Type tpe: The type, which must be picklable.
+        """
+        self._new_entries[self._db_key(key)] = tpe
+
+    def flush(self):
+        """
+        Writes the new entries to the disk. Entries that were added by other
+        processes in the meantime are kept.
+        """
+        if len(self._new_entries) == 0:
+            return
+
+        with self._open() as db:
+            for db_key, tpe in self._new_entries.iteritems():
+                db[db_key] = tpe
+
+        self._entries.update(self._new_entries)
+        self._new_entries = {}
+
+    def clear(self):
+        """
+        Removes all the entries of the cache, both in memory and on the disk.
+        """
+        with self._open() as db:
+            db.clear()
+
+        self._entries = {}
+        self._new_entries = {}
@@ -5,8 +5,9 @@ Typically, a typer is used to convert type hints provided by the frontend to
 these middle-end types that are supported straightaway by lalcheck, i.e. that
 already have a default interpretation (see interpretations.py).
 """
-from utils import Transformer
+from utils import Transformer, freeze
 from constants import lits
+import weakref
 
 
 Typer = Transformer
@@ -19,10 +20,68 @@ delegating_typer = Transformer.from_transformer_builder
 memoizing_typer = Transformer.make_memoizing
 
 
+class _HashConsed(type):
+    """
+    The metaclass of types, which hash-conses them: constructing a type which
+    is structurally equal to an existing one returns the existing one. Equal
+    types are therefore the same object, such that everything that is
+    memoized on types (e.g. their interpretations) is shared between them.
+
+    Types accept an additional "decl" keyword argument, which identifies the
+    declaration from which they originate (None by default). It is part of
+    the key, such that types built from distinct declarations are kept
+    distinct even if they are structurally equal.
+    """
+    _instances = weakref.WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        decl = kwargs.pop('decl', None)
+        tpe = super(_HashConsed, cls).__call__(*args, **kwargs)
+        tpe.decl = decl
+        return _HashConsed.intern(tpe)
+
+    @staticmethod
+    def intern(tpe):
+        """
+        Returns the shared type that is structurally equal to the given one,
+        which becomes the shared one if there is none yet.
+
+        :param Type tpe: The type to intern.
+        :rtype: Type
+        """
+        try:
+            key = (type(tpe), freeze(vars(tpe)))
+            return _HashConsed._instances.setdefault(key, tpe)
+        except TypeError:
+            # The type holds unhashable values, it cannot be shared.
+            return tpe
+
+
+def _unpickle_type(cls, state):
+    """
+    Rebuilds a type that was pickled, and interns it.
+
+    :param type cls: The class of the type.
+    :param dict state: The attributes of the type.
+    :rtype: Type
+    """
+    tpe = object.__new__(cls)
+    tpe.__dict__.update(state)
+    return _HashConsed.intern(tpe)
+
+
 class Type(object):
     """
-    Base class for types.
+    Base class for types. Types are hash-consed, and must not be modified
+    once constructed. They can be pickled (e.g. to be stored in a
+    type_cache.TypeCache), in which case they are interned when unpickled.
+    Their originating declaration, if any, is available as "decl".
     """
+    __metaclass__ = _HashConsed
+
+    def __reduce__(self):
+        return _unpickle_type, (type(self), vars(self))
+
     def is_a(self, tpe):
         """
         Returns true if this type is an instance of the given Type class.
@@ -1,6 +1,9 @@
 from itertools import chain, combinations
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from funcy.calc import memoize
+from contextlib import contextmanager
+import fcntl
+import shelve
 import time
 
 
@@ -28,6 +31,13 @@ class Bunch(dict):
     def __hash__(self):
         return self._hash
 
+    def __reduce__(self):
+        return _unpickle_bunch, (dict(self),)
+
+
+def _unpickle_bunch(items):
+    return Bunch(**items)
+
 
 class KeyCounter(object):
     """
@@ -109,6 +119,434 @@ def zip_dicts(a, b, all=True):
     }
 
 
+def freeze(value):
+    """
+    Returns a hashable representation of the given value, such that two
+    structurally equal values have equal representations. Lists and tuples
+    are turned into tuples, dicts and persistent maps into frozensets of their
+    items, and sets into frozensets. Other values are returned as is and must
+    be hashable.
+
+    Note that the representation is not meant to be converted back: it is
+    only useful as a key for memo tables.
+
+    :param object value: The value to freeze.
+    :rtype: object
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(x) for x in value)
+    elif isinstance(value, (dict, PersistentMap)):
+        return frozenset((k, freeze(v)) for k, v in value.iteritems())
+    elif isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class LRUCache(object):
+    """
+    A memo table of bounded size. When the maximal amount of entries is
+    reached, the least recently used entry is evicted. Keeps track of the
+    number of successful (hits) and unsuccessful (misses) lookups.
+    """
+    missing = object()
+    """
+    Returned by lookups of keys that are not in the cache.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: The maximal number of entries. Any integer <= 0
+            means that the cache is unbounded.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns the value associated to the given key, or LRUCache.missing if
+        there is none. The entry becomes the most recently used one.
+
+        :param object key: The key to lookup.
+        :rtype: object
+        """
+        value = self._entries.pop(key, self.missing)
+        if value is self.missing:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries[key] = value
+        return value
+
+    def peek(self, key):
+        """
+        Returns the value associated to the given key, or LRUCache.missing if
+        there is none. Unlike get, this neither counts as a lookup nor changes
+        the order of the entries.
+
+        :param object key: The key to lookup.
+        :rtype: object
+        """
+        return self._entries.get(key, self.missing)
+
+    def put(self, key, value):
+        """
+        Associates the given value to the given key, possibly evicting the
+        least recently used entry.
+
+        :param object key: The key.
+        :param object value: The value to associate.
+        :return: The evicted entry, if any.
+        :rtype: (object, object) | None
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if 0 < self.max_size < len(self._entries):
+            return self._entries.popitem(last=False)
+        return None
+
+    def items(self):
+        """
+        Returns the entries of the cache, from the least recently used to the
+        most recently used one.
+
+        :rtype: list[(object, object)]
+        """
+        return self._entries.items()
+
+    def clear(self):
+        self._entries.clear()
+
+    def hit_rate(self):
+        """
+        Returns the ratio of successful lookups over all lookups done so far.
+
+        :rtype: float
+        """
+        total = self.hits + self.misses
+        return float(self.hits) / total if total > 0 else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return "{} entries, {} hits, {} misses ({:.1%} hit rate)".format(
+            len(self), self.hits, self.misses, self.hit_rate()
+        )
+
+
+_TRIE_BITS = 5
+_TRIE_MASK = (1 << _TRIE_BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+class _TrieLeaf(object):
+    """
+    A leaf of the trie of a PersistentMap. Holds the entries whose keys have
+    the given hash, of which there is usually a single one.
+    """
+    __slots__ = ('hash', 'items')
+
+    def __init__(self, hash, items):
+        """
+        :param int hash: The hash of the keys of the entries.
+        :param tuple[(object, object)] items: The entries.
+        """
+        self.hash = hash
+        self.items = items
+
+    def get(self, key, default):
+        for k, v in self.items:
+            if k == key:
+                return v
+        return default
+
+
+def _trie_get(node, h, key, default):
+    shift = 0
+    while node is not None:
+        if type(node) is _TrieLeaf:
+            return node.get(key, default) if node.hash == h else default
+        node = node.get((h >> shift) & _TRIE_MASK)
+        shift += _TRIE_BITS
+    return default
+
+
+def _trie_assoc(node, shift, h, key, value):
+    """
+    Returns the trie obtained by associating the given value to the given key
+    in the given trie, which is left untouched, together with whether a new
+    entry was added. Only the nodes on the path to the entry are copied.
+
+    :param dict | _TrieLeaf | None node: The trie, whose root lies at the
+        given depth (in bits).
+    :param int shift: The depth of the root of the trie.
+    :param int h: The hash of the key.
+    :param object key: The key.
+    :param object value: The value to associate.
+    :rtype: (dict | _TrieLeaf, bool)
+    """
+    if node is None:
+        return _TrieLeaf(h, ((key, value),)), True
+    elif type(node) is _TrieLeaf:
+        if node.hash == h:
+            old = node.get(key, PersistentMap.missing)
+            if old is value:
+                return node, False
+            items = tuple(
+                (k, v) for k, v in node.items if k != key
+            ) + ((key, value),)
+            return _TrieLeaf(h, items), old is PersistentMap.missing
+
+        # Push the leaf one level down, it is then split from the new entry
+        # by the recursive call if their hashes differ at this level.
+        node = {(node.hash >> shift) & _TRIE_MASK: node}
+
+    chunk = (h >> shift) & _TRIE_MASK
+    child = node.get(chunk)
+    new_child, added = _trie_assoc(child, shift + _TRIE_BITS, h, key, value)
+    if new_child is child:
+        return node, added
+    new_node = node.copy()
+    new_node[chunk] = new_child
+    return new_node, added
+
+
+def _trie_dissoc(node, shift, h, key):
+    """
+    Returns the trie obtained by removing the entry of the given key from the
+    given trie, which is left untouched. The same trie is returned if there is
+    no such entry.
+
+    :param dict | _TrieLeaf | None node: The trie, whose root lies at the
+        given depth (in bits).
+    :param int shift: The depth of the root of the trie.
+    :param int h: The hash of the key.
+    :param object key: The key.
+    :rtype: dict | _TrieLeaf | None
+    """
+    if node is None:
+        return None
+    elif type(node) is _TrieLeaf:
+        if node.hash != h:
+            return node
+        items = tuple((k, v) for k, v in node.items if k != key)
+        if len(items) == len(node.items):
+            return node
+        return _TrieLeaf(h, items) if len(items) > 0 else None
+
+    chunk = (h >> shift) & _TRIE_MASK
+    child = node.get(chunk)
+    new_child = _trie_dissoc(child, shift + _TRIE_BITS, h, key)
+    if new_child is child:
+        return node
+
+    new_node = node.copy()
+    if new_child is None:
+        del new_node[chunk]
+    else:
+        new_node[chunk] = new_child
+
+    if len(new_node) == 0:
+        return None
+    elif len(new_node) == 1:
+        # A lone leaf can be pulled up, since it holds the full hash.
+        only = next(new_node.itervalues())
+        if type(only) is _TrieLeaf:
+            return only
+    return new_node
+
+
+def _trie_items(node):
+    if node is None:
+        return
+    elif type(node) is _TrieLeaf:
+        for item in node.items:
+            yield item
+    else:
+        for child in node.itervalues():
+            for item in _trie_items(child):
+                yield item
+
+
+def _trie_diff(a, b, shift):
+    """
+    Yields the entries of the two given tries whose values are not the same
+    objects, skipping the sub-tries which are shared by both.
+
+    :param dict | _TrieLeaf | None a: The first trie.
+    :param dict | _TrieLeaf | None b: The second trie.
+    :param int shift: The depth of the roots of the tries.
+    :rtype: iterable[(object, object, object)]
+    """
+    missing = PersistentMap.missing
+    if a is b:
+        return
+    elif a is None:
+        for k, v in _trie_items(b):
+            yield k, missing, v
+    elif b is None:
+        for k, v in _trie_items(a):
+            yield k, v, missing
+    elif (type(a) is _TrieLeaf and type(b) is _TrieLeaf and
+            a.hash == b.hash):
+        for k, v in a.items:
+            w = b.get(k, missing)
+            if v is not w:
+                yield k, v, w
+        for k, w in b.items:
+            if a.get(k, missing) is missing:
+                yield k, missing, w
+    else:
+        if type(a) is _TrieLeaf:
+            a = {(a.hash >> shift) & _TRIE_MASK: a}
+        if type(b) is _TrieLeaf:
+            b = {(b.hash >> shift) & _TRIE_MASK: b}
+        for chunk in a.viewkeys() | b.viewkeys():
+            for entry in _trie_diff(a.get(chunk), b.get(chunk),
+                                    shift + _TRIE_BITS):
+                yield entry
+
+
+class PersistentMap(object):
+    """
+    A mapping implemented as a hash array mapped trie, whose nodes are never
+    modified once built. Copies are therefore made in constant time and share
+    their whole trie with the original map: updating a copy only copies the
+    nodes on the path to the updated entry, such that other copies are left
+    untouched.
+
+    The entries of two maps which derive from one another can be compared
+    efficiently using diff, which skips the sub-tries that they share.
+    """
+    missing = object()
+    """
+    Stands for the value of a key which is absent from a map.
+    """
+
+    def __init__(self, items=()):
+        """
+        :param dict | PersistentMap | iterable[(object, object)] items: The
+            initial entries of the map.
+        """
+        self._root = None
+        self._size = 0
+        if isinstance(items, PersistentMap):
+            self._root, self._size = items._root, items._size
+        else:
+            for k, v in (items.iteritems() if isinstance(items, dict)
+                         else items):
+                self[k] = v
+
+    @staticmethod
+    def _hash(key):
+        return hash(key) & _HASH_MASK
+
+    def get(self, key, default=None):
+        return _trie_get(self._root, self._hash(key), key, default)
+
+    def set(self, key, value):
+        """
+        Returns a new map in which the given value is associated to the given
+        key.
+
+        :param object key: The key.
+        :param object value: The value to associate.
+        :rtype: PersistentMap
+        """
+        res = self.copy()
+        res[key] = value
+        return res
+
+    def delete(self, key):
+        """
+        Returns a new map which does not contain the given key.
+
+        :param object key: The key to remove.
+        :rtype: PersistentMap
+        """
+        res = self.copy()
+        res._root = _trie_dissoc(self._root, 0, self._hash(key), key)
+        if res._root is not self._root:
+            res._size -= 1
+        return res
+
+    def copy(self):
+        return PersistentMap(self)
+
+    def diff(self, other):
+        """
+        Yields a triplet (key, value in this map, value in the other map) for
+        each key whose values in the two maps are not the same objects.
+        PersistentMap.missing is used for the value of a key absent from one
+        of the maps. Entries shared by both maps cost nothing.
+
+        :param PersistentMap other: The map to compare against.
+        :rtype: iterable[(object, object, object)]
+        """
+        return _trie_diff(self._root, other._root, 0)
+
+    def iteritems(self):
+        return _trie_items(self._root)
+
+    def items(self):
+        return list(self.iteritems())
+
+    def keys(self):
+        return [k for k, _ in self.iteritems()]
+
+    def values(self):
+        return [v for _, v in self.iteritems()]
+
+    def __iter__(self):
+        return (k for k, _ in self.iteritems())
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self.get(key, self.missing) is not self.missing
+
+    def __getitem__(self, key):
+        value = self.get(key, self.missing)
+        if value is self.missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._root, added = _trie_assoc(
+            self._root, 0, self._hash(key), key, value
+        )
+        if added:
+            self._size += 1
+
+    def __delitem__(self, key):
+        root = _trie_dissoc(self._root, 0, self._hash(key), key)
+        if root is self._root:
+            raise KeyError(key)
+        self._root = root
+        self._size -= 1
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            other = PersistentMap(other)
+        elif not isinstance(other, PersistentMap):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            v == w for _, v, w in self.diff(other)
+        )
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "PersistentMap({})".format(dict(self.iteritems()))
+
+
 def concat_dicts(a, b):
     return dict(a, **b)
 
@@ -125,6 +563,28 @@ def map_nonable(fun, xs):
     return [fun(x) for x in xs if x is not None]
 
 
+@contextmanager
+def locked_shelf(path):
+    """
+    Opens the shelf stored at the given path (creating it if necessary) and
+    holds an exclusive lock on it for the duration of the context, such that
+    it can be shared by several processes.
+
+    :param str path: The path to the shelf.
+    :rtype: iterable[shelve.Shelf]
+    """
+    with open(path + '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            db = shelve.open(path, protocol=2)
+            try:
+                yield db
+            finally:
+                db.close()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
 class Transformer(object):
     class TransformationFailure(ValueError):
         def __init__(self, *args):
@@ -335,6 +795,38 @@ class Transformer(object):
         """
         return Transformer(memoize(transformer._transform))
 
+    @staticmethod
+    def make_caching(transformer, cache, key):
+        """
+        Constructs a transformer that looks up transformed objects in the
+        given cache before using the underlying transformer, and stores its
+        successful results in the cache.
+
+        :param Transformer transformer: The underlying transformer.
+
+        :param object cache: The cache, which provides get(key), returning
+            None for missing keys, and put(key, value) (e.g. a
+            type_cache.TypeCache).
+
+        :param object -> (object | None) key: Computes the key of the given
+            object in the cache. Objects whose key is None bypass the cache.
+
+        :rtype: Transformer
+        """
+        def f(hint):
+            k = key(hint)
+            if k is None:
+                return transformer._transform(hint)
+
+            res = cache.get(k)
+            if res is None:
+                res = transformer._transform(hint)
+                if res is not None:
+                    cache.put(k, res)
+            return res
+
+        return Transformer(f)
+
 
 def dataclass(cls):
     def new_eq(self, other):
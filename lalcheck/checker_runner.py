@@ -3,14 +3,15 @@ import importlib
 from multiprocessing import Pool, cpu_count
 from itertools import izip_longest
 from functools import partial
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import signal
 import traceback
 import sys
 
 from lalcheck.checkers.support.checker import (
-    Checker, CheckerResults, ProviderConfig
+    AbstractSemanticsChecker, Checker, CheckerResults, ProviderConfig
 )
+from lalcheck.checkers.support.components import subprograms_matcher
 from lalcheck.tools.digraph import Digraph
 from lalcheck.tools.dot_printer import gen_dot, DataPrinter
 from lalcheck.tools.scheduler import Scheduler
@@ -36,6 +37,20 @@ parser.add_argument('-X', action='append', metavar='VAR=STR', type=str,
 parser.add_argument('--target', default=None, metavar="TARGET", type=str,
                     help="The target to use. Overrides the one given in the "
                          "project file, if any.")
+parser.add_argument('--type-cache', default=None, metavar='FILE_PATH',
+                    type=str,
+                    help="The path to an on-disk cache of the types of Ada "
+                         "declarations, which is shared by all the processes "
+                         "as well as across runs.")
+parser.add_argument('--ir-cache', default=None, metavar='FILE_PATH',
+                    type=str,
+                    help="The path to an on-disk cache of the IR extracted "
+                         "from Ada files, which is shared by all the "
+                         "processes as well as across runs.")
+parser.add_argument('--ir-workers', default=1, type=int,
+                    help="The number of processes to fork in order to "
+                         "generate the IR of the subprograms of a single "
+                         "file in parallel.")
 
 files_group = parser.add_mutually_exclusive_group(required=True)
 files_group.add_argument('--files-from', metavar='FILE_PATH', type=str)
@@ -68,6 +83,10 @@ parser.add_argument('--log-to-file', metavar=("FILE", "CATEGORIES"), nargs=2,
                          'separated by semicolons.')
 
 parser.add_argument('--codepeer-output', action='store_true')
+parser.add_argument('--report-analyses', action='store_true',
+                    help='Prints the distinct configurations of the abstract '
+                         'analysis required by the checkers, together with '
+                         'the projected cost of each of them.')
 parser.add_argument('--export-schedule', type=str)
 parser.add_argument('--partition-size', default=10, type=int,
                     help='The amount of files that will be batched in a'
@@ -251,7 +270,8 @@ def get_working_checkers(args):
 def create_provider_config(args, analysis_files):
     """
     Creates a ProviderConfig object using the switches have been passed
-    as argument, among "-P", "-X", "--target", "--provider-files[-from]".
+    as argument, among "-P", "-X", "--target", "--provider-files[-from]",
+    "--type-cache", "--ir-cache", "--ir-workers".
 
     Note that if the "--provider-files[-from]" switches have not been
     specified, it uses the set of files to analyze as provider files.
@@ -282,10 +302,73 @@ def create_provider_config(args, analysis_files):
         project_file=project_file,
         scenario_vars=tuple(scenario_vars.iteritems()),
         provider_files=tuple(provider_files),
-        target=target
+        target=target,
+        type_cache=args.type_cache,
+        ir_cache=args.ir_cache,
+        ir_workers=args.ir_workers
     )
 
 
+def get_model_configs(checkers):
+    """
+    Returns the model configuration that each of the given checkers must use
+    for its abstract analysis, or None for the checkers that do not query an
+    abstract analysis.
+
+    All the configurations support the purposes of each checker, and the
+    checkers that accept to share the analysis use the most precise
+    configuration. Moreover, the results of the analysis are streamed to
+    the checkers that use a given configuration, unless one of them needs to
+    keep these results (see AbstractSemanticsChecker.analysis_consumer), and
+    only the subprograms used by one of them are analyzed (see
+    AbstractSemanticsChecker.analyzed_subprograms).
+
+    :param list[(Checker, list[str])] checkers: The checkers to run.
+    :rtype: list[ModelConfig | None]
+    """
+    semantic_indices = [
+        i for i, (checker, _) in enumerate(checkers)
+        if issubclass(checker, AbstractSemanticsChecker)
+    ]
+
+    # All the abstract semantics checkers query the same analysis, which
+    # must therefore support the purposes of each of them.
+    purposes = AbstractSemanticsChecker.shared_purposes(
+        checkers[i][0] for i in semantic_indices
+    )
+
+    configs = AbstractSemanticsChecker.shared_model_configs([
+        AbstractSemanticsChecker.requested_analysis(checkers[i][1], purposes)
+        for i in semantic_indices
+    ])
+
+    consumers = OrderedDict((config, []) for config in configs)
+    for i, config in zip(semantic_indices, configs):
+        checker, checker_args = checkers[i]
+        consumer = checker.analysis_consumer(checker_args)
+        users = consumers[config]
+        if consumer is None or users is None:
+            consumers[config] = None
+        elif consumer not in users:
+            users.append(consumer)
+
+    subprograms = defaultdict(list)
+    for i, config in zip(semantic_indices, configs):
+        checker, checker_args = checkers[i]
+        subprograms[config].append(
+            checker.analyzed_subprograms(checker_args)
+        )
+
+    res = [None] * len(checkers)
+    for i, config in zip(semantic_indices, configs):
+        users = consumers[config]
+        res[i] = config._replace(
+            consumers=tuple(users) if users is not None else None,
+            subprograms=subprograms_matcher(subprograms[config])
+        )
+    return res
+
+
 def get_requirements(provider_config, checkers, files_to_check):
     """
     Returns a list of requirements corresponding to the execution of the
@@ -305,11 +388,18 @@ def get_requirements(provider_config, checkers, files_to_check):
     """
     requirements = []
 
-    for checker, checker_args in checkers:
+    model_configs = get_model_configs(checkers)
+
+    for (checker, checker_args), model_config in zip(checkers, model_configs):
+        kwargs = {}
+        if model_config is not None:
+            kwargs['model_config'] = model_config
+
         requirements.append(checker.create_requirement(
             provider_config=provider_config,
             analysis_files=tuple(files_to_check),
-            args=checker_args
+            args=checker_args,
+            **kwargs
         ))
 
     return requirements
@@ -445,6 +535,44 @@ def list_categories(checkers):
         ))
 
 
+def report_analyses(checkers, filenames):
+    """
+    Prints the distinct configurations of the abstract analysis that are
+    required by the given checkers, together with the checkers that use each
+    of them. Each configuration requires its own typing, model generation and
+    abstract analysis of every file, which gives its projected cost.
+
+    :param list[(Checker, list[str])] checkers: The checkers to run together
+        with their specific arguments.
+    :param list[str] filenames: The files to analyze.
+    """
+    users = OrderedDict()
+    for (checker, _), config in zip(checkers, get_model_configs(checkers)):
+        if config is not None:
+            users.setdefault(config, []).append(checker.name())
+
+    line_count = sum(get_line_count(f) for f in filenames)
+
+    print("{} distinct analysis configuration(s), for a projected cost of "
+          "{} file analyses ({} lines):".format(
+              len(users), len(users) * len(filenames), len(users) * line_count
+          ))
+
+    for config, names in users.iteritems():
+        print("- typer: {}, type interpreter: {}, call strategy: {}, merge "
+              "predicate: {}, slicing: {}, interning: {}, inline "
+              "intervals: {}, memoizing: {}".format(
+                  config.typer, config.type_interpreter,
+                  config.call_strategy, config.merge_predicate_builder,
+                  config.slicing, config.interning, config.inline_intervals,
+                  config.memoizing
+              ))
+        print("  used by: {}".format(", ".join(names)))
+        print("  projected cost: {} file analyses ({} lines)".format(
+            len(filenames), line_count
+        ))
+
+
 def print_checkers_help(checkers):
     """
     Prints the usage of the given list of checkers.
@@ -583,6 +711,8 @@ def do_all(args, diagnostic_action):
         list_categories(checkers)
     if args.checkers_help:
         print_checkers_help(checkers)
+    if args.report_analyses:
+        report_analyses(checkers, working_files)
 
     logger.log('info', 'Created {} partitions of {} files.'.format(
         len(partitions), ps
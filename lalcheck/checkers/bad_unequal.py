@@ -12,9 +12,9 @@ from lalcheck.ai.utils import dataclass, map_nonable
 from lalcheck.checkers.support.checker import (
     SyntacticChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AnalysisUnit
+from lalcheck.checkers.support.components import IndexedUnit
 from lalcheck.checkers.support.kinds import TestAlwaysTrue
-from lalcheck.checkers.support.utils import same_as_parent, tokens_info
+from lalcheck.checkers.support.utils import same_as_parent
 
 from lalcheck.tools.scheduler import Task, Requirement
 
@@ -36,7 +36,7 @@ class Results(SyntacticChecker.Results):
         )
 
 
-def find_bad_unequals(unit):
+def find_bad_unequals(index):
     def is_literal(expr):
         if expr.is_a(lal.Identifier):
             try:
@@ -95,7 +95,7 @@ def find_bad_unequals(unit):
         if len(all_ops) > 1:
             for op in all_ops:
                 (op_left, op_right) = op
-                tokens = tokens_info(op_left)
+                tokens = index.tokens_info(op_left)
                 if tokens in ops:
                     return (op_left, ops[tokens], op_right)
                 ops[tokens] = op_right
@@ -110,7 +110,7 @@ def find_bad_unequals(unit):
         return isinstance(op, (lal.OpOr, lal.OpOrElse))
 
     diags = []
-    for binop in unit.root.findall(lal.BinOp):
+    for binop in index.findall(lal.BinOp):
         if interesting_oper(binop.f_op) and not same_as_parent(binop):
             res = has_same_operands(binop)
             if res is not None:
@@ -134,7 +134,7 @@ class BadUnequalFinder(Task):
 
     def requires(self):
         return {
-            'unit_{}'.format(i): AnalysisUnit(self.provider_config, f)
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
             for i, f in enumerate(self.files)
         }
 
@@ -147,9 +147,9 @@ class BadUnequalFinder(Task):
         }
 
     def run(self, **kwargs):
-        units = kwargs.values()
+        indexes = kwargs.values()
         return {
-            'res': map_nonable(find_bad_unequals, units)
+            'res': map_nonable(find_bad_unequals, indexes)
         }
 
 
@@ -6,7 +6,9 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AbstractSemantics
+from lalcheck.checkers.support.components import (
+    AbstractSemantics, consumed_semantics
+)
 from lalcheck.checkers.support.kinds import DeadCode as KindDeadCode
 from lalcheck.tools import dot_printer
 from lalcheck.tools.digraph import Digraph
@@ -135,7 +137,7 @@ def find_dead_code(analysis):
     nodes_with_origin = [
         (
             n,
-            len(analysis.semantics[n]) == 0  # is node dead
+            not analysis.is_reachable(n)
         )
         for n in analysis.cfg.nodes
         if n.data.node is not None
@@ -199,9 +201,9 @@ class DeadCodeFinder(Task):
     def run(self, **sems):
         return {
             'res': [
-                find_dead_code(analysis)
+                res
                 for sem in sems.values()
-                for analysis in sem
+                for res in consumed_semantics(sem, (find_dead_code, ()))
             ]
         }
 
@@ -219,6 +221,10 @@ class DeadCodeChecker(AbstractSemanticsChecker):
     def kinds(cls):
         return [KindDeadCode]
 
+    @classmethod
+    def analysis_consumer(cls, args):
+        return find_dead_code, ()
+
     @classmethod
     def create_requirement(cls, *args, **kwargs):
         return cls.requirement_creator(DeadCode)(*args, **kwargs)
@@ -20,15 +20,14 @@ from lalcheck.ai.utils import dataclass, map_nonable
 from lalcheck.checkers.support.checker import (
     SyntacticChecker, DiagnosticPosition, create_provider
 )
-from lalcheck.checkers.support.components import AnalysisUnit
+from lalcheck.checkers.support.components import IndexedUnit
 from lalcheck.checkers.support.kinds import CodeDuplicated
-from lalcheck.checkers.support.utils import relevant_tokens, tokens_info
 
 from lalcheck.tools.scheduler import Task, Requirement
 
 import argparse
 from functools import partial
-from collections import namedtuple
+from collections import defaultdict, namedtuple
 
 
 class Results(SyntacticChecker.Results):
@@ -58,36 +57,38 @@ CheckerConfig = namedtuple('CheckerConfig', (
 _additional_msg_format = " (did you mean to use {}?)"
 
 
-def find_duplicate_branches(config, unit):
+def find_duplicate_branches(config, index):
     """
     Find duplicate branches in if/case statements/expressions.
 
     :param CheckerConfig config: The configuration of the checker.
-    :param lal.AnalysisUnit unit: The analysis unit on which to perform the
-        check.
+    :param UnitIndex index: The index of the analysis unit on which to
+        perform the check.
     :rtype: Results
     """
-    def same_tokens(left, right):
+    def find_seen(seen_blocks, block):
         """
-        Returns whether left and right contain tokens that are structurally
-        equivalent with regards to kind and contained text.
-
-        :rtype: bool
+        Given a mapping from fingerprints to the information registered for
+        the blocks seen so far that have this fingerprint, returns the
+        information registered for the seen block that has the same tokens
+        as the given block, or None if there is none. Tokens are only compared
+        between blocks that have the same fingerprint.
+
+        :param dict[(int, int), list[tuple]] seen_blocks: The information
+            registered for the blocks seen so far. The seen block is the last
+            element of each information tuple.
+        :param lal.AdaNode block: The block to look for.
+        :rtype: tuple | None
         """
-        return len(left) == len(right) and all(
-            le.kind == ri.kind and le.text == ri.text
-            for le, ri in zip(left, right)
+        return next(
+            (
+                info
+                for info in seen_blocks[index.fingerprint(block)]
+                if index.tokens_info(info[-1]) == index.tokens_info(block)
+            ),
+            None
         )
 
-    def have_same_tokens(left, right):
-        """
-        Returns whether left and right nodes contain tokens that are
-        structurally equivalent with regards to kind and contained text.
-
-        :rtype: bool
-        """
-        return same_tokens(relevant_tokens(left), relevant_tokens(right))
-
     def list_blocks(node):
         """
         List all the sub-blocks of `node` that should be considered for
@@ -97,7 +98,7 @@ def find_duplicate_branches(config, unit):
         """
 
         def num_tokens(node):
-            return len(relevant_tokens(node))
+            return index.token_count(node)
 
         def block_size(node):
             return num_tokens(node)
@@ -151,7 +152,7 @@ def find_duplicate_branches(config, unit):
             # tests in an if-statement.
             if node.f_else_stmts:
                 last_cond, last_block = last_block_before_else(node)
-                if have_same_tokens(node.f_else_stmts, last_block):
+                if index.same_tokens(node.f_else_stmts, last_block):
                     blocks += [(last_cond, node.f_else_stmts)]
 
         elif isinstance(node, lal.IfExpr) and config.do_ifs:
@@ -168,7 +169,7 @@ def find_duplicate_branches(config, unit):
             # tests in an if-expression.
             if node.f_else_expr:
                 last_cond, last_expr = last_block_before_else(node)
-                if have_same_tokens(node.f_else_expr, last_expr):
+                if index.same_tokens(node.f_else_expr, last_expr):
                     blocks += [(last_cond, node.f_else_expr)]
 
         elif isinstance(node, lal.CaseStmt) and config.do_cases:
@@ -199,14 +200,13 @@ def find_duplicate_branches(config, unit):
     def find_duplicates_with_smart_filter(all_blocks):
         duplicates = []
 
-        seen_blocks = {}
+        seen_blocks = defaultdict(list)
         for cond, block in all_blocks:
             # Find interesting elements in the condition that leads to this
             # block.
             cond_interests = interesting_elements_in(cond)
 
-            block_tokens = tokens_info(block)
-            block_info = seen_blocks.get(block_tokens)
+            block_info = find_seen(seen_blocks, block)
 
             if block_info is not None:  # If we have seen this block already
                 # Retrieve the interesting elements in the condition that lead
@@ -257,24 +257,24 @@ def find_duplicate_branches(config, unit):
                     else:
                         duplicates.append((orig_block, block, ""))
             else:
-                seen_blocks[block_tokens] = (
+                seen_blocks[index.fingerprint(block)].append((
                     cond_interests,
                     interesting_elements_in(block),
                     block
-                )
+                ))
 
         return duplicates
 
     def find_duplicates_without_smart_filter(all_blocks):
         duplicates = []
 
-        seen_blocks = {}
+        seen_blocks = defaultdict(list)
         for _, block in all_blocks:
-            tokens = tokens_info(block)
-            if tokens in seen_blocks:
-                duplicates.append((seen_blocks[tokens], block, ""))
+            block_info = find_seen(seen_blocks, block)
+            if block_info is not None:
+                duplicates.append((block_info[-1], block, ""))
             else:
-                seen_blocks[tokens] = block
+                seen_blocks[index.fingerprint(block)].append((block,))
 
         return duplicates
 
@@ -298,8 +298,8 @@ def find_duplicate_branches(config, unit):
         return duplicates if len(duplicates) >= min_duplicates else []
 
     diags = []
-    for b in unit.root.findall((lal.IfStmt, lal.IfExpr, lal.CaseStmt,
-                                lal.CaseExpr)):
+    for b in index.findall((lal.IfStmt, lal.IfExpr, lal.CaseStmt,
+                            lal.CaseExpr)):
         duplicates = has_same_blocks(b)
         for duplicate in duplicates:
             diags.append(duplicate)
@@ -323,7 +323,7 @@ class DuplicateBranchesFinder(Task):
 
     def requires(self):
         return {
-            'unit_{}'.format(i): AnalysisUnit(self.provider_config, f)
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
             for i, f in enumerate(self.files)
         }
 
@@ -337,10 +337,10 @@ class DuplicateBranchesFinder(Task):
         }
 
     def run(self, **kwargs):
-        units = kwargs.values()
+        indexes = kwargs.values()
         checker_func = partial(find_duplicate_branches, self.checker_config)
         return {
-            'res': map_nonable(checker_func, units)
+            'res': map_nonable(checker_func, indexes)
         }
 
 
@@ -0,0 +1,305 @@
+#! /usr/bin/env python
+
+"""
+This script will detect subprogram bodies and large sequences of statements
+which are duplicated, possibly with small differences, across the whole
+project.
+
+The fingerprints of the fragments of code of the analyzed files are stored in
+an on-disk index that is shared by all the partitions of a run as well as
+across runs, such that clones are also found between files which are not
+analyzed together. The fragments of the files which do not exist anymore are
+removed from the index. A pair of clones is reported once, on the fragment
+which was indexed last. No message is issued for fragments nested in a pair of
+clones that was already reported.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import libadalang as lal
+from lalcheck.ai.utils import dataclass
+from lalcheck.checkers.support.checker import (
+    SyntacticChecker, DiagnosticPosition, create_provider
+)
+from lalcheck.checkers.support.clone_index import (
+    CloneIndex, Fragment, winnow
+)
+from lalcheck.checkers.support.components import IndexedUnit
+from lalcheck.checkers.support.kinds import CodeDuplicated
+from lalcheck.checkers.support.utils import closest_enclosing
+
+from lalcheck.tools.scheduler import Task, Requirement
+
+import argparse
+from collections import namedtuple
+
+
+class Results(SyntacticChecker.Results):
+    def __init__(self, diags):
+        super(Results, self).__init__(diags)
+
+    @classmethod
+    def diag_report(cls, diag):
+        node, other = diag
+        return (
+            DiagnosticPosition.from_node(node),
+            'code duplicated with {}{}:{}:{}'.format(
+                '{} at '.format(other.name) if other.name else '',
+                other.filename, other.start[0], other.start[1]
+            ),
+            CodeDuplicated,
+            cls.HIGH
+        )
+
+
+CheckerConfig = namedtuple('CheckerConfig', (
+    'index_path',
+    'size_threshold',
+    'kgram_size',
+    'window_size',
+    'similarity',
+    'max_occurrences'
+))
+
+
+def _fragment_name(node):
+    """
+    Returns the name of the subprogram which is or which encloses the given
+    node, if any.
+
+    :param lal.AdaNode node: The node to consider.
+    :rtype: str | None
+    """
+    subp = (node if node.is_a(lal.BaseSubpBody)
+            else closest_enclosing(node, lal.BaseSubpBody))
+    return subp.p_defining_name.text if subp is not None else None
+
+
+def _contains(outer, inner):
+    """
+    Returns whether the code of the inner fragment lies in the code of the
+    outer one.
+
+    :param Fragment outer: The outer fragment.
+    :param Fragment inner: The inner fragment.
+    :rtype: bool
+    """
+    return (outer.filename == inner.filename and
+            outer.start <= inner.start and inner.end <= outer.end)
+
+
+def find_fragments(config, index):
+    """
+    Finds the fragments of code of the given unit that are large enough to be
+    considered, and computes their fingerprints.
+
+    :param CheckerConfig config: The configuration of the checker.
+    :param UnitIndex index: The index of the analysis unit in which to look
+        for fragments.
+    :return: The fragments of the unit in prefix order, together with the
+        node they correspond to and their fingerprints.
+    :rtype: list[(lal.AdaNode, Fragment, frozenset[int])]
+    """
+    res = []
+    for node in index.findall((lal.BaseSubpBody, lal.StmtList)):
+        if index.token_count(node) < config.size_threshold:
+            continue
+
+        fingerprints = winnow(
+            index.kgram_hashes(node, config.kgram_size),
+            config.window_size
+        )
+        fragment = Fragment(
+            filename=index.unit.filename,
+            start=(node.sloc_range.start.line, node.sloc_range.start.column),
+            end=(node.sloc_range.end.line, node.sloc_range.end.column),
+            name=_fragment_name(node),
+            size=len(fingerprints)
+        )
+        res.append((node, fragment, fingerprints))
+    return res
+
+
+def find_clones(config, clones, fragments, ids):
+    """
+    Finds the clones of the given fragments of a unit that were indexed
+    before them.
+
+    :param CheckerConfig config: The configuration of the checker.
+    :param CloneIndex clones: The index of fragments.
+    :param list[(lal.AdaNode, Fragment, frozenset[int])] fragments: The
+        fragments of the unit, in prefix order.
+    :param list[int] ids: The identifiers of these fragments in the index.
+    :return: A list of pairs holding a node of the unit and the fragment it
+        duplicates.
+    :rtype: list[(lal.AdaNode, Fragment)]
+    """
+    diags = []
+    reported = []
+
+    def is_nested_in_reported(fragment, other):
+        return any(
+            (_contains(a, fragment) and _contains(b, other)) or
+            (_contains(b, fragment) and _contains(a, other))
+            for a, b in reported
+        )
+
+    for (node, fragment, fingerprints), fragment_id in zip(fragments, ids):
+        shared = clones.shared_fingerprints(
+            fingerprints, config.max_occurrences
+        )
+        for other_id, count in sorted(shared.iteritems()):
+            # Only report a pair of clones on the fragment indexed last.
+            if other_id >= fragment_id:
+                continue
+
+            other = clones.fragment(other_id)
+            if count < config.similarity * max(fragment.size, other.size):
+                continue
+
+            # Do not report fragments that overlap, or pairs of fragments
+            # which are part of clones that were already reported.
+            if (_contains(fragment, other) or _contains(other, fragment) or
+                    is_nested_in_reported(fragment, other)):
+                continue
+
+            reported.append((fragment, other))
+            diags.append((node, other))
+
+    return diags
+
+
+def find_duplicate_code(config, indexes):
+    """
+    Indexes the fragments of the given units and finds their clones among
+    all the fragments indexed so far.
+
+    :param CheckerConfig config: The configuration of the checker.
+    :param list[UnitIndex] indexes: The indexes of the analysis units on
+        which to perform the check.
+    :rtype: list[Results]
+    """
+    units_fragments = [find_fragments(config, index) for index in indexes]
+
+    with CloneIndex.open(config.index_path) as clones:
+        clones.remove_missing_files()
+        units_ids = [
+            clones.set_file(index.unit.filename, [
+                (fragment, fingerprints)
+                for _, fragment, fingerprints in fragments
+            ])
+            for index, fragments in zip(indexes, units_fragments)
+        ]
+
+        return [
+            Results(find_clones(config, clones, fragments, ids))
+            for fragments, ids in zip(units_fragments, units_ids)
+        ]
+
+
+@Requirement.as_requirement
+def DuplicateCode(provider_config, files, checker_config):
+    return [DuplicateCodeFinder(
+        provider_config, files, checker_config
+    )]
+
+
+@dataclass
+class DuplicateCodeFinder(Task):
+    def __init__(self, provider_config, files, checker_config):
+        self.provider_config = provider_config
+        self.files = files
+        self.checker_config = checker_config
+
+    def requires(self):
+        return {
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
+            for i, f in enumerate(self.files)
+        }
+
+    def provides(self):
+        return {
+            'res': DuplicateCode(
+                self.provider_config,
+                self.files,
+                self.checker_config
+            )
+        }
+
+    def run(self, **kwargs):
+        indexes = [index for index in kwargs.values() if index is not None]
+        return {
+            'res': find_duplicate_code(self.checker_config, indexes)
+        }
+
+
+class DuplicateCodeChecker(SyntacticChecker):
+    @classmethod
+    def name(cls):
+        return "duplicate_code"
+
+    @classmethod
+    def description(cls):
+        return ("Reports a message of kind '{}' when a subprogram body or a "
+                "large sequence of statements is similar to another one of "
+                "the project.").format(CodeDuplicated.name())
+
+    @classmethod
+    def kinds(cls):
+        return [CodeDuplicated]
+
+    @classmethod
+    def create_requirement(cls, provider_config, analysis_files, args):
+        arg_values = cls.get_arg_parser().parse_args(args)
+
+        return DuplicateCode(
+            create_provider(provider_config),
+            analysis_files,
+            CheckerConfig(
+                index_path=arg_values.index,
+                size_threshold=arg_values.size_threshold,
+                kgram_size=arg_values.kgram_size,
+                window_size=arg_values.window_size,
+                similarity=arg_values.similarity,
+                max_occurrences=arg_values.max_occurrences
+            )
+        )
+
+    @classmethod
+    def get_arg_parser(cls):
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--index', type=str, default='.lalcheck-clones',
+                            help="The path to the index of fingerprints, "
+                                 "which is shared by all the partitions and "
+                                 "reused across runs.")
+
+        parser.add_argument('--size-threshold', type=int, default=100,
+                            help="The minimal size of a fragment of code in "
+                                 "terms of number of tokens.")
+
+        parser.add_argument('--kgram-size', type=int, default=12,
+                            help="The number of consecutive tokens that are "
+                                 "hashed together.")
+
+        parser.add_argument('--window-size', type=int, default=8,
+                            help="The size of the windows of the winnowing "
+                                 "algorithm. Any sequence of at least "
+                                 "'kgram-size' + 'window-size' - 1 tokens "
+                                 "shared by two fragments is detected.")
+
+        parser.add_argument('--similarity', type=float, default=0.8,
+                            help="The minimal ratio of fingerprints shared "
+                                 "by two fragments for them to be reported "
+                                 "as clones.")
+
+        parser.add_argument('--max-occurrences', type=int, default=100,
+                            help="Ignore fingerprints that appear in more "
+                                 "than 'max-occurrences' fragments.")
+        return parser
+
+
+checker = DuplicateCodeChecker
+
+
+if __name__ == "__main__":
+    print("Please run this checker through the run-checkers.py script")
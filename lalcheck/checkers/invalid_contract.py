@@ -8,7 +8,9 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AbstractSemantics
+from lalcheck.checkers.support.components import (
+    AbstractSemantics, consumed_semantics
+)
 from lalcheck.checkers.support.kinds import ContractCheck as KindContractCheck
 from lalcheck.checkers.support.utils import (
     collect_assumes_with_purpose, orig_text_matches, eval_expr_at
@@ -130,7 +132,7 @@ def check_contracts(prog, model, merge_pred_builder):
 
 def find_violated_contracts(analysis):
     # Collect assume statements that have a ContractCheck purpose.
-    contract_checks = collect_assumes_with_purpose(analysis.cfg, ContractCheck)
+    contract_checks = collect_assumes_with_purpose(analysis, ContractCheck)
 
     # Use the semantic analysis to evaluate at those program points the
     # contract expressions. Filter out contracts explicitly set to False by
@@ -189,11 +191,12 @@ class ContractViolationFinder(Task):
         }
 
     def run(self, **sems):
+        consumer = (find_violated_contracts, ())
         return {
             'res': [
-                find_violated_contracts(analysis)
+                res
                 for sem in sems.values()
-                for analysis in sem
+                for res in consumed_semantics(sem, consumer)
             ]
         }
 
@@ -214,6 +217,14 @@ class ContractChecker(AbstractSemanticsChecker):
     def kinds(cls):
         return [KindContractCheck]
 
+    @classmethod
+    def purposes(cls):
+        return (ContractCheck,)
+
+    @classmethod
+    def analysis_consumer(cls, args):
+        return find_violated_contracts, ()
+
     @classmethod
     def create_requirement(cls, *args, **kwargs):
         return cls.requirement_creator(ViolatedContracts)(*args, **kwargs)
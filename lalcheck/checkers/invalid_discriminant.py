@@ -8,7 +8,9 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AbstractSemantics
+from lalcheck.checkers.support.components import (
+    AbstractSemantics, consumed_semantics
+)
 from lalcheck.checkers.support.kinds import DiscriminantCheck
 from lalcheck.checkers.support.utils import (
     collect_assumes_with_purpose, eval_expr_at
@@ -143,7 +145,7 @@ def check_variants(prog, model, merge_pred_builder):
 
 def find_invalid_accesses(analysis):
     # Collect assume statements that have an ExistCheck purpose.
-    exist_checks = collect_assumes_with_purpose(analysis.cfg, ExistCheck)
+    exist_checks = collect_assumes_with_purpose(analysis, ExistCheck)
 
     # Use the semantic analysis to evaluate at those program points the
     # conditions for the accessed field to exist.
@@ -202,9 +204,9 @@ class InvalidAccessFinder(Task):
     def run(self, **sems):
         return {
             'res': [
-                find_invalid_accesses(analysis)
+                res
                 for sem in sems.values()
-                for analysis in sem
+                for res in consumed_semantics(sem, (find_invalid_accesses, ()))
             ]
         }
 
@@ -225,6 +227,14 @@ class VariantChecker(AbstractSemanticsChecker):
     def kinds(cls):
         return [DiscriminantCheck]
 
+    @classmethod
+    def purposes(cls):
+        return (ExistCheck,)
+
+    @classmethod
+    def analysis_consumer(cls, args):
+        return find_invalid_accesses, ()
+
     @classmethod
     def create_requirement(cls, *args, **kwargs):
         return cls.requirement_creator(InvalidAccesses)(*args, **kwargs)
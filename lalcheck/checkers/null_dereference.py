@@ -8,7 +8,9 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AbstractSemantics
+from lalcheck.checkers.support.components import (
+    AbstractSemantics, consumed_semantics
+)
 from lalcheck.checkers.support.kinds import AccessCheck
 from lalcheck.checkers.support.utils import (
     format_text_for_output, collect_assumes_with_purpose, eval_expr_at
@@ -134,7 +136,7 @@ def check_derefs(prog, model, merge_pred_builder):
 
 def find_null_derefs(analysis):
     # Collect assume statements that have a DerefCheck purpose.
-    deref_checks = collect_assumes_with_purpose(analysis.cfg, DerefCheck)
+    deref_checks = collect_assumes_with_purpose(analysis, DerefCheck)
 
     # Use the semantic analysis to evaluate at those program points the
     # corresponding expression being dereferenced.
@@ -193,9 +195,9 @@ class NullDerefFinder(Task):
     def run(self, **sems):
         return {
             'res': [
-                find_null_derefs(analysis)
+                res
                 for sem in sems.values()
-                for analysis in sem
+                for res in consumed_semantics(sem, (find_null_derefs, ()))
             ]
         }
 
@@ -214,6 +216,14 @@ class DerefChecker(AbstractSemanticsChecker):
     def kinds(cls):
         return [AccessCheck]
 
+    @classmethod
+    def purposes(cls):
+        return (DerefCheck,)
+
+    @classmethod
+    def analysis_consumer(cls, args):
+        return find_null_derefs, ()
+
     @classmethod
     def create_requirement(cls, *args, **kwargs):
         return cls.requirement_creator(NullDerefs)(*args, **kwargs)
@@ -4,7 +4,9 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, DiagnosticPosition, create_provider
 )
-from lalcheck.checkers.support.components import AbstractSemantics, ModelConfig
+from lalcheck.checkers.support.components import (
+    AbstractSemantics, consumed_semantics
+)
 from lalcheck.checkers.support.kinds import TestAlwaysTrue, TestAlwaysFalse
 from lalcheck.checkers.support.utils import (
     collect_assumes_with_purpose, orig_text_matches, eval_expr_at,
@@ -67,7 +69,7 @@ def _contains(node, other):
 def find_predetermined_tests(analysis, config):
     # Collect assume statements that have a PredeterminedCheck purpose.
     predetermined_checks = collect_assumes_with_purpose(
-        analysis.cfg,
+        analysis,
         PredeterminedCheck
     )
 
@@ -152,11 +154,12 @@ class PredeterminedTestFinder(Task):
         }
 
     def run(self, **sems):
+        consumer = (find_predetermined_tests, (self.config,))
         return {
             'res': [
-                find_predetermined_tests(analysis, self.config)
+                res
                 for sem in sems.values()
-                for analysis in sem
+                for res in consumed_semantics(sem, consumer)
             ]
         }
 
@@ -178,22 +181,42 @@ class PredeterminedTestChecker(AbstractSemanticsChecker):
         return [TestAlwaysTrue, TestAlwaysFalse]
 
     @classmethod
-    def create_requirement(cls, provider_config, analysis_files, args):
+    def purposes(cls):
+        return (PredeterminedCheck,)
+
+    @staticmethod
+    def checker_config(arg_values):
+        """
+        Creates the configuration of the checker described by the given
+        parsed arguments (see get_arg_parser).
+
+        :param argparse.Namespace arg_values: The parsed arguments.
+        :rtype: CheckerConfig
+        """
+        return CheckerConfig(
+            lits=(
+                (() if arg_values.ignore_always_true else (True,)) +
+                (() if arg_values.ignore_always_false else (False,))
+            )
+        )
+
+    @classmethod
+    def analysis_consumer(cls, args):
         arg_values = cls.get_arg_parser().parse_args(args)
+        return find_predetermined_tests, (cls.checker_config(arg_values),)
+
+    @classmethod
+    def create_requirement(cls, provider_config, analysis_files, args,
+                           model_config=None):
+        arg_values = cls.get_arg_parser().parse_args(args)
+        if model_config is None:
+            model_config = cls.model_config(arg_values, None)
 
         return PredeterminedTests(
             create_provider(provider_config),
-            ModelConfig(arg_values.typer,
-                        arg_values.type_interpreter,
-                        arg_values.call_strategy,
-                        arg_values.merge_predicate),
+            model_config,
             analysis_files,
-            CheckerConfig(
-                lits=(
-                    (() if arg_values.ignore_always_true else (True,)) +
-                    (() if arg_values.ignore_always_false else (False,))
-                )
-            )
+            cls.checker_config(arg_values)
         )
 
     @classmethod
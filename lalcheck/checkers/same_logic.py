@@ -12,10 +12,10 @@ from lalcheck.ai.utils import dataclass, map_nonable
 from lalcheck.checkers.support.checker import (
     SyntacticChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AnalysisUnit
+from lalcheck.checkers.support.components import IndexedUnit
 from lalcheck.checkers.support.kinds import SameOperands
 from lalcheck.checkers.support.utils import (
-    same_as_parent, tokens_info, format_text_for_output
+    same_as_parent, format_text_for_output
 )
 
 from lalcheck.tools.scheduler import Task, Requirement
@@ -39,7 +39,7 @@ class Results(SyntacticChecker.Results):
         )
 
 
-def find_same_logic(unit):
+def find_same_logic(index):
     def list_operands(binop):
         """
         List all the sub-operands of `binop`, as long as they have the same
@@ -85,7 +85,7 @@ def find_same_logic(unit):
         all_ops = list_operands(expr)
         if len(all_ops) > 1:
             for op in all_ops:
-                tokens = tokens_info(op)
+                tokens = index.tokens_info(op)
                 if tokens in ops:
                     return (ops[tokens], op)
                 ops[tokens] = op
@@ -101,7 +101,7 @@ def find_same_logic(unit):
                        lal.OpOrElse, lal.OpXor)
 
     diags = []
-    for binop in unit.root.findall(lal.BinOp):
+    for binop in index.findall(lal.BinOp):
         if interesting_oper(binop.f_op) and not same_as_parent(binop):
             res = has_same_operands(binop)
             if res is not None:
@@ -125,7 +125,7 @@ class SameLogicFinder(Task):
 
     def requires(self):
         return {
-            'unit_{}'.format(i): AnalysisUnit(self.provider_config, f)
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
             for i, f in enumerate(self.files)
         }
 
@@ -138,9 +138,9 @@ class SameLogicFinder(Task):
         }
 
     def run(self, **kwargs):
-        units = kwargs.values()
+        indexes = kwargs.values()
         return {
-            'res': map_nonable(find_same_logic, units)
+            'res': map_nonable(find_same_logic, indexes)
         }
 
 
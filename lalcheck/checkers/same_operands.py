@@ -12,9 +12,8 @@ from lalcheck.ai.utils import dataclass, map_nonable
 from lalcheck.checkers.support.checker import (
     SyntacticChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AnalysisUnit
+from lalcheck.checkers.support.components import IndexedUnit
 from lalcheck.checkers.support.kinds import SameOperands as KindSameOperands
-from lalcheck.checkers.support.utils import relevant_tokens
 
 from lalcheck.tools.scheduler import Task, Requirement
 
@@ -35,7 +34,7 @@ class Results(SyntacticChecker.Results):
         )
 
 
-def find_same_operands(unit):
+def find_same_operands(index):
     def same_tokens(left, right):
         """
         Returns whether left and right contain tokens that are structurally
@@ -55,8 +54,8 @@ def find_same_operands(unit):
         :type binop: lal.BinOp
         :rtype: bool
         """
-        return same_tokens(relevant_tokens(binop.f_left),
-                           relevant_tokens(binop.f_right))
+        return same_tokens(index.relevant_tokens(binop.f_left),
+                           index.relevant_tokens(binop.f_right))
 
     def interesting_oper(op):
         """
@@ -100,7 +99,7 @@ def find_same_operands(unit):
         return False
 
     diags = []
-    for binop in unit.root.findall(lal.BinOp):
+    for binop in index.findall(lal.BinOp):
         if interesting_oper(binop.f_op) and has_same_operands(binop):
             if not is_simple_nan_check(binop):
                 diags.append(binop)
@@ -123,7 +122,7 @@ class SameOperandsFinder(Task):
 
     def requires(self):
         return {
-            'unit_{}'.format(i): AnalysisUnit(self.provider_config, f)
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
             for i, f in enumerate(self.files)
         }
 
@@ -136,9 +135,9 @@ class SameOperandsFinder(Task):
         }
 
     def run(self, **kwargs):
-        units = kwargs.values()
+        indexes = kwargs.values()
         return {
-            'res': map_nonable(find_same_operands, units)
+            'res': map_nonable(find_same_operands, indexes)
         }
 
 
@@ -12,9 +12,8 @@ from lalcheck.ai.utils import dataclass, map_nonable
 from lalcheck.checkers.support.checker import (
     SyntacticChecker, DiagnosticPosition
 )
-from lalcheck.checkers.support.components import AnalysisUnit
+from lalcheck.checkers.support.components import IndexedUnit
 from lalcheck.checkers.support.kinds import TestAlwaysFalse
-from lalcheck.checkers.support.utils import tokens_info
 
 from lalcheck.tools.scheduler import Task, Requirement
 
@@ -34,7 +33,7 @@ class Results(SyntacticChecker.Results):
         )
 
 
-def find_same_tests(unit):
+def find_same_tests(index):
     def list_tests(ifnode):
         """
         List all the tests of `ifnode`.
@@ -57,13 +56,13 @@ def find_same_tests(unit):
         all_tests = list_tests(expr)
         if len(all_tests) > 1:
             for test in all_tests:
-                tokens = tokens_info(test)
+                tokens = index.tokens_info(test)
                 if tokens in tests:
                     return (tests[tokens], test)
                 tests[tokens] = test
 
     diags = []
-    for ifnode in unit.root.findall((lal.IfStmt, lal.IfExpr)):
+    for ifnode in index.findall((lal.IfStmt, lal.IfExpr)):
         res = has_same_tests(ifnode)
         if res is not None:
             diags.append(res)
@@ -86,7 +85,7 @@ class SameTestFinder(Task):
 
     def requires(self):
         return {
-            'unit_{}'.format(i): AnalysisUnit(self.provider_config, f)
+            'unit_{}'.format(i): IndexedUnit(self.provider_config, f)
             for i, f in enumerate(self.files)
         }
 
@@ -99,9 +98,9 @@ class SameTestFinder(Task):
         }
 
     def run(self, **kwargs):
-        units = kwargs.values()
+        indexes = kwargs.values()
         return {
-            'res': map_nonable(find_same_tests, units)
+            'res': map_nonable(find_same_tests, indexes)
         }
 
 
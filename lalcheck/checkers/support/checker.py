@@ -1,6 +1,6 @@
 import argparse
 from components import (
-    ProjectProvider, AutoProvider, ModelConfig
+    ProjectProvider, AutoProvider, ModelConfig, most_precise_model_config
 )
 from utils import closest_enclosing
 import libadalang as lal
@@ -9,7 +9,8 @@ from collections import namedtuple
 
 ProviderConfig = namedtuple(
     'ProviderConfig', [
-        'project_file', 'scenario_vars', 'provider_files', 'target'
+        'project_file', 'scenario_vars', 'provider_files', 'target',
+        'type_cache', 'ir_cache', 'ir_workers'
     ]
 )
 
@@ -24,12 +25,20 @@ def create_provider(provider_config):
     :rtype: AutoProvider | ProjectProvider
     """
     if provider_config.project_file is None:
-        return AutoProvider(provider_config.provider_files)
+        return AutoProvider(
+            provider_config.provider_files,
+            provider_config.type_cache,
+            provider_config.ir_cache,
+            provider_config.ir_workers
+        )
     else:
         return ProjectProvider(
             provider_config.project_file,
             provider_config.scenario_vars,
-            provider_config.target
+            provider_config.target,
+            provider_config.type_cache,
+            provider_config.ir_cache,
+            provider_config.ir_workers
         )
 
 
@@ -171,24 +180,113 @@ class AbstractSemanticsChecker(Checker):
         def diag_report(cls, diag):
             raise NotImplementedError
 
+    @staticmethod
+    def model_config(arg_values, purposes):
+        """
+        Creates the model configuration described by the given parsed
+        arguments (see get_arg_parser).
+
+        :param argparse.Namespace arg_values: The parsed arguments.
+
+        :param tuple[type] | None purposes: The purposes of the assume
+            statements at which the results of the analysis will be queried
+            (see purposes).
+
+        :rtype: ModelConfig
+        """
+        return ModelConfig(arg_values.typer,
+                           arg_values.type_interpreter,
+                           arg_values.call_strategy,
+                           arg_values.merge_predicate,
+                           purposes,
+                           arg_values.slice,
+                           arg_values.intern,
+                           arg_values.inline_intervals,
+                           arg_values.memoize_domains,
+                           None,
+                           None)
+
     @staticmethod
     def requirement_creator(requirement_class):
         parser = AbstractSemanticsChecker.get_arg_parser()
 
-        def create_requirement(provider_config, analysis_files, args):
+        def create_requirement(provider_config, analysis_files, args,
+                               model_config=None):
             arg_values = parser.parse_args(args)
+            if model_config is None:
+                model_config = AbstractSemanticsChecker.model_config(
+                    arg_values, None
+                )
 
             return requirement_class(
                 create_provider(provider_config),
-                ModelConfig(arg_values.typer,
-                            arg_values.type_interpreter,
-                            arg_values.call_strategy,
-                            arg_values.merge_predicate),
+                model_config,
                 analysis_files
             )
 
         return create_requirement
 
+    @staticmethod
+    def requested_analysis(args, purposes):
+        """
+        Returns the model configuration described by the given arguments of
+        a checker, and whether this checker accepts to use the results of a
+        more precise analysis (see --share-analysis).
+
+        :param list[str] args: The arguments of the checker.
+
+        :param tuple[type] | None purposes: The purposes of the assume
+            statements at which the results of the analysis will be queried.
+
+        :rtype: (ModelConfig, bool)
+        """
+        parser = AbstractSemanticsChecker.get_arg_parser()
+        arg_values, _ = parser.parse_known_args(args)
+        return (
+            AbstractSemanticsChecker.model_config(arg_values, purposes),
+            arg_values.share_analysis
+        )
+
+    @staticmethod
+    def shared_model_configs(requests):
+        """
+        Given the analyses requested by a set of checkers, returns the model
+        configuration that each of them must use. Checkers that accept to
+        share the analysis all use the most precise configuration among the
+        requested ones, such that their analysis is done only once, and
+        possibly shared with checkers that requested this configuration.
+
+        :param list[(ModelConfig, bool)] requests: The model configuration
+            requested by each checker, and whether it accepts to share the
+            analysis (see requested_analysis).
+
+        :rtype: list[ModelConfig]
+        """
+        if not any(share for _, share in requests):
+            return [config for config, _ in requests]
+
+        shared = most_precise_model_config([config for config, _ in requests])
+        return [shared if share else config for config, share in requests]
+
+    @staticmethod
+    def shared_purposes(checkers):
+        """
+        Returns the purposes that an analysis shared by all the given checkers
+        must support, that is, the union of the purposes of each checker, or
+        None if any of the checkers needs the results of the analysis at every
+        program point.
+
+        :param iterable[type] checkers: The abstract semantics checkers.
+        :rtype: tuple[type] | None
+        """
+        res = set()
+        for checker in checkers:
+            purposes = checker.purposes()
+            if purposes is None:
+                return None
+            res.update(purposes)
+        return tuple(sorted(res, key=lambda p: p.__name__))
+
     @classmethod
     def name(cls):
         raise NotImplementedError
@@ -201,6 +299,46 @@ class AbstractSemanticsChecker(Checker):
     def kinds(cls):
         raise NotImplementedError
 
+    @classmethod
+    def purposes(cls):
+        """
+        Returns the types of purposes of the assume statements at which this
+        checker queries the results of the analysis, or None if it needs the
+        results of the analysis at every program point.
+
+        :rtype: tuple[type] | None
+        """
+        return None
+
+    @classmethod
+    def analysis_consumer(cls, args):
+        """
+        Returns the function with which this checker consumes the results of
+        the analysis of each program, given the arguments of the checker, as
+        a pair of a function and of the additional arguments to pass to it
+        after the results of the analysis (see
+        components.consumed_semantics). Returns None if the checker needs to
+        keep the results of the analysis, in which case the analysis cannot
+        be streamed to the checkers that share it.
+
+        :param list[str] args: The arguments of the checker.
+        :rtype: (function, tuple) | None
+        """
+        return None
+
+    @classmethod
+    def analyzed_subprograms(cls, args):
+        """
+        Returns a regex matching the names of the subprograms whose analysis
+        is used by this checker, given the arguments of the checker, or None
+        if it uses the analysis of every subprogram. The other subprograms
+        are neither analyzed nor transformed to IR, unless they are called.
+
+        :param list[str] args: The arguments of the checker.
+        :rtype: str | None
+        """
+        return None
+
     @classmethod
     def create_requirement(cls, *args, **kwargs):
         raise NotImplementedError
@@ -216,6 +354,19 @@ class AbstractSemanticsChecker(Checker):
                             help=argparse.SUPPRESS)
         parser.add_argument('--merge-predicate', default='always',
                             help=argparse.SUPPRESS)
+        parser.add_argument('--slice', action='store_true',
+                            help=argparse.SUPPRESS)
+        parser.add_argument('--intern', action='store_true',
+                            help=argparse.SUPPRESS)
+        parser.add_argument('--inline-intervals', action='store_true',
+                            help=argparse.SUPPRESS)
+        parser.add_argument('--memoize-domains', action='store_true',
+                            help=argparse.SUPPRESS)
+        parser.add_argument('--share-analysis', action='store_true',
+                            help="Accept the results of the most precise "
+                                 "analysis required by the checkers that "
+                                 "are run, such that the analysis is done "
+                                 "only once per file.")
         return parser
 
 
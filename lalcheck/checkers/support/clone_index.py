@@ -0,0 +1,217 @@
+"""
+Provides an on-disk inverted index of code fragments, which maps each
+fingerprint to the fragments in which it appears. The index is shared by all
+the partitions of a run as well as across runs, such that clones can be found
+between files that are not analyzed together, in time proportional to the
+size of the code being analyzed rather than to its square.
+"""
+
+import os
+from collections import defaultdict, deque, namedtuple
+from contextlib import contextmanager
+from lalcheck.ai.utils import locked_shelf
+
+
+Fragment = namedtuple('Fragment', (
+    'filename',
+    'start',
+    'end',
+    'name',
+    'size'
+))
+"""
+A fragment of code that is stored in the index, identified by the file in
+which it lies, its (line, column) start and end positions and a name (e.g.
+the name of a subprogram). Its size is the number of its fingerprints.
+"""
+
+
+def winnow(hashes, window_size):
+    """
+    Selects the fingerprints of a fragment from the hashes of its k-grams
+    using the winnowing algorithm: the minimal hash of each window of
+    window_size consecutive hashes is selected. Hence, any sequence of at
+    least window_size + k - 1 tokens that is shared by two fragments is
+    guaranteed to yield at least one common fingerprint.
+
+    The minimum of each window is maintained in a deque holding the indexes
+    of the hashes that can still be the minimum of a window, in increasing
+    order of hashes, which takes O(n) time for n hashes.
+
+    :param list[int] hashes: The hashes of the k-grams of the fragment.
+    :param int window_size: The size of the windows.
+    :rtype: frozenset[int]
+    """
+    if len(hashes) == 0:
+        return frozenset()
+    elif len(hashes) <= window_size:
+        return frozenset([min(hashes)])
+
+    res = set()
+    candidates = deque()
+    for i, h in enumerate(hashes):
+        while len(candidates) > 0 and hashes[candidates[-1]] >= h:
+            candidates.pop()
+        candidates.append(i)
+
+        if candidates[0] <= i - window_size:
+            candidates.popleft()
+        if i >= window_size - 1:
+            res.add(hashes[candidates[0]])
+
+    return frozenset(res)
+
+
+class CloneIndex(object):
+    """
+    The inverted index of fragments. It must be opened with CloneIndex.open,
+    which guarantees that a single process accesses it at a time.
+    """
+    FORMAT_VERSION = 3
+    """
+    The version of the format of the index, which must be incremented
+    whenever the way fingerprints are computed or stored changes. Indexes of
+    another version are cleared when they are opened.
+    """
+
+    def __init__(self, db):
+        """
+        :param shelve.Shelf db: The underlying persistent dictionary.
+        """
+        self._db = db
+
+    @staticmethod
+    @contextmanager
+    def open(path):
+        """
+        Opens the index stored at the given path (creating it if necessary)
+        and locks it for the duration of the context.
+
+        :param str path: The path to the index.
+        :rtype: iterable[CloneIndex]
+        """
+        with locked_shelf(path) as db:
+            if db.get('version') != CloneIndex.FORMAT_VERSION:
+                db.clear()
+                db['version'] = CloneIndex.FORMAT_VERSION
+            yield CloneIndex(db)
+
+    @staticmethod
+    def _posting_key(fingerprint):
+        return 'p:{:x}'.format(fingerprint)
+
+    @staticmethod
+    def _fragment_key(fragment_id):
+        return 'f:{}'.format(fragment_id)
+
+    @staticmethod
+    def _file_key(filename):
+        return 'u:{}'.format(filename)
+
+    def _files(self):
+        # Files are not listed under a single key, which would need to be
+        # rewritten whenever a file is indexed.
+        prefix = self._file_key('')
+        return [
+            key[len(prefix):]
+            for key in self._db.keys()
+            if key.startswith(prefix)
+        ]
+
+    def _update_postings(self, fragments_by_fingerprint, update):
+        for fingerprint, ids in fragments_by_fingerprint.iteritems():
+            key = self._posting_key(fingerprint)
+            postings = update(self._db.get(key, frozenset()), ids)
+            if len(postings) > 0:
+                self._db[key] = postings
+            elif key in self._db:
+                del self._db[key]
+
+    def remove_file(self, filename):
+        """
+        Removes all the fragments of the given file from the index.
+
+        :param str filename: The file whose fragments must be removed.
+        """
+        file_key = self._file_key(filename)
+        entries = self._db.get(file_key, [])
+        to_remove = defaultdict(set)
+        for fragment_id, fingerprints in entries:
+            del self._db[self._fragment_key(fragment_id)]
+            for fingerprint in fingerprints:
+                to_remove[fingerprint].add(fragment_id)
+
+        self._update_postings(to_remove, frozenset.difference)
+        if file_key in self._db:
+            del self._db[file_key]
+
+    def remove_missing_files(self, exists=os.path.isfile):
+        """
+        Removes from the index the fragments of the files which do not exist
+        anymore (e.g. because they were deleted or renamed).
+
+        :param str -> bool exists: Returns whether the given file exists.
+        :return: The files whose fragments were removed.
+        :rtype: list[str]
+        """
+        missing = sorted(f for f in self._files() if not exists(f))
+        for filename in missing:
+            self.remove_file(filename)
+        return missing
+
+    def set_file(self, filename, fragments):
+        """
+        Replaces the fragments of the given file in the index by the given
+        ones. The identifiers of the fragments that are added are greater
+        than the identifiers of all the fragments that are already indexed.
+
+        :param str filename: The file in which the fragments lie.
+        :param list[(Fragment, frozenset[int])] fragments: The fragments to
+            index, together with their fingerprints.
+        :return: The identifiers of the fragments, in order.
+        :rtype: list[int]
+        """
+        self.remove_file(filename)
+
+        next_id = self._db.get('next_id', 0)
+        ids = range(next_id, next_id + len(fragments))
+        to_add = defaultdict(set)
+        for fragment_id, (fragment, fingerprints) in zip(ids, fragments):
+            self._db[self._fragment_key(fragment_id)] = fragment
+            for fingerprint in fingerprints:
+                to_add[fingerprint].add(fragment_id)
+
+        self._update_postings(to_add, frozenset.union)
+        self._db['next_id'] = next_id + len(fragments)
+        self._db[self._file_key(filename)] = [
+            (fragment_id, fingerprints)
+            for fragment_id, (_, fingerprints) in zip(ids, fragments)
+        ]
+        return ids
+
+    def shared_fingerprints(self, fingerprints, max_occurrences):
+        """
+        Counts, for each indexed fragment, the number of the given
+        fingerprints that it contains. Fingerprints that appear in more than
+        max_occurrences fragments are ignored, as they typically correspond
+        to boilerplate code.
+
+        :param frozenset[int] fingerprints: The fingerprints to look up.
+        :param int max_occurrences: The maximal number of occurrences of a
+            fingerprint for it to be considered.
+        :rtype: dict[int, int]
+        """
+        res = defaultdict(int)
+        for fingerprint in fingerprints:
+            postings = self._db.get(self._posting_key(fingerprint), ())
+            if len(postings) <= max_occurrences:
+                for fragment_id in postings:
+                    res[fragment_id] += 1
+        return res
+
+    def fragment(self, fragment_id):
+        """
+        :param int fragment_id: The identifier of an indexed fragment.
+        :rtype: Fragment
+        """
+        return self._db[self._fragment_key(fragment_id)]
@@ -2,28 +2,138 @@ from collections import namedtuple
 
 import lalcheck.ai.interpretations as interps
 import lalcheck.ai.irs.basic.analyses.abstract_semantics as abstract_analysis
+import lalcheck.ai.irs.basic.analyses.slicing as slicing
+import lalcheck.ai.irs.basic.purpose as purpose
 import lalcheck.ai.irs.basic.frontends.lal as lal2basic
 import lalcheck.ai.irs.basic.tools as irtools
+import lalcheck.ai.irs.basic.tree as irt
 from lalcheck.ai.utils import dataclass
+from lalcheck.checkers.support.unit_index import UnitIndex
 
 from lalcheck.tools.scheduler import Task, Requirement
 from lalcheck.tools.logger import log, log_stdout
 
+import re
 import sys
 import traceback
 import time
 
 ProjectProvider = namedtuple(
-    'ProjectProvider', ['project_file', 'scenario_vars', 'target']
+    'ProjectProvider', ['project_file', 'scenario_vars', 'target',
+                        'type_cache', 'ir_cache', 'ir_workers']
 )
 AutoProvider = namedtuple(
-    'AutoProvider', ['files']
+    'AutoProvider', ['files', 'type_cache', 'ir_cache', 'ir_workers']
 )
 ModelConfig = namedtuple(
     'ModelConfig', ['typer', 'type_interpreter', 'call_strategy',
-                    'merge_predicate_builder']
+                    'merge_predicate_builder', 'purposes', 'slicing',
+                    'interning', 'inline_intervals', 'memoizing',
+                    'consumers', 'subprograms']
 )
 
+# The names accepted for each field of a model configuration, from the one
+# that yields the least precise analysis to the one that yields the most
+# precise analysis.
+_precision_orders = {
+    'typer': ['unknown', 'default', 'default_robust'],
+    'type_interpreter': ['default', 'interval_arrays'],
+    'call_strategy': ['unknown', 'bottomup', 'topdown_subsumption',
+                      'topdown'],
+    'merge_predicate_builder': ['always', 'le_t_eq_v']
+}
+
+
+def most_precise_model_config(configs):
+    """
+    Returns the least precise model configuration which is at least as
+    precise as each of the given ones, such that the results of the analysis
+    done with this configuration can be used in place of the results of the
+    analysis done with any of the given ones.
+
+    :param list[ModelConfig] configs: A non-empty list of configurations.
+    :rtype: ModelConfig
+    :raise LookupError: if a configuration uses an unknown name.
+    """
+    def most_precise(field):
+        order = _precision_orders[field]
+
+        def rank(name):
+            if name not in order:
+                raise LookupError('Unknown {} {}'.format(
+                    field.replace('_', ' '), name
+                ))
+            return order.index(name)
+
+        return max((getattr(config, field) for config in configs), key=rank)
+
+    if any(config.purposes is None for config in configs):
+        purposes = None
+    else:
+        purposes = tuple(sorted(
+            frozenset(p for config in configs for p in config.purposes),
+            key=lambda p: p.__name__
+        ))
+
+    return ModelConfig(
+        typer=most_precise('typer'),
+        type_interpreter=most_precise('type_interpreter'),
+        call_strategy=most_precise('call_strategy'),
+        merge_predicate_builder=most_precise('merge_predicate_builder'),
+        purposes=purposes,
+        slicing=all(config.slicing for config in configs),
+        interning=any(config.interning for config in configs),
+        inline_intervals=any(
+            config.inline_intervals for config in configs
+        ),
+        memoizing=any(config.memoizing for config in configs),
+        consumers=None,
+        subprograms=subprograms_matcher(
+            [config.subprograms for config in configs]
+        )
+    )
+
+
+def subprograms_matcher(matchers):
+    """
+    Returns a regex which matches the names of the subprograms matched by
+    any of the given regexes, or None (meaning that all the subprograms are
+    analyzed) if any of them is None.
+
+    :param iterable[str | None] matchers: The regexes.
+    :rtype: str | None
+    """
+    matchers = sorted(frozenset(matchers))
+    if len(matchers) == 0 or None in matchers:
+        return None
+    elif len(matchers) == 1:
+        return matchers[0]
+    return '|'.join('(?:{})'.format(matcher) for matcher in matchers)
+
+
+def consumed_semantics(sem, consumer):
+    """
+    Returns the results of the given consumer on the analysis of each
+    program of a file, given the results of the AbstractSemantics requirement
+    for this file. If the analysis was streamed to the consumers of its model
+    configuration, these results were already computed. Otherwise, the
+    consumer is applied to the results of the analysis of each program.
+
+    :param list[abstract_analysis.AnalysisResults] | dict[tuple, list] sem:
+        The results of the AbstractSemantics requirement.
+
+    :param (function, tuple) consumer: The consumer, as a function which
+        takes the results of the analysis of a program followed by the
+        given additional arguments.
+
+    :rtype: list[object]
+    """
+    if isinstance(sem, dict):
+        return sem[consumer]
+
+    function, args = consumer
+    return [function(analysis, *args) for analysis in sem]
+
 
 @Requirement.as_requirement
 def AnalysisContext(provider_config):
@@ -40,6 +150,11 @@ def AnalysisUnit(provider_config, filename):
     return [LALAnalyser(provider_config, filename)]
 
 
+@Requirement.as_requirement
+def IndexedUnit(provider_config, filename):
+    return [UnitIndexer(provider_config, filename)]
+
+
 @Requirement.as_requirement
 def IRTrees(provider_config, filename):
     return [IRGenerator(provider_config, filename)]
@@ -103,7 +218,12 @@ class ExtractionContextCreator(Task):
         return {'res': ExtractionContext(self.provider_config)}
 
     def run(self, ctx):
-        return {'res': lal2basic.ExtractionContext(ctx)}
+        return {'res': lal2basic.ExtractionContext(
+            ctx,
+            type_cache=self.provider_config.type_cache,
+            ir_cache=self.provider_config.ir_cache,
+            ir_workers=self.provider_config.ir_workers
+        )}
 
 
 @dataclass
@@ -135,6 +255,31 @@ class LALAnalyser(Task):
         return {'res': None}
 
 
+@dataclass
+class UnitIndexer(Task):
+    def __init__(self, provider_config, filename):
+        self.provider_config = provider_config
+        self.filename = filename
+
+    def requires(self):
+        return {'unit': AnalysisUnit(self.provider_config, self.filename)}
+
+    def provides(self):
+        return {'res': IndexedUnit(self.provider_config, self.filename)}
+
+    def run(self, unit):
+        index = None
+        if unit is not None:
+            start_t = time.clock()
+            index = UnitIndex(unit)
+            end_t = time.clock()
+
+            log('timings', "Indexing of {} took {}s.".format(
+                self.filename, end_t - start_t
+            ))
+        return {'res': index}
+
+
 @dataclass
 class IRGenerator(Task):
     def __init__(self, provider_config, filename):
@@ -156,7 +301,7 @@ class IRGenerator(Task):
             log('info', 'Transforming {}'.format(self.filename))
             try:
                 start_t = time.clock()
-                irtree = ctx.extract_programs_from_unit(unit)
+                irtree = ctx.extract_program_handles_from_unit(unit)
                 end_t = time.clock()
 
                 log('timings', "Transformation of {} took {}s.".format(
@@ -209,14 +354,30 @@ class ModelGenerator(Task):
     def get_type_interpreter_for(name):
         if name == 'default':
             return interps.default_type_interpreter
+        elif name == 'interval_arrays':
+            return interps.interval_arrays_type_interpreter
         else:
             raise LookupError('Uknown type interpreter {}'.format(name))
 
     @staticmethod
-    def get_call_strategy_for(name, progs, model_getter, mpb_getter):
+    def get_call_strategy_for(ctx, name, handles, model_getter, mpb_getter):
         if name == 'topdown':
+            # Callees are only generated when they are first called.
             return abstract_analysis.TopDownCallStrategy(
-                progs, model_getter, mpb_getter
+                handles, model_getter, mpb_getter
+            )
+        elif name == 'topdown_subsumption':
+            # Same as above, but summaries computed for greater arguments are
+            # reused, at the cost of precision.
+            return abstract_analysis.TopDownCallStrategy(
+                handles, model_getter, mpb_getter,
+                abstract_analysis.SummaryCache(subsumption=True)
+            )
+        elif name == 'bottomup':
+            # Callees are only generated when the summary of one of their
+            # callers is first needed.
+            return abstract_analysis.BottomUpCallStrategy(
+                handles, ctx.call_graph(handles), model_getter, mpb_getter
             )
         elif name == 'unknown':
             return abstract_analysis.UnknownTargetCallStrategy()
@@ -241,30 +402,32 @@ class ModelGenerator(Task):
         ctx = kwargs['ctx']
         res = None
         try:
-            progs = [
-                prog
+            handles = [
+                handle
                 for key, ir in kwargs.iteritems()
                 if key.startswith('ir')
                 if ir is not None
-                for prog in ir
+                for handle in ir
             ]
+            call_strategy = self.get_call_strategy_for(
+                ctx,
+                self.model_config.call_strategy,
+                handles,
+                lambda p: models[p],
+                lambda: merge_pred_builder
+            )
             modeler = irtools.Models(
                 self.get_typer_for(ctx, self.model_config.typer),
                 self.get_type_interpreter_for(
                     self.model_config.type_interpreter
                 ),
-                self.get_call_strategy_for(
-                    self.model_config.call_strategy,
-                    progs,
-                    lambda p: models[p],
-                    lambda: merge_pred_builder
-                ).as_def_provider()
+                call_strategy.as_def_provider()
             )
-            models = modeler.of(*progs)
+            models = modeler.lazy()
             merge_pred_builder = self.get_merge_pred_builder_for(
                 self.model_config.merge_predicate_builder
             )
-            res = (models, merge_pred_builder)
+            res = (models, merge_pred_builder, call_strategy)
         except Exception as e:
             with log_stdout('info'):
                 print('error: could not create model: {}.'.format(e))
@@ -272,6 +435,38 @@ class ModelGenerator(Task):
         return {'model': res}
 
 
+def _memoize_domains(prog_model, memoized):
+    """
+    Memoizes the operations of the classes of the domains of the variables of
+    the given model (see AbstractDomain.memoize), except for the classes that
+    were already memoized.
+
+    :param dict[irt.Node, Bunch] prog_model: The model of a program.
+    :param set[type] memoized: The classes memoized so far, which is updated.
+    """
+    for node, data in prog_model.iteritems():
+        if isinstance(node, irt.Variable):
+            domain_class = type(data.domain)
+            if domain_class not in memoized:
+                domain_class.memoize()
+                memoized.add(domain_class)
+
+
+def _log_memoized_domains(memoized):
+    """
+    Logs the hit rate of the caches of the given memoized classes, and undoes
+    their memoization.
+
+    :param set[type] memoized: The memoized classes.
+    """
+    for domain_class in sorted(memoized, key=lambda c: c.__name__):
+        for name, cache in sorted(domain_class.memo_caches().iteritems()):
+            log('timings', "Memoized {}.{}: {}".format(
+                domain_class.__name__, name, cache
+            ))
+        domain_class.unmemoize()
+
+
 @dataclass
 class AbstractAnalyser(Task):
     def __init__(self,
@@ -286,6 +481,7 @@ class AbstractAnalyser(Task):
 
     def requires(self):
         return {
+            'ctx': ExtractionContext(self.provider_config),
             'ir': IRTrees(self.provider_config, self.analysis_file),
             'model_and_merge_pred': IRModel(
                 self.provider_config,
@@ -304,23 +500,90 @@ class AbstractAnalyser(Task):
             )
         }
 
-    def run(self, ir, model_and_merge_pred):
-        res = []
+    def run(self, ctx, ir, model_and_merge_pred):
+        # When the consumers of the analysis are known, the results of the
+        # analysis of each program are handed to them as soon as they are
+        # computed, and then released. Only the results of the consumers are
+        # kept, such that the states of a single program are kept in memory
+        # at a time.
+        consumers = self.model_config.consumers
+        res = [] if consumers is None else {c: [] for c in consumers}
+
         if ir is not None and model_and_merge_pred is not None:
             log('info', 'Analyzing file {}'.format(self.analysis_file))
 
-            model, merge_pred_builder = model_and_merge_pred
+            model, merge_pred_builder, call_strategy = model_and_merge_pred
 
             start_t = time.clock()
 
-            for prog in ir:
-                fun = prog.data.fun_id
+            purposes = self.model_config.purposes
+            do_slice = self.model_config.slicing and purposes is not None
+            memoized = set()
+            subprograms = (
+                re.compile(self.model_config.subprograms)
+                if self.model_config.subprograms is not None else None
+            )
+
+            for handle in ir:
+                fun = handle.fun_id
+                fun_name = fun.f_subp_spec.f_subp_name.text
+
+                if (subprograms is not None and
+                        not subprograms.match(fun_name)):
+                    # The program is not generated unless it is called by an
+                    # analyzed subprogram.
+                    continue
+
+                try:
+                    prog = handle.get()
+                except Exception as e:
+                    with log_stdout('info'):
+                        print('error: could not generate IR for subprocedure '
+                              '{}: {}.'.format(fun_name, e))
+                        traceback.print_exc(file=sys.stdout)
+                    continue
+
+                if (purposes is not None and
+                        not purpose.may_have_purposes(prog, purposes)):
+                    # None of the checks queried from this analysis appear in
+                    # this subprogram, so there is nothing to analyze.
+                    log(
+                        'timings',
+                        " - Skipped analysis of subprocedure {}.".format(
+                            fun.f_subp_spec.f_subp_name.text
+                        )
+                    )
+                    continue
+
                 subp_start_t = time.clock()
 
                 try:
-                    res.append(abstract_analysis.compute_semantics(
-                        prog, model[prog], merge_pred_builder
-                    ))
+                    if do_slice:
+                        sliced_prog, tracked_vars = slicing.slice_program(
+                            prog, purposes
+                        )
+                    else:
+                        sliced_prog, tracked_vars = prog, None
+
+                    if self.model_config.memoizing:
+                        _memoize_domains(model[prog], memoized)
+
+                    analysis = abstract_analysis.compute_semantics(
+                        sliced_prog,
+                        model[prog],
+                        merge_pred_builder,
+                        tracked_vars=tracked_vars,
+                        interning=self.model_config.interning,
+                        inline_intervals=self.model_config.inline_intervals
+                    )
+
+                    if consumers is None:
+                        res.append(analysis)
+                    else:
+                        for consumer in consumers:
+                            function, args = consumer
+                            res[consumer].append(function(analysis, *args))
+                        analysis.release()
                 except Exception as e:
                     with log_stdout('info'):
                         print('error: analysis of subprocedure {}({}) failed: '
@@ -342,6 +605,17 @@ class AbstractAnalyser(Task):
             log('timings', "Analysis of {} took {}s.".format(
                 self.analysis_file, end_t - start_t
             ))
+            if isinstance(call_strategy,
+                          abstract_analysis.TopDownCallStrategy):
+                # The call strategy is shared by the analyses of all the
+                # files using the same model, so are the statistics.
+                log('timings', str(call_strategy.summary_cache))
+            _log_memoized_domains(memoized)
             log('progress', 'analyzed {}'.format(self.analysis_file))
 
+        # Types that were computed while analyzing (e.g. to build the models
+        # of the programs) are not yet persisted.
+        if ctx is not None:
+            ctx.flush_type_cache()
+
         return {'res': res}
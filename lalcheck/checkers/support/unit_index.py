@@ -0,0 +1,224 @@
+"""
+Provides an index of the nodes of an analysis unit, which is built with a
+single traversal of the unit and is shared by all the syntactic checkers, so
+that each of them does not need to walk the whole tree again through the
+libadalang bindings. The index also caches the tokens of the nodes that are
+queried by the checkers, and provides constant-time token counts and
+fingerprints for any node of the unit.
+"""
+
+import heapq
+import zlib
+from collections import defaultdict
+
+from lalcheck.checkers.support.utils import relevant_tokens
+
+
+def _token_hash(token):
+    """
+    Returns a hash of the kind and text of the given token. Unlike the
+    builtin hash, it does not depend on the platform nor on the hash seed of
+    the interpreter, such that the fingerprints built from it can be stored
+    and compared across runs and machines.
+
+    :param lal.Token token: The token to hash.
+    :rtype: int
+    """
+    return zlib.crc32(
+        u'{}\0{}'.format(token.kind, token.text).encode('utf-8')
+    ) & 0xffffffff
+
+
+class UnitIndex(object):
+    """
+    Indexes the nodes of an analysis unit by their kind.
+    """
+
+    _HASH_BASE = 1000003
+    _HASH_MODULO = (1 << 61) - 1
+
+    def __init__(self, unit):
+        """
+        :param lal.AnalysisUnit unit: The unit to index. Must have a root.
+        """
+        self.unit = unit
+        self._nodes_by_type = defaultdict(list)
+        self._findall_cache = {}
+        self._tokens_cache = {}
+        self._tokens_info_cache = {}
+        self._token_positions = None
+        self._prefix_hashes = None
+        self._index(unit.root)
+
+    def _index(self, root):
+        """
+        Traverses the tree in prefix order, such that queries return nodes in
+        the same order as lal.AdaNode.findall does.
+
+        :param lal.AdaNode root: The root of the tree to traverse.
+        """
+        position = 0
+        to_visit = [root]
+        while len(to_visit) > 0:
+            node = to_visit.pop()
+            self._nodes_by_type[type(node)].append((position, node))
+            position += 1
+            to_visit.extend(reversed([
+                child for child in node if child is not None
+            ]))
+
+    def findall(self, kinds):
+        """
+        Returns all the nodes of the unit that are of the given kind(s), in
+        prefix order.
+
+        :param type | tuple[type] kinds: The kind(s) of nodes to look for.
+        :rtype: list[lal.AdaNode]
+        """
+        if not isinstance(kinds, tuple):
+            kinds = (kinds,)
+
+        res = self._findall_cache.get(kinds)
+        if res is None:
+            res = self._findall_cache[kinds] = [
+                node
+                for _, node in heapq.merge(*(
+                    nodes
+                    for tpe, nodes in self._nodes_by_type.iteritems()
+                    if issubclass(tpe, kinds)
+                ))
+            ]
+        return res
+
+    def relevant_tokens(self, node):
+        """
+        Cached version of utils.relevant_tokens.
+
+        :param lal.AdaNode node: The node for which to retrieve the tokens.
+        :rtype: list[lal.Token]
+        """
+        res = self._tokens_cache.get(node)
+        if res is None:
+            res = self._tokens_cache[node] = relevant_tokens(node)
+        return res
+
+    def tokens_info(self, node):
+        """
+        Cached version of utils.tokens_info.
+
+        :param lal.AdaNode node: The node for which to retrieve information
+            about its tokens.
+        :rtype: tuple[(str, str)]
+        """
+        res = self._tokens_info_cache.get(node)
+        if res is None:
+            res = self._tokens_info_cache[node] = tuple(
+                (t.kind, t.text) for t in self.relevant_tokens(node)
+            )
+        return res
+
+    def _index_tokens(self):
+        """
+        Traverses the relevant tokens of the unit once, to compute the
+        position of each of them as well as the rolling hashes of all the
+        prefixes of the sequence of relevant tokens.
+        """
+        base, modulo = self._HASH_BASE, self._HASH_MODULO
+        positions = {}
+        prefix_hashes = [0]
+
+        for token in self.unit.iter_tokens():
+            if not token.is_trivia:
+                positions[token] = len(prefix_hashes) - 1
+                prefix_hashes.append(
+                    (prefix_hashes[-1] * base + _token_hash(token)) % modulo
+                )
+
+        self._token_positions = positions
+        self._prefix_hashes = prefix_hashes
+
+    def _token_range(self, node):
+        """
+        Returns the positions of the first relevant token of the given node
+        and of the one that follows its last relevant token.
+
+        :param lal.AdaNode node: The node to consider.
+        :rtype: (int, int)
+        """
+        if self._token_positions is None:
+            self._index_tokens()
+
+        if node.is_ghost:
+            return 0, 0
+
+        return (self._token_positions[node.token_start],
+                self._token_positions[node.token_end] + 1)
+
+    def _range_hash(self, start, end):
+        """
+        Returns the rolling hash of the relevant tokens of the unit that lie
+        between the given positions.
+
+        :param int start: The position of the first token.
+        :param int end: The position that follows the last token.
+        :rtype: int
+        """
+        modulo = self._HASH_MODULO
+        return (self._prefix_hashes[end] -
+                self._prefix_hashes[start] *
+                pow(self._HASH_BASE, end - start, modulo)) % modulo
+
+    def token_count(self, node):
+        """
+        Returns the number of relevant tokens of the given node, i.e. the
+        length of utils.relevant_tokens(node), in constant time.
+
+        :param lal.AdaNode node: The node to consider.
+        :rtype: int
+        """
+        start, end = self._token_range(node)
+        return end - start
+
+    def fingerprint(self, node):
+        """
+        Returns a fingerprint of the relevant tokens of the given node, in
+        constant time. Two nodes which have the same tokens (with regards to
+        kind and text) have the same fingerprint. The converse is true with a
+        very high probability only, see same_tokens.
+
+        :param lal.AdaNode node: The node to consider.
+        :rtype: (int, int)
+        """
+        start, end = self._token_range(node)
+        return end - start, self._range_hash(start, end)
+
+    def kgram_hashes(self, node, k):
+        """
+        Returns the hashes of all the sequences of k consecutive relevant
+        tokens of the given node, in order. Each hash is computed in constant
+        time.
+
+        :param lal.AdaNode node: The node to consider.
+        :param int k: The number of tokens of each sequence.
+        :rtype: list[int]
+        """
+        start, end = self._token_range(node)
+        prefix_hashes, modulo = self._prefix_hashes, self._HASH_MODULO
+        power = pow(self._HASH_BASE, k, modulo)
+        return [
+            (prefix_hashes[i + k] - prefix_hashes[i] * power) % modulo
+            for i in range(start, end - k + 1)
+        ]
+
+    def same_tokens(self, left, right):
+        """
+        Returns whether the given nodes contain tokens that are structurally
+        equivalent with regards to kind and contained text. Tokens are only
+        compared when the fingerprints of the two nodes are equal.
+
+        :param lal.AdaNode left: The first node.
+        :param lal.AdaNode right: The second node.
+        :rtype: bool
+        """
+        return (self.fingerprint(left) == self.fingerprint(right) and
+                self.tokens_info(left) == self.tokens_info(right))
@@ -1,34 +1,24 @@
 import libadalang as lal
-from lalcheck.ai.irs.basic.tree import AssumeStmt
 from lalcheck.ai.domain_capabilities import Capability
 
 
-def collect_assumes_with_purpose(cfg, purpose_type):
+def collect_assumes_with_purpose(analysis, purpose_type):
     """
-    Given the control-flow graph of the program, finds the program points
+    Given the results of the analysis of a program, finds the program points
     which have an assume statement whose purpose is the given type.
 
-    :param Digraph cfg: The control-flow graph of the program.
+    The assume statements are indexed by purpose once per analysis, such that
+    checkers that query the same analysis do not scan the control-flow graph
+    again.
+
+    :param abstract_semantics.AnalysisResults analysis: The results of the
+        abstract semantics analysis.
     :param type purpose_type: The purpose to collect.
     :rtype: (lalcheck.tools.digraph.Digraph.Node,
              lalcheck.ai.irs.basic.tree.Expr,
              purpose_type)
     """
-    # Retrieve nodes in the CFG that correspond to program statements.
-    nodes_with_ast = (
-        (node, node.data.node)
-        for node in cfg.nodes
-        if 'node' in node.data
-    )
-
-    # Collect those that are assume statements and that have a purpose tag
-    # of the desired kind.
-    return [
-        (node, assume.expr, assume.data.purpose)
-        for node, assume in nodes_with_ast
-        if isinstance(assume, AssumeStmt)
-        if purpose_type.is_purpose_of(assume)
-    ]
+    return analysis.assumes_with_purpose(purpose_type)
 
 
 def orig_text_matches(expr, texts):
@@ -67,8 +57,8 @@ def eval_expr_at(analysis, node, expr):
 
     return [
         (frozenset(trace) | {node}, expr_domain.concretize(value))
-        for anc in analysis.cfg.ancestors(node)
-        for trace, value in analysis.eval_at(anc, expr).iteritems()
+        for values in analysis.eval_at_each(analysis.cfg.ancestors(node), expr)
+        for trace, value in values.iteritems()
         if value is not None
     ]
 
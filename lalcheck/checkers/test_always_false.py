@@ -18,11 +18,23 @@ class TestAlwaysFalseChecker(AbstractSemanticsChecker):
         return [TestAlwaysFalse]
 
     @classmethod
-    def create_requirement(cls, provider_config, analysis_files, args):
+    def create_requirement(cls, provider_config, analysis_files, args,
+                           model_config=None):
         return PredeterminedTestChecker.create_requirement(
-            provider_config, analysis_files, ["--ignore-always-true"]
+            provider_config, analysis_files, ["--ignore-always-true"],
+            model_config
         )
 
+    @classmethod
+    def analysis_consumer(cls, args):
+        return PredeterminedTestChecker.analysis_consumer(
+            ["--ignore-always-true"]
+        )
+
+    @classmethod
+    def purposes(cls):
+        return PredeterminedTestChecker.purposes()
+
 
 checker = TestAlwaysFalseChecker
 
@@ -18,11 +18,23 @@ class TestAlwaysTrueChecker(AbstractSemanticsChecker):
         return [TestAlwaysTrue]
 
     @classmethod
-    def create_requirement(cls, provider_config, analysis_files, args):
+    def create_requirement(cls, provider_config, analysis_files, args,
+                           model_config=None):
         return PredeterminedTestChecker.create_requirement(
-            provider_config, analysis_files, ["--ignore-always-false"]
+            provider_config, analysis_files, ["--ignore-always-false"],
+            model_config
         )
 
+    @classmethod
+    def analysis_consumer(cls, args):
+        return PredeterminedTestChecker.analysis_consumer(
+            ["--ignore-always-false"]
+        )
+
+    @classmethod
+    def purposes(cls):
+        return PredeterminedTestChecker.purposes()
+
 
 checker = TestAlwaysTrueChecker
 
@@ -2,9 +2,7 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import (
     AbstractSemanticsChecker, create_provider
 )
-from lalcheck.checkers.support.components import (
-    AbstractSemantics, ModelConfig
-)
+from lalcheck.checkers.support.components import AbstractSemantics
 
 from lalcheck.tools.scheduler import Task, Requirement
 from lalcheck.tools.logger import log
@@ -146,21 +144,27 @@ class AnalysisPrinterChecker(AbstractSemanticsChecker):
         return []
 
     @classmethod
-    def create_requirement(cls, provider_config, analysis_files, args):
+    def create_requirement(cls, provider_config, analysis_files, args,
+                           model_config=None):
         arg_values = cls.get_arg_parser().parse_args(args)
+        if model_config is None:
+            model_config = cls.model_config(arg_values, None)._replace(
+                subprograms=arg_values.subp_matcher
+            )
 
         return PrintAnalysis(
             create_provider(provider_config),
-            ModelConfig(arg_values.typer,
-                        arg_values.type_interpreter,
-                        arg_values.call_strategy,
-                        arg_values.merge_predicate),
+            model_config,
             analysis_files,
             arg_values.file_matcher,
             arg_values.subp_matcher,
             arg_values.file_format
         )
 
+    @classmethod
+    def analyzed_subprograms(cls, args):
+        return cls.get_arg_parser().parse_args(args).subp_matcher
+
     @classmethod
     def get_arg_parser(cls):
         parser = AbstractSemanticsChecker.get_arg_parser()
@@ -3,8 +3,12 @@ from lalcheck.ai.utils import dataclass
 from lalcheck.checkers.support.checker import Checker, create_provider
 from lalcheck.checkers.support.components import IRTrees
 
+from lalcheck.tools.logger import log_stdout
 from lalcheck.tools.scheduler import Task, Requirement
 
+import sys
+import traceback
+
 
 @Requirement.as_requirement
 def PrintIR(provider_config, files):
@@ -35,8 +39,17 @@ class IRPrinter(Task):
         for i, f in enumerate(self.files):
             ir_f = irs[str(i)]
             print("--- IR FOR FILE {} ---\n\n".format(f))
-            for j, fun_ir in enumerate(ir_f):
-                fun_name = fun_ir.data.fun_id.f_subp_spec.f_subp_name.text
+            for j, handle in enumerate(ir_f):
+                fun_name = handle.fun_id.f_subp_spec.f_subp_name.text
+                try:
+                    fun_ir = handle.get()
+                except Exception as e:
+                    with log_stdout('info'):
+                        print('error: could not generate IR for subprocedure '
+                              '{}: {}.'.format(fun_name, e))
+                        traceback.print_exc(file=sys.stdout)
+                    continue
+
                 print("    {}. {}:\n".format(j, fun_name))
                 print(PrettyPrinter.pretty_print(fun_ir))
                 print("\n")
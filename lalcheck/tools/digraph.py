@@ -87,3 +87,65 @@ class Digraph(object):
 
     def __repr__(self):
         return "({}, {})".format(self.nodes, self.edges)
+
+
+def strongly_connected_components(nodes, successors):
+    """
+    Computes the strongly connected components of the graph formed by the
+    given nodes, using Tarjan's algorithm.
+
+    The components are returned in reverse topological order: a component
+    always comes after all the components that are reachable from it.
+
+    :param list[object] nodes: The nodes of the graph. Their order determines
+        the order of the components that are not related to each other.
+
+    :param object->iterable[object] successors: A function which returns the
+        direct successors of a given node.
+
+    :rtype: list[list[object]]
+    """
+    index = {}
+    low_link = {}
+    stack = []
+    on_stack = set()
+    sccs = []
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        # Iterative version of the algorithm, to support deep graphs.
+        work = [(root, iter(successors(root)))]
+        index[root] = low_link[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+
+        while len(work) > 0:
+            node, succs = work[-1]
+            for succ in succs:
+                if succ not in index:
+                    index[succ] = low_link[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(successors(succ))))
+                    break
+                elif succ in on_stack:
+                    low_link[node] = min(low_link[node], index[succ])
+            else:
+                work.pop()
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+
+                if low_link[node] == index[node]:
+                    scc = []
+                    while True:
+                        x = stack.pop()
+                        on_stack.remove(x)
+                        scc.append(x)
+                        if x is node:
+                            break
+                    sccs.append(scc)
+
+    return sccs
@@ -0,0 +1,85 @@
+"""
+Provides a way to distribute work over forked processes.
+
+Unlike multiprocessing pools, this can be used from within the worker
+processes of a pool (which are not allowed to have children), and the
+forked processes inherit the whole state of their parent, such that only
+the results of the work need to be transferred back.
+"""
+
+import os
+import sys
+import traceback
+
+
+def fork_map(fun, chunks):
+    """
+    Calls the given function on each of the given chunks of work, each time
+    in a new forked process, all of which run in parallel.
+
+    :param T -> str fun: The function to call, which returns the result of
+        the work on a chunk serialized as a string.
+
+    :param list[T] chunks: The chunks of work.
+
+    :return: The result of the work on each chunk, in order, or None for the
+        chunks on which the function raised an exception, whose traceback is
+        printed on the standard error by the child process, as well as for
+        the chunks for which no process could be forked.
+
+    :rtype: list[str | None]
+
+    Note that the results are read from the children one after the other, in
+    order. Hence, a child whose result does not fit in the buffer of its pipe
+    blocks until the results of the children that precede it are read, that
+    is, until these children finish.
+    """
+    # Make sure that pending output is not duplicated by the children.
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    children = []
+    for chunk in chunks:
+        read_fd = write_fd = None
+        try:
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+        except OSError:
+            # E.g. the limit of processes or open files is reached.
+            traceback.print_exc()
+            for fd in (read_fd, write_fd):
+                if fd is not None:
+                    os.close(fd)
+            children.append(None)
+            continue
+
+        if pid == 0:
+            status = 1
+            try:
+                os.close(read_fd)
+                with os.fdopen(write_fd, 'wb') as out:
+                    out.write(fun(chunk))
+                status = 0
+            except Exception:
+                traceback.print_exc()
+            finally:
+                # Never return in the child process.
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    results = []
+    for child in children:
+        if child is None:
+            results.append(None)
+            continue
+
+        pid, read_fd = child
+        with os.fdopen(read_fd, 'rb') as inp:
+            data = inp.read()
+        _, status = os.waitpid(pid, 0)
+        results.append(data if status == 0 else None)
+    return results
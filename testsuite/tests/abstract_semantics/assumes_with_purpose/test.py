@@ -0,0 +1,98 @@
+from lalcheck.ai import types, interpretations as interps
+from lalcheck.ai.constants import ops
+from lalcheck.ai.irs.basic import tree as irt
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.irs.basic.analyses import abstract_semantics
+from lalcheck.ai.irs.basic.purpose import (
+    ContractCheck, DerefCheck, PredeterminedCheck, Purpose
+)
+from lalcheck.ai.utils import Transformer
+from lalcheck.checkers.support.utils import collect_assumes_with_purpose
+
+
+int_type = types.IntRange(-100, 100)
+bool_type = types.Boolean()
+
+
+class NullDerefCheck(DerefCheck):
+    pass
+
+
+def build_program():
+    x = irt.Variable('x', index=0, type_hint=int_type)
+    y = irt.Variable('y', index=1, type_hint=int_type)
+
+    def ident(var):
+        return irt.Identifier(var, type_hint=int_type)
+
+    def lit(value):
+        return irt.Lit(value, type_hint=int_type)
+
+    def check(op, args, **data):
+        return irt.AssumeStmt(
+            irt.FunCall(op, args, type_hint=bool_type), **data
+        )
+
+    return irt.Program([
+        irt.AssignStmt(ident(x), lit(0)),
+        irt.ReadStmt(ident(y)),
+        check(ops.LT, [ident(x), ident(y)], purpose=DerefCheck(None)),
+        irt.SplitStmt([
+            [check(ops.GE, [ident(y), lit(10)],
+                   purpose=ContractCheck('pre', None))],
+            [check(ops.LT, [ident(y), lit(10)])]
+        ]),
+        check(ops.GE, [ident(x), lit(0)], purpose=NullDerefCheck(None))
+    ], fun_id='f')
+
+
+class AssumesWithPurposeTest(object):
+    """
+    Checks that the assume statements of an analysis are found by purpose,
+    including the purposes that are subclasses of the given one, in the
+    order of the control-flow graph.
+    """
+    def run(self):
+        prog = build_program()
+        typer = Transformer.as_transformer(lambda hint: hint)
+        model = irtools.Models(
+            typer, interps.default_type_interpreter
+        ).of(prog)
+        analysis = abstract_semantics.compute_semantics(
+            prog, model[prog], abstract_semantics.MergePredicateBuilder.Always
+        )
+
+        def expected(purpose_type):
+            return [
+                (node, node.data.node.expr, node.data.node.data.purpose)
+                for node in analysis.cfg.nodes
+                if isinstance(node.data.get('node'), irt.AssumeStmt)
+                if purpose_type.is_purpose_of(node.data.node)
+            ]
+
+        derefs = collect_assumes_with_purpose(analysis, DerefCheck)
+        assert derefs == expected(DerefCheck)
+        assert [type(purpose) for _, _, purpose in derefs] == [
+            DerefCheck, NullDerefCheck
+        ]
+        assert [expr for _, expr, _ in derefs] == [
+            prog.stmts[2].expr, prog.stmts[4].expr
+        ]
+
+        for purpose_type in [NullDerefCheck, ContractCheck, Purpose]:
+            assert (collect_assumes_with_purpose(analysis, purpose_type) ==
+                    expected(purpose_type))
+        assert len(collect_assumes_with_purpose(analysis, Purpose)) == 3
+        assert collect_assumes_with_purpose(
+            analysis, PredeterminedCheck
+        ) == []
+
+        # The results of the analysis are available at the found points.
+        (node, expr, _), = collect_assumes_with_purpose(
+            analysis, ContractCheck
+        )
+        assert analysis.is_reachable(node)
+        assert analysis.eval_at(node, expr).values() == [frozenset([True])]
+
+
+AssumesWithPurposeTest().run()
@@ -0,0 +1,159 @@
+from lalcheck.ai import types, interpretations as interps
+from lalcheck.ai.constants import ops
+from lalcheck.ai.irs.basic import tree as irt, visitors
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.utils import Transformer
+from itertools import product
+
+
+int_type = types.IntRange(-20, 20)
+bool_type = types.Boolean()
+
+x = irt.Variable('x', index=0, type_hint=int_type)
+y = irt.Variable('y', index=1, type_hint=int_type)
+
+
+def ident(var):
+    return irt.Identifier(var, type_hint=int_type)
+
+
+def lit(value):
+    return irt.Lit(value, type_hint=int_type)
+
+
+def call(op, args, tpe=int_type):
+    return irt.FunCall(op, args, type_hint=tpe)
+
+
+exprs = [
+    ident(x),
+    lit(3),
+    call(ops.NEG, [ident(y)]),
+    call(ops.PLUS, [ident(x), call(ops.MINUS, [ident(y), lit(2)])]),
+    call(ops.LT, [call(ops.PLUS, [ident(x), ident(y)]), lit(0)], bool_type)
+]
+
+preds = [
+    call(ops.LT, [ident(x), lit(0)], bool_type),
+    call(ops.GE, [ident(x), ident(y)], bool_type),
+    call(ops.NOT, [call(ops.EQ, [ident(y), lit(1)], bool_type)], bool_type),
+    call(ops.AND, [
+        call(ops.GT, [ident(x), lit(-5)], bool_type),
+        call(ops.LE, [ident(y), lit(5)], bool_type)
+    ], bool_type)
+]
+
+# One expression for each arithmetic and comparison operation.
+op_exprs = [call(ops.NEG, [ident(x)])] + [
+    call(op, [ident(x), ident(y)])
+    for op in [ops.PLUS, ops.MINUS]
+] + [
+    call(op, [ident(x), ident(y)], bool_type)
+    for op in [ops.EQ, ops.NEQ, ops.LT, ops.LE, ops.GT, ops.GE]
+]
+
+prog = irt.Program([
+    irt.AssumeStmt(e) for e in exprs + preds + op_exprs
+])
+model = irtools.Models(
+    Transformer.as_transformer(lambda hint: hint),
+    interps.default_type_interpreter
+).of(prog)[prog]
+
+int_dom = model[x].domain
+states = list(product(
+    [int_dom.bottom, (-3, 4), (0, 0), (5, 12), (-20, 20)],
+    [(1, 1), (-8, -2), (0, 7)]
+))
+
+
+def reference_eval(expr, state):
+    """
+    Evaluates the given expression by visiting it.
+    """
+    if isinstance(expr, irt.Identifier):
+        return state[expr.var.data.index]
+    elif isinstance(expr, irt.Lit):
+        return model[expr].builder(expr.val)
+    return model[expr].definition(*[
+        reference_eval(arg, state) for arg in expr.args
+    ])
+
+
+class EvaluatorTest(object):
+    """
+    Checks that compiled expressions evaluate to the same values as visited
+    expressions, on one state or on many states at once.
+    """
+    def run(self):
+        evaluator = irtools.ExprEvaluator(model)
+        assert not isinstance(evaluator, visitors.Visitor)
+
+        for expr in exprs:
+            expected = [reference_eval(expr, state) for state in states]
+            assert [evaluator.eval(expr, state) for state in states] == (
+                expected
+            )
+            assert evaluator.eval_batch(expr, states) == expected
+            assert evaluator.eval_batch(expr, []) == []
+            assert evaluator.compile(expr) is evaluator.compile(expr)
+
+
+class BatchOperationsTest(object):
+    """
+    Checks that operations evaluated on many states at once yield the same
+    values as when evaluated on each state separately.
+    """
+    def run(self):
+        evaluator = irtools.ExprEvaluator(model)
+
+        for expr in op_exprs:
+            assert evaluator.eval_batch(expr, states) == [
+                evaluator.eval(expr, state) for state in states
+            ]
+
+
+class SolverTest(object):
+    """
+    Checks that solving a predicate refines the state such that the
+    predicate can only evaluate to true, without losing solutions.
+    """
+    def run(self):
+        solver = irtools.ExprSolver(model)
+        assert not isinstance(solver, visitors.Visitor)
+        true = frozenset([True])
+
+        assert solver.solve(preds[0], ((-3, 4), (1, 1))) == (
+            ((-3, -1), (1, 1)), True
+        )
+        assert solver.solve(preds[1], ((-3, 4), (0, 7))) == (
+            ((0, 4), (0, 4)), True
+        )
+        assert not solver.solve(preds[0], ((5, 12), (1, 1)))[1]
+
+        for pred in preds:
+            for state in states:
+                if any(int_dom.is_empty(v) for v in state):
+                    continue
+
+                new_state, success = solver.solve(pred, state)
+                assert all(
+                    int_dom.le(new, old) for new, old in zip(new_state, state)
+                )
+
+                # Concrete states that satisfy the predicate are kept.
+                for concrete in product(*[
+                    range(lo, hi + 1) for lo, hi in state
+                ]):
+                    singleton = tuple((v, v) for v in concrete)
+                    if reference_eval(pred, singleton) == true:
+                        assert success
+                        assert all(
+                            int_dom.le(v, new)
+                            for v, new in zip(singleton, new_state)
+                        )
+
+
+EvaluatorTest().run()
+BatchOperationsTest().run()
+SolverTest().run()
@@ -0,0 +1,148 @@
+from lalcheck.ai.irs.basic.purpose import ContractCheck, DerefCheck
+from lalcheck.checkers.support.components import (
+    ModelConfig, ModelGenerator, _precision_orders,
+    most_precise_model_config, subprograms_matcher
+)
+import re
+
+
+def config(**kwargs):
+    fields = dict(
+        typer='default',
+        type_interpreter='default',
+        call_strategy='unknown',
+        merge_predicate_builder='always',
+        purposes=None,
+        slicing=False,
+        interning=False,
+        inline_intervals=False,
+        memoizing=False,
+        consumers=None,
+        subprograms=None
+    )
+    fields.update(kwargs)
+    return ModelConfig(**fields)
+
+
+class FakeContext(object):
+    """
+    Stands for an extraction context, for the names of model configurations
+    which need one.
+    """
+    def default_typer(self, fallback_typer=None):
+        return 'typer'
+
+    def call_graph(self, handles):
+        return {}
+
+
+def expect_lookup_error(f, *args):
+    try:
+        f(*args)
+        assert False
+    except LookupError:
+        pass
+
+
+class PrecisionOrdersTest(object):
+    """
+    Checks that the names ordered by precision are exactly the names
+    accepted by the model generator.
+    """
+    def run(self):
+        ctx = FakeContext()
+        getters = {
+            'typer': lambda name: ModelGenerator.get_typer_for(ctx, name),
+            'type_interpreter': ModelGenerator.get_type_interpreter_for,
+            'call_strategy': lambda name: (
+                ModelGenerator.get_call_strategy_for(
+                    ctx, name, [], None, None
+                )
+            ),
+            'merge_predicate_builder':
+                ModelGenerator.get_merge_pred_builder_for
+        }
+        assert sorted(getters.keys()) == sorted(_precision_orders.keys())
+        for field, names in _precision_orders.iteritems():
+            assert len(set(names)) == len(names)
+            for name in names:
+                assert getters[field](name) is not None
+            expect_lookup_error(getters[field], 'unknown_name')
+
+
+class MostPreciseTest(object):
+    """
+    Checks that the most precise configuration is at least as precise as
+    each of the given ones, and not more precise than necessary.
+    """
+    def run(self):
+        fst = config(
+            call_strategy='bottomup',
+            merge_predicate_builder='le_t_eq_v',
+            purposes=(DerefCheck,),
+            slicing=True,
+            memoizing=True,
+            subprograms='f.*'
+        )
+        snd = config(
+            typer='unknown',
+            purposes=(ContractCheck, DerefCheck),
+            slicing=True,
+            interning=True,
+            consumers=('consumer',),
+            subprograms='g'
+        )
+        assert most_precise_model_config([fst, snd]) == config(
+            call_strategy='bottomup',
+            merge_predicate_builder='le_t_eq_v',
+            purposes=(ContractCheck, DerefCheck),
+            slicing=True,
+            interning=True,
+            memoizing=True,
+            subprograms='(?:f.*)|(?:g)'
+        )
+
+        thd = config(typer='default_robust', call_strategy='topdown')
+        assert most_precise_model_config([fst, snd, thd]) == config(
+            typer='default_robust',
+            call_strategy='topdown',
+            merge_predicate_builder='le_t_eq_v',
+            interning=True,
+            memoizing=True
+        )
+
+        # A single configuration only loses its consumers.
+        assert most_precise_model_config([snd]) == snd._replace(
+            consumers=None
+        )
+
+        expect_lookup_error(
+            most_precise_model_config, [fst, config(typer='other')]
+        )
+
+
+class SubprogramsMatcherTest(object):
+    """
+    Checks that the regex built from several regexes matches the names
+    matched by any of them.
+    """
+    def run(self):
+        assert subprograms_matcher([]) is None
+        assert subprograms_matcher(['a', None]) is None
+        assert subprograms_matcher(['a', 'a']) == 'a'
+
+        matchers = ['Foo|Bar', 'B.z', 'Qux$']
+        matcher = re.compile(subprograms_matcher(matchers))
+        for name in ['Foo', 'Bar', 'Baz', 'Qux', 'Quxx', 'Other', 'Bz']:
+            assert bool(matcher.match(name)) == any(
+                re.match(m, name) for m in matchers
+            )
+
+        # The result does not depend on the order of the regexes.
+        assert (subprograms_matcher(matchers) ==
+                subprograms_matcher(reversed(matchers)))
+
+
+PrecisionOrdersTest().run()
+MostPreciseTest().run()
+SubprogramsMatcherTest().run()
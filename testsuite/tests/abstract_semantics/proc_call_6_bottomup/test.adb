@@ -0,0 +1,20 @@
+procedure Test is
+   type Point is record
+      x : Integer;
+      y : Integer;
+      z : Integer;
+   end record;
+
+   function F(x : Integer) return Integer is
+   begin
+      if x > 0 then
+         return F(x - 1);
+      end if;
+
+      return 0;
+   end F;
+
+   p : Point := (2, 3, 12);
+begin
+   p.y := F(p.x);
+end Ex1;
@@ -0,0 +1,160 @@
+from lalcheck.ai import types, interpretations as interps
+from lalcheck.ai.constants import ops
+from lalcheck.ai.irs.basic import tree as irt
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.irs.basic.analyses import abstract_semantics
+from lalcheck.ai.irs.basic.frontends.lal.codegen import PurposeIndexer
+from lalcheck.ai.irs.basic.purpose import (
+    ContractCheck, DerefCheck, may_have_purposes
+)
+from lalcheck.ai.utils import Bunch, Transformer
+from lalcheck.checkers.support.components import AbstractAnalyser, ModelConfig
+
+
+int_type = types.IntRange(-100, 100)
+bool_type = types.Boolean()
+
+
+class NullDerefCheck(DerefCheck):
+    pass
+
+
+def fake_subp(name):
+    """
+    Stands for the libadalang node of a subprogram.
+    """
+    return Bunch(
+        f_subp_spec=Bunch(f_subp_name=Bunch(text=name)),
+        sloc_range=None
+    )
+
+
+def build_stmts(purpose):
+    """
+    Builds statements in which the assume statement with the given purpose
+    is nested in a loop and a split statement.
+    """
+    x = irt.Variable('x', index=0, type_hint=int_type)
+
+    def ident():
+        return irt.Identifier(x, type_hint=int_type)
+
+    def check(op, **data):
+        return irt.AssumeStmt(irt.FunCall(
+            op, [ident(), irt.Lit(0, type_hint=int_type)],
+            type_hint=bool_type
+        ), **data)
+
+    return [
+        irt.ReadStmt(ident()),
+        irt.LoopStmt([
+            irt.SplitStmt([
+                [check(ops.GT, purpose=purpose)],
+                [check(ops.LE)]
+            ])
+        ])
+    ]
+
+
+def build_program(name, purpose):
+    """
+    Builds a program indexed by the PurposeIndexer, as frontends do.
+    """
+    stmts = build_stmts(purpose)
+    indexer = PurposeIndexer()
+    for stmt in stmts:
+        stmt.visit(indexer)
+    return irt.Program(
+        stmts, fun_id=fake_subp(name), purposes=frozenset(indexer.purposes)
+    )
+
+
+class PurposeIndexerTest(object):
+    """
+    Checks that the purposes of nested assume statements are collected, and
+    that assume statements without purpose are ignored.
+    """
+    def run(self):
+        indexer = PurposeIndexer()
+        for stmt in build_stmts(NullDerefCheck(None)):
+            stmt.visit(indexer)
+        assert indexer.purposes == {NullDerefCheck}
+
+        indexer = PurposeIndexer()
+        for stmt in build_stmts(None):
+            stmt.visit(indexer)
+        assert indexer.purposes == set()
+
+
+class MayHavePurposesTest(object):
+    """
+    Checks that a program may have the purposes of its index and their
+    superclasses only, and that a program without index may have any.
+    """
+    def run(self):
+        prog = build_program('F', NullDerefCheck(None))
+        assert may_have_purposes(prog, [NullDerefCheck])
+        assert may_have_purposes(prog, [ContractCheck, DerefCheck])
+        assert not may_have_purposes(prog, [ContractCheck])
+        assert not may_have_purposes(prog, [])
+
+        assert not may_have_purposes(build_program('G', None), [DerefCheck])
+
+        unindexed = irt.Program(build_stmts(None), fun_id=fake_subp('H'))
+        assert may_have_purposes(unindexed, [ContractCheck])
+
+
+class FakeContext(object):
+    def flush_type_cache(self):
+        pass
+
+
+class SkippedAnalysisTest(object):
+    """
+    Checks that the analyser only analyzes the programs which may have one of
+    the purposes queried from the analysis.
+    """
+    def analyze(self, progs, purposes):
+        model = irtools.Models(
+            Transformer.as_transformer(lambda hint: hint),
+            interps.default_type_interpreter
+        ).lazy()
+        model_config = ModelConfig(
+            typer='default',
+            type_interpreter='default',
+            call_strategy='unknown',
+            merge_predicate_builder='always',
+            purposes=purposes,
+            slicing=False,
+            interning=False,
+            inline_intervals=False,
+            memoizing=False,
+            consumers=None,
+            subprograms=None
+        )
+        res = AbstractAnalyser(None, model_config, [], 'test.adb').run(
+            FakeContext(),
+            [irt.ProgramHandle.of(prog) for prog in progs],
+            (model, abstract_semantics.MergePredicateBuilder.Always,
+             abstract_semantics.UnknownTargetCallStrategy())
+        )['res']
+        return [
+            analysis.orig_subp.f_subp_spec.f_subp_name.text
+            for analysis in res
+        ]
+
+    def run(self):
+        progs = [
+            build_program('F', NullDerefCheck(None)),
+            build_program('G', ContractCheck('pre', None)),
+            build_program('H', None)
+        ]
+
+        assert self.analyze(progs, (DerefCheck,)) == ['F']
+        assert self.analyze(progs, (ContractCheck, DerefCheck)) == ['F', 'G']
+        assert self.analyze(progs, None) == ['F', 'G', 'H']
+
+
+PurposeIndexerTest().run()
+MayHavePurposesTest().run()
+SkippedAnalysisTest().run()
@@ -0,0 +1,71 @@
+from lalcheck.ai.irs.basic import tree as irt
+from lalcheck.ai.irs.basic.analyses.slicing import slice_program
+from lalcheck.ai.irs.basic.purpose import ContractCheck, DerefCheck
+
+
+class SlicingTest(object):
+    """
+    Checks that the slice of a program on the assume statements of a given
+    purpose keeps the statements on which they depend, and drops the
+    unrelated ones.
+    """
+    def __init__(self):
+        self.vars = {
+            name: irt.Variable(name, index=i)
+            for i, name in enumerate(['x', 'y', 'z', 't', 'u', 'w'])
+        }
+
+    def id(self, name):
+        return irt.Identifier(self.vars[name])
+
+    def assign(self, name, expr):
+        return irt.AssignStmt(self.id(name), expr)
+
+    def op(self, fun, *args):
+        return irt.FunCall(fun, [
+            self.id(arg) if isinstance(arg, str) else irt.Lit(arg)
+            for arg in args
+        ])
+
+    def run(self):
+        x_def = self.assign('x', irt.Lit(1))
+        y_def = self.assign('y', self.op('+', 'x', 1))
+        z_def = self.assign('z', irt.Lit(5))
+        t_def = self.assign('t', irt.Lit(3))
+        w_read = irt.ReadStmt(self.id('w'))
+        z_assume = irt.AssumeStmt(self.op('>', 'z', 0))
+        u_def = self.assign('u', self.op('+', 'z', 't'))
+        y_assume = irt.AssumeStmt(self.op('<', 'y', 't'))
+        z_incr = self.assign('z', self.op('+', 'z', 1))
+        check = irt.AssumeStmt(
+            self.op('==', 'y', 2), purpose=DerefCheck(None)
+        )
+        other_check = irt.AssumeStmt(
+            self.op('==', 'w', 2), purpose=ContractCheck('pre', None)
+        )
+
+        prog = irt.Program([
+            x_def, y_def, z_def, t_def, w_read,
+            irt.SplitStmt([[z_assume, u_def], [y_assume]]),
+            irt.LoopStmt([z_incr]),
+            check,
+            other_check
+        ], fun_id='f')
+
+        sliced, relevant = slice_program(prog, (DerefCheck,))
+        assert relevant == {self.vars[name] for name in ['x', 'y', 't']}
+        assert sliced.data.fun_id == 'f'
+
+        stmts = sliced.stmts
+        assert stmts[:3] == [x_def, y_def, t_def]
+        assert isinstance(stmts[3], irt.SplitStmt)
+        assert stmts[3].branches == [[], [y_assume]]
+        assert stmts[4:] == [check]
+
+        # Slicing on another purpose keeps other statements.
+        sliced, relevant = slice_program(prog, (ContractCheck,))
+        assert relevant == {self.vars['w']}
+        assert sliced.stmts == [w_read, other_check]
+
+
+SlicingTest().run()
@@ -0,0 +1,189 @@
+from lalcheck.ai import types, interpretations as interps
+from lalcheck.ai.constants import ops
+from lalcheck.ai.irs.basic import tree as irt
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.irs.basic.analyses import abstract_semantics
+from lalcheck.ai.irs.basic.purpose import DerefCheck
+from lalcheck.ai.utils import Bunch, Transformer
+from lalcheck.checkers.support import components
+from lalcheck.checkers.support.components import (
+    AbstractAnalyser, ModelConfig, consumed_semantics
+)
+from functools import partial
+
+
+int_type = types.IntRange(-100, 100)
+bool_type = types.Boolean()
+
+
+def fake_subp(name):
+    """
+    Stands for the libadalang node of a subprogram.
+    """
+    return Bunch(
+        f_subp_spec=Bunch(f_subp_name=Bunch(text=name)),
+        sloc_range=None
+    )
+
+
+def build_program(bound, fun_id):
+    x = irt.Variable('x', index=0, type_hint=int_type)
+
+    def ident():
+        return irt.Identifier(x, type_hint=int_type)
+
+    return irt.Program([
+        irt.ReadStmt(ident()),
+        irt.AssumeStmt(irt.FunCall(
+            ops.LT, [ident(), irt.Lit(bound, type_hint=int_type)],
+            type_hint=bool_type
+        ), purpose=DerefCheck(None))
+    ], fun_id=fun_id)
+
+
+def failing_build(fun_id):
+    raise ValueError("unsupported construct")
+
+
+seen_analyses = []
+
+
+def check_states(analysis, purpose_type):
+    """
+    A consumer which returns the states at the checks of the given purpose.
+    """
+    seen_analyses.append(analysis)
+    return [
+        [values for _, values in analysis.states_at(node)]
+        for node, _, _ in analysis.assumes_with_purpose(purpose_type)
+    ]
+
+
+def count_nodes(analysis):
+    seen_analyses.append(analysis)
+    return len(analysis.cfg.nodes)
+
+
+class FakeContext(object):
+    def __init__(self):
+        self.flushes = 0
+
+    def flush_type_cache(self):
+        self.flushes += 1
+
+
+class StreamedAnalysisTest(object):
+    """
+    Checks that the results of the analysis of each program are handed to
+    the consumers of the model configuration and then released, and that
+    they are the same as when the consumers are applied afterwards.
+    """
+    def __init__(self):
+        self.built = []
+
+    def handle(self, name, build):
+        subp = fake_subp(name)
+
+        def f():
+            self.built.append(name)
+            return build(subp)
+
+        return irt.ProgramHandle(subp, f)
+
+    def analyze(self, consumers, subprograms=None, memoizing=False):
+        del self.built[:]
+        del seen_analyses[:]
+        handles = [
+            self.handle('F', partial(build_program, 0)),
+            self.handle('G', failing_build),
+            self.handle('H', partial(build_program, 200))
+        ]
+        model = irtools.Models(
+            Transformer.as_transformer(lambda hint: hint),
+            interps.default_type_interpreter
+        ).lazy()
+        model_config = ModelConfig(
+            typer='default',
+            type_interpreter='default',
+            call_strategy='unknown',
+            merge_predicate_builder='always',
+            purposes=None,
+            slicing=False,
+            interning=False,
+            inline_intervals=False,
+            memoizing=memoizing,
+            consumers=consumers,
+            subprograms=subprograms
+        )
+        ctx = FakeContext()
+        res = AbstractAnalyser(None, model_config, [], 'test.adb').run(
+            ctx,
+            handles,
+            (model, abstract_semantics.MergePredicateBuilder.Always,
+             abstract_semantics.UnknownTargetCallStrategy())
+        )['res']
+        assert ctx.flushes == 1
+        return res
+
+    def run(self):
+        values_consumer = (check_states, (DerefCheck,))
+        count_consumer = (count_nodes, ())
+        expected_values = [
+            [[((-100, -1),)]],
+            [[((-100, 100),)]]
+        ]
+
+        res = self.analyze(None)
+        assert self.built == ['F', 'G', 'H']
+        assert len(res) == 2
+        assert consumed_semantics(res, values_consumer) == expected_values
+        assert all(analysis.states is not None for analysis in res)
+        expected_counts = consumed_semantics(res, count_consumer)
+
+        streamed = self.analyze((values_consumer, count_consumer))
+        assert sorted(streamed.keys()) == sorted([
+            values_consumer, count_consumer
+        ])
+        assert consumed_semantics(streamed, values_consumer) == (
+            expected_values
+        )
+        assert consumed_semantics(streamed, count_consumer) == (
+            expected_counts
+        )
+
+        # Each analysis was released once consumed by all the consumers.
+        assert len(seen_analyses) == 4
+        for analysis in seen_analyses:
+            assert analysis.states is None and analysis.semantics is None
+            assert analysis.cfg is not None
+
+        # Programs of subprograms which are not analyzed are not built.
+        streamed = self.analyze((count_consumer,), subprograms='H|K')
+        assert self.built == ['H']
+        assert consumed_semantics(streamed, count_consumer) == [
+            expected_counts[1]
+        ]
+
+        # Memoizing the domains does not change the results, and the hit rate
+        # of their caches is logged before their memoization is undone.
+        logged = []
+        log = components.log
+        components.log = lambda logger, msg: logged.append(msg)
+        try:
+            memoized = self.analyze(None, memoizing=True)
+        finally:
+            components.log = log
+        assert consumed_semantics(memoized, values_consumer) == (
+            expected_values
+        )
+        memo_logs = [msg for msg in logged if msg.startswith('Memoized ')]
+        assert len(memo_logs) > 0
+        domain = interps.default_type_interpreter.get(int_type).domain
+        assert any(
+            msg.startswith('Memoized {}.'.format(type(domain).__name__))
+            for msg in memo_logs
+        )
+        assert type(domain).memo_caches() == {}
+
+
+StreamedAnalysisTest().run()
@@ -0,0 +1,103 @@
+from lalcheck.ai import domains, interpretations as interps
+from lalcheck.ai.irs.basic.analyses.abstract_semantics import SummaryCache
+from lalcheck.ai.utils import LRUCache, freeze
+
+
+class FreezeTest(object):
+    """
+    Checks that frozen values are hashable and equal when the original
+    values are equal.
+    """
+    def run(self):
+        value = [{'a': [1, 2], 'b': {3}}, (4, [5])]
+        frozen = freeze(value)
+        assert hash(frozen) == hash(freeze(value))
+        assert frozen == freeze([{'b': {3}, 'a': [1, 2]}, (4, [5])])
+        assert frozen != freeze([{'a': [2, 1], 'b': {3}}, (4, [5])])
+        assert freeze(3) == 3
+
+
+class LRUCacheTest(object):
+    """
+    Checks the hits, misses and eviction order of an LRUCache.
+    """
+    def run(self):
+        cache = LRUCache(2)
+        assert cache.get('a') is LRUCache.missing
+        assert cache.put('a', 1) is None
+        assert cache.put('b', 2) is None
+        assert cache.get('a') == 1
+
+        # 'b' is the least recently used entry.
+        assert cache.put('c', 3) == ('b', 2)
+        assert cache.get('b') is LRUCache.missing
+        assert cache.items() == [('a', 1), ('c', 3)]
+
+        # Peeking neither counts nor refreshes the entry.
+        assert cache.peek('a') == 1
+        assert cache.put('d', 4) == ('a', 1)
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.hit_rate() == 1.0 / 3
+
+        unbounded = LRUCache(0)
+        for i in range(100):
+            assert unbounded.put(i, i) is None
+        assert len(unbounded) == 100
+
+
+class SummaryCacheTest(object):
+    """
+    Checks the exact and subsumption lookups of a SummaryCache.
+    """
+    def __init__(self):
+        self.dom = domains.Intervals(-10, 10)
+
+    def sig(self, *out_param_indices):
+        return interps.Signature(
+            'f', (self.dom, self.dom), self.dom, out_param_indices
+        )
+
+    def run_exact(self):
+        cache = SummaryCache(max_size=2)
+        f, g = object(), object()
+        sig = self.sig()
+        cache.put(f, sig, ((0, 1), (2, 3)), 'f1')
+        assert cache.get(f, sig, ((0, 1), (2, 3))) == 'f1'
+        assert cache.get(g, sig, ((0, 1), (2, 3))) is LRUCache.missing
+        assert cache.get(f, self.sig(0), ((0, 1), (2, 3))) is LRUCache.missing
+
+        # Included arguments are not reused without subsumption.
+        assert cache.get(f, sig, ((0, 0), (2, 3))) is LRUCache.missing
+        assert (cache.hits, cache.misses) == (1, 3)
+
+        cache.put(g, sig, ((0, 1), (2, 3)), 'g1')
+        cache.put(g, sig, ((0, 0), (2, 3)), 'g2')
+        assert cache.get(f, sig, ((0, 1), (2, 3))) is LRUCache.missing
+        assert cache.get(g, sig, ((0, 1), (2, 3))) == 'g1'
+
+    def run_subsumption(self):
+        cache = SummaryCache(max_size=2, subsumption=True)
+        f, g = object(), object()
+        sig = self.sig()
+        cache.put(f, sig, ((0, 5), (0, 5)), 'f1')
+        cache.put(g, sig, ((-10, 10), (-10, 10)), 'g1')
+
+        assert cache.get(f, sig, ((1, 2), (3, 4))) == 'f1'
+        assert cache.get(f, sig, ((1, 2), (3, 6))) is LRUCache.missing
+        assert cache.get(f, self.sig(1), ((1, 2), (3, 4))) is LRUCache.missing
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # 'f1' was used more recently than 'g1', which is evicted.
+        cache.put(f, sig, ((6, 7), (6, 7)), 'f2')
+        assert cache.get(g, sig, ((0, 0), (0, 0))) is LRUCache.missing
+        assert cache.get(f, sig, ((6, 6), (7, 7))) == 'f2'
+        assert cache._keys_by_target.keys() == [(f, ())]
+
+    def run(self):
+        self.run_exact()
+        self.run_subsumption()
+
+
+FreezeTest().run()
+LRUCacheTest().run()
+SummaryCacheTest().run()
@@ -0,0 +1,30 @@
+package body Pkg_A is
+
+   procedure Sort (Values : in out Int_Array) is
+      Tmp     : Integer;
+      Swapped : Boolean := True;
+   begin
+      while Swapped loop
+         Swapped := False;
+         for I in Values'First .. Values'Last - 1 loop
+            if Values (I) > Values (I + 1) then
+               Tmp := Values (I);
+               Values (I) := Values (I + 1);
+               Values (I + 1) := Tmp;
+               Swapped := True;
+            end if;
+         end loop;
+      end loop;
+   end Sort;
+
+   function Double (X : Integer) return Integer is
+   begin
+      return X * 2;
+   end Double;
+
+   function Half (X : Integer) return Integer is
+   begin
+      return X / 2;
+   end Half;
+
+end Pkg_A;
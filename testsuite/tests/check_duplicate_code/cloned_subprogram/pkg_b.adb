@@ -0,0 +1,25 @@
+package body Pkg_B is
+
+   function Triple (X : Integer) return Integer is
+   begin
+      return X * 3;
+   end Triple;
+
+   procedure Sort (Values : in out Int_Array) is
+      Tmp     : Integer;
+      Swapped : Boolean := True;
+   begin
+      while Swapped loop
+         Swapped := False;
+         for I in Values'First .. Values'Last - 1 loop
+            if Values (I) > Values (I + 1) then
+               Tmp := Values (I);
+               Values (I) := Values (I + 1);
+               Values (I + 1) := Tmp;
+               Swapped := True;
+            end if;
+         end loop;
+      end loop;
+   end Sort;
+
+end Pkg_B;
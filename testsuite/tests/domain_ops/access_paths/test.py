@@ -0,0 +1,66 @@
+from lalcheck.ai import domains
+from itertools import product
+
+
+lat = domains.AccessPathsLattice()
+paths = domains.AccessPathsLattice
+elem_dom = domains.Intervals(0, 3)
+comp_dom = domains.Intervals(0, 1)
+
+
+def all_paths():
+    addresses = [paths.Address(i, elem_dom) for i in range(3)]
+    return [
+        paths.NoPath(), paths.Null(), paths.NonNull(), paths.AllPath()
+    ] + addresses + [
+        paths.ProductGet(addr, i, comp_dom)
+        for addr, i in product(addresses, range(2))
+    ] + [
+        paths.Subprogram('f', None, None, [addresses[0]]),
+        paths.Subprogram('g', None, None, [])
+    ]
+
+
+class InterningTest(object):
+    """
+    Checks that structurally equal access paths are represented by a single
+    object, and that distinct access paths hash differently.
+    """
+    def run(self):
+        xs, ys = all_paths(), all_paths()
+        for x, y in zip(xs, ys):
+            assert x == y and hash(x) == hash(y)
+            if not isinstance(x, paths.Subprogram):
+                assert x is y
+
+        assert len(set(xs)) == len(xs)
+        assert len(set(hash(x) for x in xs)) == len(xs)
+
+        try:
+            xs[4].val = 1
+            assert False
+        except AttributeError:
+            pass
+
+
+class LatticeTest(object):
+    """
+    Checks that the join and meet of access paths are commutative, and
+    consistent with their ordering.
+    """
+    def run(self):
+        xs = all_paths()
+        for x, y in product(xs, xs):
+            joined, met = lat.join(x, y), lat.meet(x, y)
+            assert joined == lat.join(y, x) and met == lat.meet(y, x)
+            assert lat.le(x, joined) and lat.le(y, joined)
+            assert lat.le(met, x) and lat.le(met, y)
+            assert lat.eq(x, y) == (x == y) == (not x != y)
+
+        assert lat.join(paths.Null(), paths.NonNull()) is lat.top
+        assert lat.meet(paths.Null(), paths.NonNull()) is lat.bottom
+        assert lat.join(xs[4], xs[5]) is paths.NonNull()
+
+
+InterningTest().run()
+LatticeTest().run()
@@ -0,0 +1,71 @@
+from lalcheck.ai import domains
+from lalcheck.ai.domain_ops import boolean_ops
+from itertools import product
+
+
+interval_dom = domains.Intervals(-3, 3)
+product_dom = domains.Product(interval_dom, boolean_ops.Boolean)
+
+
+class InterningTest(object):
+    """
+    Checks that the operations of an interning domain agree with the ones of
+    the domain it wraps, and that structurally equal results are represented
+    by a single object.
+    """
+    def __init__(self, domain):
+        self.domain = domain
+        self.interning = domains.Interning(domain)
+
+    def check_op(self, op, x, y):
+        expected = getattr(self.domain, op)(x, y)
+        res = getattr(self.interning, op)(x, y)
+        assert self.domain.eq(res, expected)
+        assert getattr(self.interning, op)(x, y) is res
+        assert self.interning.intern(expected) is res
+
+    def run(self):
+        elems = list(self.domain.generator())
+        for x, y in product(elems, elems):
+            self.check_op('join', x, y)
+            self.check_op('meet', x, y)
+            self.check_op('update', x, y)
+
+            assert self.interning.eq(x, y) == self.domain.eq(x, y)
+            assert self.interning.le(x, y) == self.domain.le(x, y)
+            assert self.interning.lt(x, y) == self.domain.lt(x, y)
+
+        for x in elems:
+            interned = self.interning.intern(x)
+            assert self.interning.eq(interned, x)
+            assert self.interning.le(interned, interned)
+            assert not self.interning.lt(interned, interned)
+
+        assert self.interning.hits > 0
+        assert self.interning.intern(self.domain.bottom) is (
+            self.interning.bottom
+        )
+        assert self.interning.intern(self.domain.top) is self.interning.top
+
+
+class ClearTest(object):
+    """
+    Checks that elements interned before a clear are not shared with the
+    ones interned after it, except for the bottom and top elements.
+    """
+    def run(self):
+        interning = domains.Interning(interval_dom)
+        x = interning.build(-1, 2)
+        assert interning.build(-1, 2) is x
+
+        interning.clear()
+        y = interning.build(-1, 2)
+        assert y is not x and interning.eq(x, y)
+        assert interning.join(interning.bottom, interning.top) is (
+            interning.top
+        )
+
+
+InterningTest(interval_dom).run()
+InterningTest(product_dom).run()
+ClearTest().run()
@@ -0,0 +1,46 @@
+from lalcheck.ai import domains
+from lalcheck.ai.domain_ops import boolean_ops
+from itertools import product
+
+
+class IntervalProductTest(object):
+    """
+    Checks that the operations of an interval product domain agree with the
+    ones of the generic product domain built from the same domains.
+    """
+    def __init__(self, *doms):
+        self.doms = doms
+        self.reference = domains.Product(*doms)
+        self.domain = domains.IntervalProduct(*doms)
+
+    def run(self):
+        elems = list(product(*(
+            [dom.bottom] + list(dom.generator()) for dom in self.doms
+        )))
+        for x, y in product(elems, elems):
+            for op in ['join', 'meet']:
+                expected = getattr(self.reference, op)(x, y)
+                assert self.reference.eq(
+                    getattr(self.domain, op)(x, y), expected
+                )
+
+            assert self.reference.eq(
+                self.domain.update(x, y, False),
+                self.reference.update(x, y, False)
+            )
+            # Widening intervals towards an empty one is not supported by the
+            # intervals domain.
+            if not self.reference.is_empty(y):
+                assert self.reference.eq(
+                    self.domain.update(x, y, True),
+                    self.reference.update(x, y, True)
+                )
+
+            assert self.domain.eq(x, y) == self.reference.eq(x, y)
+
+
+IntervalProductTest(domains.Intervals(-2, 2), domains.Intervals(0, 3)).run()
+IntervalProductTest(
+    domains.Intervals(-1, 1), boolean_ops.Boolean, domains.Intervals(0, 2)
+).run()
+IntervalProductTest(boolean_ops.Boolean, boolean_ops.Boolean).run()
@@ -0,0 +1,101 @@
+from lalcheck.ai import domains, types
+from lalcheck.ai import interpretations as interps
+from lalcheck.ai.domain_ops import sparse_array_ops
+from itertools import product
+
+
+index_dom = domains.Product(domains.Intervals(0, 2))
+elem_dom = domains.Intervals(0, 2)
+
+ref_dom = domains.SparseArray(index_dom, elem_dom)
+test_dom = domains.IntervalSparseArray(index_dom, elem_dom)
+
+all_elems = list(test_dom.generator()) + [test_dom.empty]
+
+
+class ReferenceTest(object):
+    """
+    Checks that the operations of the interval sparse array domain agree with
+    the ones of the sparse array domain, and that they return normalized
+    arrays.
+    """
+    def check_array(self, res, expected):
+        assert ref_dom.eq(res, expected)
+        assert ref_dom.is_empty(res) == ref_dom.is_empty(expected)
+        assert test_dom.normalized(res) == res
+
+    def run(self):
+        for x, y in product(all_elems[::3], all_elems[::11]):
+            self.check_array(test_dom.join(x, y), ref_dom.join(x, y))
+            assert ref_dom.eq(test_dom.meet(x, y), ref_dom.meet(x, y))
+            assert test_dom.le(x, y) == ref_dom.le(x, y)
+            assert test_dom.eq(x, y) == ref_dom.eq(x, y)
+
+        test_get = sparse_array_ops.get(test_dom)
+        ref_get = sparse_array_ops.get(ref_dom)
+        test_updated = sparse_array_ops.updated(test_dom)
+        ref_updated = sparse_array_ops.updated(ref_dom)
+
+        for x, index in product(all_elems, index_dom.generator()):
+            assert test_get(x, index) == ref_get(x, index)
+            for val in [(0, 0), (1, 2)]:
+                self.check_array(
+                    test_updated(x, val, index),
+                    ref_updated(x, val, index)
+                )
+
+
+class MaxElemsTest(object):
+    """
+    Checks that arrays with too many entries are merged down to the maximal
+    amount of entries, by merging the entries which are the closest first.
+    """
+    def run(self):
+        index_dom = domains.Intervals(0, 1000)
+        value_dom = domains.Intervals(0, 1000)
+        unbounded_dom = domains.IntervalSparseArray(index_dom, value_dom)
+        bounded_dom = domains.IntervalSparseArray(
+            index_dom, value_dom, max_elems=10
+        )
+        updated = sparse_array_ops.updated(unbounded_dom)
+        get = sparse_array_ops.get(unbounded_dom)
+
+        array = unbounded_dom.empty
+        for i in range(100):
+            array = updated(array, (i, i), (i * 2, i * 2))
+        array = updated(array, (0, 0), (500, 500))
+
+        assert len(array) == 101
+        assert get(array, (42, 42)) == (21, 21)
+        assert value_dom.is_empty(get(array, (43, 43)))
+
+        bounded = bounded_dom.normalized(array)
+        assert len(bounded) == 10
+        assert get(bounded, (500, 500)) == (0, 0)
+        assert unbounded_dom.le(array, bounded)
+
+
+class InterpreterTest(object):
+    """
+    Checks that arrays indexed by integers are only interpreted with the
+    IntervalSparseArray domain when it is asked for.
+    """
+    def run(self):
+        array = types.Array([types.IntRange(0, 255)], types.Boolean())
+        matrix = types.Array(
+            [types.IntRange(0, 255), types.IntRange(0, 255)], types.Boolean()
+        )
+
+        default = interps.default_type_interpreter
+        interval = interps.interval_arrays_type_interpreter
+
+        assert type(default.get(array).domain) is domains.SparseArray
+        assert type(interval.get(array).domain) is (
+            domains.IntervalSparseArray
+        )
+        assert type(interval.get(matrix).domain) is domains.SparseArray
+
+
+ReferenceTest().run()
+MaxElemsTest().run()
+InterpreterTest().run()
@@ -0,0 +1,75 @@
+from lalcheck.ai import domains
+from itertools import product, islice
+
+
+class MemoizationTest(object):
+    """
+    Checks that the memoized operations of a domain class return the same
+    results as the original ones, and that repeated calls hit the caches.
+    """
+    def __init__(self, domain_class, build_domain, max_elems):
+        self.domain_class = domain_class
+        self.domain = build_domain()
+        self.elems = list(islice(self.domain.generator(), max_elems))
+
+    def results(self):
+        return [
+            (
+                self.domain.join(x, y),
+                self.domain.meet(x, y),
+                self.domain.le(x, y),
+                self.domain.eq(x, y)
+            )
+            for x, y in product(self.elems, self.elems)
+        ]
+
+    def run(self):
+        expected = self.results()
+
+        self.domain_class.memoize()
+        assert self.results() == expected
+        assert self.results() == expected
+
+        caches = self.domain_class.memo_caches()
+        assert sorted(caches.keys()) == ['eq', 'join', 'le', 'meet']
+        for cache in caches.values():
+            assert cache.hits > 0
+            assert cache.hit_rate() >= 0.5
+
+        self.domain_class.unmemoize()
+        assert self.domain_class.memo_caches() == {}
+        assert self.results() == expected
+
+
+class BoundedCacheTest(object):
+    """
+    Checks that the caches of a memoized domain class do not grow beyond
+    their maximal size.
+    """
+    def run(self):
+        dom = domains.Intervals(-10, 10)
+        domains.Intervals.memoize(max_size=16)
+        for x, y in product(dom.generator(), dom.generator()):
+            dom.join(x, y)
+
+        assert len(domains.Intervals.memo_caches()['join']) == 16
+        domains.Intervals.unmemoize()
+
+
+MemoizationTest(
+    domains.Intervals,
+    lambda: domains.Intervals(-3, 3),
+    100
+).run()
+
+MemoizationTest(
+    domains.SparseArray,
+    lambda: domains.SparseArray(
+        domains.Intervals(0, 2),
+        domains.Intervals(0, 2),
+        max_elems=2
+    ),
+    50
+).run()
+
+BoundedCacheTest().run()
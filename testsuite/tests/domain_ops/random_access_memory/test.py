@@ -0,0 +1,163 @@
+from lalcheck.ai import domains
+from lalcheck.ai.utils import PersistentMap
+from itertools import product
+import random
+
+
+interval_dom = domains.Intervals(-3, 3)
+other_dom = domains.Intervals(-4, 4)
+ram_dom = domains.RandomAccessMemory()
+
+
+class PersistentMapTest(object):
+    """
+    Checks that a persistent map behaves like a dict under a random sequence
+    of updates, that the copies made along the way are left untouched, and
+    that diff reports exactly the entries that differ.
+    """
+    def __init__(self, keys, steps):
+        self.keys = keys
+        self.steps = steps
+
+    def run(self):
+        rand = random.Random(42)
+        ref, pmap = {}, PersistentMap()
+        snapshots = []
+        for i in range(self.steps):
+            key = rand.choice(self.keys)
+            if rand.random() < 0.3:
+                ref.pop(key, None)
+                pmap = pmap.delete(key)
+            else:
+                ref[key] = i
+                pmap = pmap.set(key, i)
+
+            assert len(pmap) == len(ref)
+            assert pmap == ref
+            assert all(pmap[k] == v for k, v in ref.iteritems())
+            assert all((k in pmap) == (k in ref) for k in self.keys)
+            snapshots.append((dict(ref), pmap))
+
+        for ref, pmap in snapshots:
+            assert dict(pmap.iteritems()) == ref
+
+        for (ref_a, a), (ref_b, b) in product(snapshots[::7], snapshots[::5]):
+            expected = {
+                k: (ref_a.get(k, PersistentMap.missing),
+                    ref_b.get(k, PersistentMap.missing))
+                for k in set(ref_a) | set(ref_b)
+                if ref_a.get(k) != ref_b.get(k) or (k in ref_a) != (k in ref_b)
+            }
+            assert {k: (x, y) for k, x, y in a.diff(b)} == expected
+            assert (a == b) == (ref_a == ref_b)
+
+
+def random_memory(rand, addresses):
+    return ram_dom.build({
+        addr: (interval_dom, rand.choice(interval_elems))
+        if rand.random() < 0.9 else (other_dom, other_dom.build(-4, 4))
+        for addr in addresses
+        if rand.random() < 0.7
+    })
+
+
+def reference_join(a, b, op):
+    return {
+        k: (x[0], op(x[0], x[1], b[0][k][1]))
+        for k, x in a[0].iteritems()
+        if k in b[0] and b[0][k][0] == x[0]
+    }
+
+
+def reference_meet(a, b):
+    res = dict(b[0].iteritems())
+    for k, x in a[0].iteritems():
+        if k not in b[0]:
+            res[k] = x
+        elif b[0][k][0] != x[0]:
+            return None
+        else:
+            res[k] = (x[0], x[0].meet(x[1], b[0][k][1]))
+    return res
+
+
+def same_cells(res, expected):
+    return expected is not None and len(res[0]) == len(expected) and all(
+        k in expected and
+        x[0] == expected[k][0] and x[0].eq(x[1], expected[k][1])
+        for k, x in res[0].iteritems()
+    )
+
+
+class RAMTest(object):
+    """
+    Checks the lattice operations of the random access memory domain against
+    their straightforward definitions on dicts, on memories that derive from
+    one another and share some of their cells.
+    """
+    def run(self):
+        rand = random.Random(0)
+        addresses = range(-3, 40)
+        memories = []
+        for _ in range(20):
+            mem = random_memory(rand, addresses)
+            memories.append(mem)
+            for _ in range(3):
+                addr = rand.choice(addresses)
+                mem = (mem[0].set(
+                    addr, (interval_dom, rand.choice(interval_elems))
+                ), 0)
+                memories.append(mem)
+
+        for a, b in product(memories, memories):
+            joined = ram_dom.join(a, b)
+            assert same_cells(
+                joined, reference_join(a, b, lambda d, x, y: d.join(x, y))
+            )
+            widened = ram_dom.update(a, b, True)
+            assert same_cells(widened, reference_join(
+                a, b, lambda d, x, y: d.update(x, y, True)
+            ))
+
+            met = ram_dom.meet(a, b)
+            expected = reference_meet(a, b)
+            if expected is None:
+                assert met is ram_dom.bottom
+            else:
+                assert same_cells(met, expected)
+
+            assert ram_dom.eq(a, b) == same_cells(a, dict(b[0].iteritems()))
+            assert ram_dom.le(a, b) == all(
+                x[0] == b[0][k][0] and x[0].le(x[1], b[0][k][1])
+                for k, x in a[0].iteritems()
+                if k in b[0]
+            )
+
+
+class SharingTest(object):
+    """
+    Checks that the cells which are not affected by an operation are shared
+    by its operands and its result.
+    """
+    def run(self):
+        mem = ram_dom.build({
+            i: (interval_dom, interval_dom.build(0, 1)) for i in range(100)
+        })
+        updated = (mem[0].set(7, (interval_dom, interval_dom.build(2, 3))), 0)
+
+        joined = ram_dom.join(mem, updated)
+        assert all(joined[0][i] is mem[0][i] for i in range(100) if i != 7)
+        assert interval_dom.eq(joined[0][7][1], interval_dom.build(0, 3))
+
+        assert ram_dom.join(mem, mem)[0] == mem[0]
+        assert ram_dom.eq(mem, (mem[0].copy(), 0))
+        assert not ram_dom.eq(mem, updated)
+        assert ram_dom.le(updated, ram_dom.join(mem, updated))
+
+
+interval_elems = list(interval_dom.generator())
+
+PersistentMapTest(range(100), 500).run()
+PersistentMapTest([-1, -2, 0, 32, 1024, 2 ** 40, 'a', (1, 2)], 200).run()
+RAMTest().run()
+SharingTest().run()
@@ -0,0 +1,48 @@
+from lalcheck.ai import types
+from lalcheck.ai.interpretations import default_type_interpreter
+import pickle
+
+
+class TypeInterningTest(object):
+    """
+    Checks that structurally equal types are the same object, and therefore
+    share their interpretation.
+    """
+    def run(self):
+        byte = types.IntRange(0, 255)
+        assert types.IntRange(0, 255) is byte
+        assert types.IntRange(0, 127) is not byte
+        assert types.ASCIICharacter() is types.ASCIICharacter(0, 255)
+        assert types.ASCIICharacter() is not byte
+        assert types.Enum(['a', 'b']) is types.Enum(['a', 'b'])
+        assert types.Enum(['b', 'a']) is not types.Enum(['a', 'b'])
+
+        record = types.Product([byte, types.Boolean()])
+        assert types.Product([types.IntRange(0, 255), types.Boolean()]) is (
+            record
+        )
+        assert types.Array([byte], record) is types.Array(
+            [types.IntRange(0, 255)], types.Product([byte, types.Boolean()])
+        )
+
+        # Types built from distinct declarations are not shared.
+        decl_a, decl_b = ('a.ads', 3, 4), ('b.ads', 3, 4)
+        byte_a = types.IntRange(0, 255, decl=decl_a)
+        assert byte_a is not byte and byte_a.decl == decl_a
+        assert types.IntRange(0, 255, decl=decl_a) is byte_a
+        assert types.IntRange(0, 255, decl=decl_b) is not byte_a
+        assert types.Enum(['a', 'b'], decl=decl_a) is not (
+            types.Enum(['a', 'b'], decl=decl_b)
+        )
+        assert pickle.loads(pickle.dumps(byte_a)) is byte_a
+        assert default_type_interpreter.get(byte_a) is not (
+            default_type_interpreter.get(byte)
+        )
+
+        interp = default_type_interpreter.get(record)
+        assert default_type_interpreter.get(
+            types.Product([types.IntRange(0, 255), types.Boolean()])
+        ) is interp
+
+
+TypeInterningTest().run()
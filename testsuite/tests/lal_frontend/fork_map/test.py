@@ -0,0 +1,73 @@
+from lalcheck.tools.parallel import fork_map
+import os
+import tempfile
+
+
+class ForkMapTest(object):
+    """
+    Checks that the chunks are processed in other processes which inherit
+    the state of the parent, that the results are returned in order, and
+    that failures are reported as None without affecting other chunks, and
+    with their traceback printed by the failing process. Chunks for which no
+    process can be forked are reported as None as well.
+    """
+    def __init__(self):
+        self.state = {'offset': 100}
+
+    def work(self, chunk):
+        if chunk is None:
+            raise ValueError("failure")
+        self.state['offset'] += 1
+        return ','.join(
+            str(x + self.state['offset']) for x in chunk
+        ) + ';' + str(os.getpid() != self.parent_pid)
+
+    def run(self):
+        self.parent_pid = os.getpid()
+        chunks = [[1, 2], [], None, [3]] + [[i] for i in range(10)]
+
+        # Capture the standard error of the children.
+        with tempfile.TemporaryFile() as err:
+            stderr_fd = os.dup(2)
+            os.dup2(err.fileno(), 2)
+            try:
+                res = fork_map(self.work, chunks)
+            finally:
+                os.dup2(stderr_fd, 2)
+                os.close(stderr_fd)
+
+            err.seek(0)
+            assert 'ValueError: failure' in err.read()
+
+        assert res[:4] == ['102,103;True', ';True', None, '104;True']
+        assert res[4:] == ['{};True'.format(i + 101) for i in range(10)]
+        assert self.state['offset'] == 100
+        assert fork_map(self.work, []) == []
+
+        forks = []
+        fork = os.fork
+
+        def failing_fork():
+            forks.append(None)
+            if len(forks) == 2:
+                raise OSError(11, "Resource temporarily unavailable")
+            return fork()
+
+        with tempfile.TemporaryFile() as err:
+            stderr_fd = os.dup(2)
+            os.dup2(err.fileno(), 2)
+            os.fork = failing_fork
+            try:
+                res = fork_map(self.work, [[1], [2], [3]])
+            finally:
+                os.fork = fork
+                os.dup2(stderr_fd, 2)
+                os.close(stderr_fd)
+
+            err.seek(0)
+            assert 'OSError' in err.read()
+
+        assert res == ['102;True', None, '104;True']
+
+
+ForkMapTest().run()
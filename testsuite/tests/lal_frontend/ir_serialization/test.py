@@ -0,0 +1,124 @@
+from lalcheck.ai import types, interpretations as interps
+from lalcheck.ai.constants import ops
+from lalcheck.ai.irs.basic import serialization, tree as irt
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.irs.basic.analyses import abstract_semantics
+from lalcheck.ai.utils import Transformer
+import os
+import shutil
+import tempfile
+
+
+class FrontendHint(object):
+    """
+    Stands for a type hint owned by a frontend, which cannot be pickled.
+    """
+    def __init__(self, name, tpe):
+        self.name = name
+        self.tpe = tpe
+
+    def __reduce__(self):
+        raise TypeError("cannot pickle frontend hints")
+
+
+int_hint = FrontendHint('int', types.IntRange(-100, 100))
+bool_hint = FrontendHint('bool', types.Boolean())
+hints = {hint.name: hint for hint in [int_hint, bool_hint]}
+
+
+def persistent_id(obj):
+    return obj.name if isinstance(obj, FrontendHint) else None
+
+
+def build_program():
+    x = irt.Variable('x', index=0, type_hint=int_hint)
+    y = irt.Variable('y', index=1, type_hint=int_hint)
+
+    def ident(var):
+        return irt.Identifier(var, type_hint=int_hint)
+
+    def lit(value):
+        return irt.Lit(value, type_hint=int_hint)
+
+    def call(op, args, hint):
+        return irt.FunCall(op, args, type_hint=hint)
+
+    return irt.Program([
+        irt.AssignStmt(ident(x), lit(0)),
+        irt.ReadStmt(ident(y)),
+        irt.LoopStmt([
+            irt.AssumeStmt(call(ops.LT, [ident(x), ident(y)], bool_hint)),
+            irt.AssignStmt(ident(x), call(ops.PLUS, [ident(x), lit(1)],
+                                          int_hint))
+        ]),
+        irt.AssumeStmt(call(ops.GE, [ident(x), lit(10)], bool_hint))
+    ], fun_id='f')
+
+
+def analyze(prog):
+    typer = Transformer.as_transformer(lambda hint: hint.tpe)
+    model = irtools.Models(typer, interps.default_type_interpreter).of(prog)
+    res = abstract_semantics.compute_semantics(
+        prog, model[prog], abstract_semantics.MergePredicateBuilder.Always
+    )
+    return sorted(
+        (node.name, res.vars_domain.str(state))
+        for node in res.cfg.nodes
+        for _, state in res.states_at(node)
+    )
+
+
+class SerializationTest(object):
+    """
+    Checks that deserialized programs refer to the frontend objects given by
+    the frontend, share their variables, and have the same semantics as the
+    original ones.
+    """
+    def run(self):
+        prog = build_program()
+        data = serialization.dumps([prog], persistent_id)
+        loaded, = serialization.loads(data, hints.__getitem__)
+
+        assert loaded.data.fun_id == 'f'
+        assert loaded.stmts[0].id.data.type_hint is int_hint
+        assert loaded.stmts[3].expr.data.type_hint is bool_hint
+        assert loaded.stmts[0].id.var is loaded.stmts[2].stmts[1].id.var
+        assert loaded.stmts[0].id.var is not prog.stmts[0].id.var
+        assert analyze(loaded) == analyze(prog)
+
+        try:
+            serialization.dumps([prog], lambda _: None)
+            assert False
+        except ValueError:
+            pass
+
+
+class ProgramCacheTest(object):
+    """
+    Checks that entries of a program cache are only served if their
+    dependencies are up to date.
+    """
+    def run(self):
+        path = os.path.join(tempfile.mkdtemp(), 'ir')
+        try:
+            cache = serialization.ProgramCache(path)
+            assert cache.get('k', lambda deps: True) is None
+
+            cache.put('k', {'a.adb': '1'}, ['f', 'g'])
+            other = serialization.ProgramCache(path)
+            assert other.get('k', lambda deps: deps == {'a.adb': '1'}) == [
+                'f', 'g'
+            ]
+            assert other.get('k', lambda deps: deps == {'a.adb': '2'}) is (
+                None
+            )
+            assert other.hits == 1 and other.misses == 1
+
+            other.clear()
+            assert cache.get('k', lambda deps: True) is None
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+
+SerializationTest().run()
+ProgramCacheTest().run()
@@ -0,0 +1,139 @@
+from lalcheck.ai import domains, types, interpretations as interps
+from lalcheck.ai.irs.basic import tree as irt
+from lalcheck.ai.irs.basic import tools as irtools
+from lalcheck.ai.irs.basic.analyses import abstract_semantics
+from lalcheck.ai.utils import Transformer
+
+
+int_type = types.IntRange(-10, 10)
+
+
+class ProgramBuilder(object):
+    """
+    Builds trivial programs, and records which ones were built.
+    """
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, name):
+        self.built.append(name)
+        x = irt.Variable('x', index=0, type_hint=int_type)
+        return irt.Program([
+            irt.AssignStmt(
+                irt.Identifier(x, type_hint=int_type),
+                irt.Lit(1, type_hint=int_type)
+            )
+        ], fun_id=name, param_vars=[], result_var=x)
+
+    def handle(self, name):
+        return irt.ProgramHandle(name, lambda: self(name))
+
+
+class ProgramHandleTest(object):
+    """
+    Checks that programs are built on first access only.
+    """
+    def run(self):
+        builder = ProgramBuilder()
+        handle = builder.handle('f')
+        assert handle.fun_id == 'f' and not handle.is_built()
+        assert builder.built == []
+
+        prog = handle.get()
+        assert handle.is_built() and handle.get() is prog
+        assert builder.built == ['f']
+
+        built = irt.ProgramHandle.of(prog)
+        assert built.is_built() and built.get() is prog
+        assert built.fun_id == 'f'
+
+
+class LazyModelsTest(object):
+    """
+    Checks that lazy models are only built for the queried programs, and
+    agree with eagerly built ones.
+    """
+    def run(self):
+        builder = ProgramBuilder()
+        f, g = builder('f'), builder('g')
+        modeler = irtools.Models(
+            Transformer.as_transformer(lambda hint: hint),
+            interps.default_type_interpreter
+        )
+
+        models = modeler.lazy()
+        assert len(models) == 0
+        f_model = models[f]
+        assert models.keys() == [f] and models[f] is f_model
+        assert sorted(
+            node.__class__.__name__ for node in f_model
+        ) == sorted(
+            node.__class__.__name__ for node in modeler.of(f)[f]
+        )
+        assert g not in models
+
+
+class CallStrategyTest(object):
+    """
+    Checks that the programs of the handles given to a call strategy are
+    only built when they are called.
+    """
+    def run(self):
+        builder = ProgramBuilder()
+        handles = [builder.handle(name) for name in ['f', 'g', 'h']]
+        strategy = abstract_semantics.TopDownCallStrategy(
+            handles,
+            lambda prog: None,
+            lambda: abstract_semantics.MergePredicateBuilder.Always
+        )
+
+        dom = domains.Intervals(-10, 10)
+        assert strategy(interps.Signature('g', (dom,), dom, ())) is not None
+        assert builder.built == ['g']
+        assert strategy(interps.Signature('k', (dom,), dom, ())) is None
+        assert builder.built == ['g']
+
+
+class BottomUpCallStrategyTest(object):
+    """
+    Checks that the bottom-up call strategy only builds the programs that
+    are called, directly or transitively, and computes the summaries of
+    callees before the ones of their callers.
+    """
+    def run(self):
+        builder = ProgramBuilder()
+        f, g, h = handles = [builder.handle(name) for name in ['f', 'g', 'h']]
+        analyzed = []
+
+        def get_model(prog):
+            analyzed.append(prog.data.fun_id)
+            return models[prog]
+
+        strategy = abstract_semantics.BottomUpCallStrategy(
+            handles,
+            {f: [g], g: [], h: [g]},
+            get_model,
+            lambda: abstract_semantics.MergePredicateBuilder.Always
+        )
+        models = irtools.Models(
+            Transformer.as_transformer(lambda hint: hint),
+            interps.default_type_interpreter,
+            strategy.as_def_provider()
+        ).lazy()
+
+        dom = domains.Intervals(-10, 10)
+        call_f, _ = strategy(interps.Signature('f', (), dom, ()))
+        assert builder.built == ['f']
+
+        assert call_f() == (1, 1)
+        assert analyzed == ['g', 'f']
+        assert builder.built == ['f', 'g']
+
+        assert call_f() == (1, 1)
+        assert analyzed == ['g', 'f']
+
+
+ProgramHandleTest().run()
+LazyModelsTest().run()
+CallStrategyTest().run()
+BottomUpCallStrategyTest().run()
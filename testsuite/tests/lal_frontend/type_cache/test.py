@@ -0,0 +1,82 @@
+from lalcheck.ai import types
+from lalcheck.ai.type_cache import TypeCache
+from lalcheck.ai.utils import Transformer
+import os
+import pickle
+import shutil
+import tempfile
+
+
+class PicklingTest(object):
+    """
+    Checks that unpickled types are interned.
+    """
+    def run(self):
+        record = types.Product([types.IntRange(0, 255), types.Boolean()])
+        array = types.Array([types.IntRange(1, 10)], record)
+        for tpe in [record, array, types.Unknown(), types.ASCIICharacter()]:
+            assert pickle.loads(pickle.dumps(tpe, 2)) is tpe
+
+
+class TypeCacheTest(object):
+    """
+    Checks that the types stored in a type cache are shared between the
+    caches opened on the same path once they are flushed, and that the
+    caching typer only computes the types that are missing.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def make_typer(self, cache):
+        @Transformer.as_transformer
+        def inner(hint):
+            self.calls.append(hint)
+            if hint > 0:
+                return types.IntRange(0, hint)
+
+        return Transformer.make_caching(
+            inner, cache, lambda hint: None if hint == 1 else ('k', hint)
+        )
+
+    def run(self):
+        path = os.path.join(tempfile.mkdtemp(), 'types')
+        try:
+            fst = TypeCache(path)
+            typer = self.make_typer(fst)
+            assert typer.get(5) is types.IntRange(0, 5)
+            assert typer.get(5) is types.IntRange(0, 5)
+            assert typer.get(1) is types.IntRange(0, 1)
+            assert typer.get(1) is types.IntRange(0, 1)
+            assert self.calls == [5, 1, 1]
+            assert fst.hits == 1 and fst.misses == 1
+
+            # Failures are not cached.
+            assert typer._transform(-1) is None
+            assert typer._transform(-1) is None
+            assert self.calls[-2:] == [-1, -1]
+
+            snd = TypeCache(path)
+            assert snd.get(('k', 5)) is None
+
+            fst.flush()
+            snd = TypeCache(path)
+            assert snd.get(('k', 5)) is types.IntRange(0, 5)
+
+            del self.calls[:]
+            assert self.make_typer(snd).get(5) is types.IntRange(0, 5)
+            assert self.calls == []
+
+            # Entries are read when they are first looked up, so that the
+            # ones flushed by other caches in the meantime are found.
+            fst.put(('k', 7), types.IntRange(0, 7))
+            fst.flush()
+            assert snd.get(('k', 7)) is types.IntRange(0, 7)
+
+            snd.clear()
+            assert TypeCache(path).get(('k', 5)) is None
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+
+PicklingTest().run()
+TypeCacheTest().run()
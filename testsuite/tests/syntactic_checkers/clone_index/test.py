@@ -0,0 +1,151 @@
+from lalcheck.checkers.duplicate_code import CheckerConfig, find_clones
+from lalcheck.checkers.support.clone_index import (
+    CloneIndex, Fragment, winnow
+)
+import os
+import random
+import shutil
+import tempfile
+
+
+def fragment(filename, start_line, end_line, fingerprints):
+    return Fragment(filename, (start_line, 1), (end_line, 1), None,
+                    len(fingerprints))
+
+
+class WinnowTest(object):
+    """
+    Checks that winnowing selects the minimal hash of each window.
+    """
+    def run(self):
+        assert winnow([], 4) == frozenset()
+        assert winnow([5, 3, 7], 4) == frozenset([3])
+        assert winnow([5, 3, 7, 1], 4) == frozenset([1])
+        assert winnow([1, 2, 3, 4, 5], 2) == frozenset([1, 2, 3, 4])
+        assert winnow([5, 4, 3, 2, 1], 2) == frozenset([4, 3, 2, 1])
+
+        rand = random.Random(42)
+        for _ in range(100):
+            hashes = [rand.randint(0, 20) for _ in range(rand.randint(1, 50))]
+            window_size = rand.randint(1, 10)
+            expected = frozenset(
+                min(hashes[i:i + window_size])
+                for i in range(max(1, len(hashes) - window_size + 1))
+            )
+            assert winnow(hashes, window_size) == expected
+
+
+class CloneIndexTest(object):
+    """
+    Checks that the postings of a clone index follow the changes of the
+    fragments of the indexed files, and persist across openings.
+    """
+    def run(self):
+        path = os.path.join(tempfile.mkdtemp(), 'clones')
+        try:
+            a1 = fragment('a.adb', 1, 10, {1, 2, 3})
+            a2 = fragment('a.adb', 12, 20, {4, 5})
+            a3 = fragment('a.adb', 1, 5, {6})
+            b1 = fragment('b.adb', 1, 10, {2, 3, 6})
+
+            with CloneIndex.open(path) as clones:
+                assert clones.set_file('a.adb', [
+                    (a1, frozenset([1, 2, 3])), (a2, frozenset([4, 5]))
+                ]) == [0, 1]
+                assert clones.set_file('b.adb', [
+                    (b1, frozenset([2, 3, 6]))
+                ]) == [2]
+                assert clones.fragment(1) == a2
+                assert clones.shared_fingerprints({2, 3}, 10) == {0: 2, 2: 2}
+                assert clones.shared_fingerprints({1, 2, 3}, 1) == {0: 1}
+
+                # Fragments are replaced, with new identifiers.
+                assert clones.set_file('a.adb', [
+                    (a3, frozenset([6]))
+                ]) == [3]
+                assert clones.shared_fingerprints({1, 2, 3, 4, 6}, 10) == {
+                    2: 3, 3: 1
+                }
+
+            with CloneIndex.open(path) as clones:
+                assert clones.fragment(3) == a3
+                assert clones.shared_fingerprints({6}, 10) == {2: 1, 3: 1}
+
+                # Files which do not exist anymore are removed.
+                assert clones.remove_missing_files(
+                    lambda f: f != 'b.adb'
+                ) == ['b.adb']
+                assert clones.remove_missing_files(lambda f: True) == []
+                assert clones.shared_fingerprints({2, 3, 6}, 10) == {3: 1}
+
+                clones.remove_file('a.adb')
+                assert clones.shared_fingerprints({6}, 10) == {}
+                assert clones.set_file('b.adb', [(b1, frozenset())]) == [4]
+
+            with CloneIndex.open(path) as clones:
+                clones._db['version'] = CloneIndex.FORMAT_VERSION - 1
+
+            # Indexes of another version are cleared.
+            with CloneIndex.open(path) as clones:
+                assert clones.set_file('a.adb', []) == []
+                assert clones.remove_missing_files(lambda f: False) == [
+                    'a.adb'
+                ]
+                assert clones.set_file('c.adb', [(a1, frozenset())]) == [0]
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+
+class FindClonesTest(object):
+    """
+    Checks that the clones of the fragments of a unit are reported once,
+    and that fragments nested in reported clones are not reported.
+    """
+    def run(self):
+        path = os.path.join(tempfile.mkdtemp(), 'clones')
+        config = CheckerConfig(
+            index_path=path,
+            size_threshold=0,
+            kgram_size=4,
+            window_size=4,
+            similarity=0.8,
+            max_occurrences=10
+        )
+        try:
+            orig_fps = frozenset(range(1, 11))
+            orig = fragment('a.adb', 1, 10, orig_fps)
+
+            fragments = [
+                ('clone', frozenset(range(1, 12)), 1, 20),
+                ('nested', frozenset(range(1, 10)), 2, 9),
+                ('unrelated', frozenset([100, 101]), 30, 40),
+                ('similar', frozenset([1, 2, 3] + range(200, 210)), 50, 60)
+            ]
+            fragments = [
+                (node, fragment('b.adb', start, end, fps), fps)
+                for node, fps, start, end in fragments
+            ]
+
+            with CloneIndex.open(path) as clones:
+                clones.set_file('a.adb', [(orig, orig_fps)])
+                ids = clones.set_file('b.adb', [
+                    (frag, fps) for _, frag, fps in fragments
+                ])
+                assert find_clones(config, clones, fragments, ids) == [
+                    ('clone', orig)
+                ]
+
+                # Clones are reported on the fragment indexed last only.
+                ids = clones.set_file('a.adb', [(orig, orig_fps)])
+                assert find_clones(config, clones, [
+                    ('orig', orig, orig_fps)
+                ], ids) == [
+                    ('orig', fragments[0][1]),
+                ]
+        finally:
+            shutil.rmtree(os.path.dirname(path))
+
+
+WinnowTest().run()
+CloneIndexTest().run()
+FindClonesTest().run()
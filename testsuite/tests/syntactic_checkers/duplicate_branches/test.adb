@@ -0,0 +1,28 @@
+procedure Test is
+   X, Y, Z : Integer := 0;
+begin
+   if X > 0 then
+      Y := X + 1;
+      Z := Y * 2;
+   elsif X < 0 then
+      Y := X + 2;
+      Z := Y * 2;
+   elsif X = 0 then
+      Y := X + 1;
+      Z := Y * 2;
+   else
+      Y := 0;
+   end if;
+
+   case X is
+      when 1 =>
+         Y := Z + 1;
+         Z := Y * 3;
+      when 2 =>
+         Y := Z + 3;
+         Z := Y * 1;
+      when others =>
+         Y := Z + 3;
+         Z := Y * 1;
+   end case;
+end Test;
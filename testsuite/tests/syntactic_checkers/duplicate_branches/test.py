@@ -0,0 +1,40 @@
+import libadalang as lal
+from lalcheck.checkers.duplicate_branches import (
+    CheckerConfig, find_duplicate_branches
+)
+from lalcheck.checkers.support.unit_index import UnitIndex
+
+
+class DuplicateBranchesTest(object):
+    """
+    Checks that only the branches which have the same tokens are reported,
+    among the branches which have the same number of tokens.
+    """
+    def run(self):
+        unit = lal.AnalysisContext().get_from_file('test.adb')
+        assert unit.root is not None
+        index = UnitIndex(unit)
+
+        config = CheckerConfig(
+            size_threshold=10,
+            min_duplicates=1,
+            smart_conditional_filter=False,
+            do_ifs=True,
+            do_cases=True
+        )
+        diags = find_duplicate_branches(config, index).diagnostics
+        assert [
+            (orig.sloc_range.start.line, dup.sloc_range.start.line, msg)
+            for orig, dup, msg in diags
+        ] == [(5, 11, ''), (22, 25, '')]
+
+        # All the blocks have the same number of tokens.
+        blocks = [orig for orig, _, _ in diags] + [dup for _, dup, _ in diags]
+        assert len({index.token_count(block) for block in blocks}) == 1
+
+        assert find_duplicate_branches(
+            config._replace(do_ifs=False), index
+        ).diagnostics == diags[1:]
+
+
+DuplicateBranchesTest().run()
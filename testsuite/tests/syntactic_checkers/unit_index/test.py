@@ -0,0 +1,169 @@
+from lalcheck.checkers.support.unit_index import UnitIndex
+from lalcheck.checkers.support.utils import relevant_tokens
+
+
+class Node(object):
+    """
+    A node of a fake analysis unit, which only provides what a UnitIndex
+    needs.
+    """
+    def __init__(self, *children):
+        self.children = list(children)
+
+    def __iter__(self):
+        return iter(self.children)
+
+
+class Stmt(Node):
+    pass
+
+
+class IfStmt(Stmt):
+    pass
+
+
+class CaseStmt(Stmt):
+    pass
+
+
+class AssignStmt(Stmt):
+    pass
+
+
+class Expr(Node):
+    pass
+
+
+class Token(object):
+    def __init__(self, kind, text, is_trivia=False):
+        self.kind = kind
+        self.text = text
+        self.is_trivia = is_trivia
+
+
+class Unit(object):
+    """
+    A fake analysis unit, whose tokens are the words of the given text
+    separated by whitespace tokens.
+    """
+    def __init__(self, root, text=''):
+        self.root = root
+        self.tokens = []
+        for word in text.split():
+            if len(self.tokens) > 0:
+                self.tokens.append(Token('Whitespace', ' ', True))
+            self.tokens.append(
+                Token('Identifier' if word.isalnum() else 'Symbol', word)
+            )
+        self.relevant = [t for t in self.tokens if not t.is_trivia]
+
+    def iter_tokens(self):
+        return iter(self.tokens)
+
+    def span(self, node, first, last):
+        """
+        Makes the given node cover the relevant tokens of the given indexes.
+        """
+        node.token_start = self.relevant[first]
+        node.token_end = self.relevant[last]
+        node.tokens = self.tokens[
+            self.tokens.index(node.token_start):
+            self.tokens.index(node.token_end) + 1
+        ]
+        node.is_ghost = False
+        return node
+
+    @staticmethod
+    def ghost(node):
+        node.tokens = []
+        node.is_ghost = True
+        return node
+
+
+def prefix_order(node):
+    res = [node]
+    for child in node:
+        if child is not None:
+            res.extend(prefix_order(child))
+    return res
+
+
+class FindallTest(object):
+    """
+    Checks that the nodes of an index are returned in prefix order, even
+    when they are of different kinds.
+    """
+    def run(self):
+        root = Node(
+            IfStmt(Expr(), Node(AssignStmt(Expr()), None, CaseStmt(
+                Expr(), AssignStmt(), IfStmt(Expr(), AssignStmt())
+            ))),
+            None,
+            CaseStmt(Expr(), IfStmt()),
+            AssignStmt(Expr())
+        )
+        index = UnitIndex(Unit(root))
+        nodes = prefix_order(root)
+
+        def expected(kinds):
+            return [n for n in nodes if isinstance(n, kinds)]
+
+        for kinds in [IfStmt, AssignStmt, Expr, (IfStmt, CaseStmt),
+                      (CaseStmt, AssignStmt, Expr), Stmt, Node]:
+            assert index.findall(kinds) == expected(kinds)
+
+        assert index.findall(Node)[0] is root
+        assert index.findall(IfStmt) is index.findall((IfStmt,))
+        assert index.findall((Expr, IfStmt)) == expected((IfStmt, Expr))
+
+
+class TokensTest(object):
+    """
+    Checks the token counts, fingerprints and k-gram hashes of the nodes of
+    an index against their relevant tokens.
+    """
+    def run(self):
+        unit = Unit(None, 'if a then x := 1 ; y := x ; x := 1 ; end if ;')
+        fst, snd, thd = (
+            unit.span(AssignStmt(), 3, 6),
+            unit.span(AssignStmt(), 7, 10),
+            unit.span(AssignStmt(), 11, 14)
+        )
+        ghost = unit.ghost(Node())
+        stmts = unit.span(Node(fst, snd, thd, ghost), 3, 14)
+        cond = unit.span(Expr(), 1, 1)
+        unit.root = unit.span(IfStmt(cond, stmts), 0, 17)
+        index = UnitIndex(unit)
+
+        for node in [unit.root, cond, stmts, fst, snd, thd]:
+            assert index.token_count(node) == len(relevant_tokens(node))
+            assert index.relevant_tokens(node) == relevant_tokens(node)
+        assert index.token_count(ghost) == 0
+
+        assert index.tokens_info(fst) == (
+            ('Identifier', 'x'), ('Symbol', ':='),
+            ('Identifier', '1'), ('Symbol', ';')
+        )
+        assert index.fingerprint(fst) == index.fingerprint(thd)
+        assert index.fingerprint(fst) != index.fingerprint(snd)
+        assert index.fingerprint(fst)[0] == index.fingerprint(snd)[0] == 4
+        assert index.same_tokens(fst, thd)
+        assert not index.same_tokens(fst, snd)
+
+        assert index.kgram_hashes(fst, 4) == [index.fingerprint(fst)[1]]
+        assert index.kgram_hashes(fst, 5) == []
+        assert index.kgram_hashes(ghost, 2) == []
+        assert len(index.kgram_hashes(unit.root, 4)) == 15
+
+        for k in [1, 2, 3]:
+            hashes = index.kgram_hashes(stmts, k)
+            infos = index.tokens_info(stmts)
+            assert len(hashes) == len(infos) - k + 1
+            for i in range(len(hashes)):
+                for j in range(len(hashes)):
+                    assert ((hashes[i] == hashes[j]) ==
+                            (infos[i:i + k] == infos[j:j + k]))
+
+
+FindallTest().run()
+TokensTest().run()
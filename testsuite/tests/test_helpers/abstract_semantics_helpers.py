@@ -6,6 +6,7 @@ import lalcheck.ai.irs.basic.frontends.lal as lal2basic
 from lalcheck.ai.interpretations import default_type_interpreter
 from lalcheck.ai.irs.basic.analyses import abstract_semantics
 from lalcheck.ai.irs.basic.tools import Models
+from lalcheck.ai.irs.basic.tree import ProgramHandle
 from test_helper import find_test_program
 
 default_merge_predicates = {
@@ -32,6 +33,7 @@ def do_analysis(checker,
 
     progs = ctx.extract_programs_from_file("test.adb")
     test_program = find_test_program(progs, test_subprogram_name)
+    handles = [ProgramHandle.of(prog) for prog in progs]
 
     call_strategies = {
         'unknown': abstract_semantics.UnknownTargetCallStrategy(),
@@ -39,6 +41,18 @@ def do_analysis(checker,
             progs,
             lambda p: model[p],
             lambda: pred
+        ),
+        'topdown_subsumption': abstract_semantics.TopDownCallStrategy(
+            progs,
+            lambda p: model[p],
+            lambda: pred,
+            abstract_semantics.SummaryCache(subsumption=True)
+        ),
+        'bottomup': abstract_semantics.BottomUpCallStrategy(
+            handles,
+            ctx.call_graph(handles),
+            lambda p: model[p],
+            lambda: pred
         )
     }
 
@@ -51,6 +65,9 @@ def do_analysis(checker,
     model = model_builder.of(*progs)
     prog_model = model[test_program]
 
+    if call_strategy_name == 'bottomup':
+        call_strategies['bottomup'].compute_summaries()
+
     res = {}
     for pred_name, pred in merge_predicates.iteritems():
         res[pred_name] = checker(test_program, prog_model, pred)
@@ -0,0 +1,46 @@
+"""
+Output the diagnostics of the "duplicate code" checker, run on all the Ada
+files of the test such that each file is in its own partition.
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+
+import test_helper
+from lalcheck import checker_runner
+
+
+def relative(path):
+    return path.replace(os.getcwd() + os.sep, '')
+
+
+@test_helper.run
+def run(args):
+    files = sorted(glob.glob('*.adb'))
+    index_dir = tempfile.mkdtemp()
+    try:
+        checker = ('lalcheck.checkers.duplicate_code --index {} '
+                   '--size-threshold 50').format(
+            os.path.join(index_dir, 'clones')
+        )
+        diags = checker_runner.run([
+            '--checkers', checker,
+            '--files', ';'.join(files),
+            '--log', 'error',
+            '--partition-size', '1'
+        ], diagnostic_action='return')
+    finally:
+        shutil.rmtree(index_dir)
+
+    for line in sorted(
+        "{}:{}:{}: {}".format(
+            relative(pos.filename),
+            pos.start[0],
+            pos.start[1],
+            relative(msg)
+        )
+        for pos, msg, _, _ in diags
+    ):
+        print(line)